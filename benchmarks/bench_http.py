@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the streamable HTTP transport.
+
+Starts ``server.py --http`` on a loopback port once per worker count,
+checks it with a real MCP client session (initialize, tools/list and one
+tool call), then keeps ``--clients`` requests in flight for ``--duration``
+seconds and reports requests per second, p50/p99 latency and 503
+rejections. Calls draw uncached base frequencies, so every request does
+work in a worker. Results are saved as JSON.
+
+    python benchmarks/bench_http.py --workers 1 4 16 --output http.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+SERVER_PATH = Path(__file__).resolve().parent.parent / "server.py"
+RESULTS_VERSION = 1
+HEADERS = {"accept": "application/json, text/event-stream", "content-type": "application/json"}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _tool_call(rng: random.Random, request_id: int) -> dict[str, Any]:
+    base = round(rng.uniform(20.0, 2000.0), 4)
+    name, arguments = rng.choice([
+        ("calculate_harmonic_series", {"base_frequency": base, "harmonics_count": 256}),
+        ("generate_phi_spiral_frequencies", {"base_frequency": base, "count": 64}),
+        ("calculate_quantum_harmonic", {"base_frequency": base, "quantum_level": rng.randint(1, 10)}),
+        ("generate_fractal_frequencies", {"base_frequency": base, "depth": 8}),
+    ])
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": name, "arguments": arguments}
+    }
+
+
+async def _wait_until_healthy(url: str, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode} before becoming healthy")
+            try:
+                if (await client.get(f"{url}/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Server at {url} not healthy after {timeout:g}s")
+
+
+async def check_session(url: str) -> int:
+    """Run one MCP client session against the server; return the number of tools listed."""
+    async with streamablehttp_client(f"{url}/mcp") as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            tools = await session.list_tools()
+            result = await session.call_tool("calculate_golden_ratio_frequency", {"base_frequency": 528})
+            if result.isError:
+                raise RuntimeError(f"Tool call failed over HTTP: {result.content}")
+    return len(tools.tools)
+
+
+async def drive_load(url: str, clients: int, duration: float, seed: int) -> dict[str, Any]:
+    latencies: list[float] = []
+    rejected = 0
+    errors = 0
+    stop_at = time.perf_counter() + duration
+
+    async def client_loop(client: httpx.AsyncClient, index: int) -> None:
+        nonlocal rejected, errors
+        rng = random.Random(seed * 1000 + index)
+        request_id = 0
+        while time.perf_counter() < stop_at:
+            request_id += 1
+            started = time.perf_counter()
+            try:
+                response = await client.post(f"{url}/mcp", json=_tool_call(rng, request_id), headers=HEADERS)
+            except httpx.TransportError:
+                errors += 1
+                continue
+            if response.status_code == 503:
+                rejected += 1
+                await asyncio.sleep(float(response.headers.get("retry-after", 1)))
+            elif response.status_code != 200:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, index) for index in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "rejected": rejected,
+        "errors": errors,
+        "seconds": elapsed,
+        "requests_per_second": len(ordered) / elapsed,
+        "p50_ms": statistics.median(ordered) * 1000 if ordered else None,
+        "p99_ms": ordered[int(0.99 * (len(ordered) - 1))] * 1000 if ordered else None
+    }
+
+
+async def run_workers(options: argparse.Namespace, workers: int) -> dict[str, Any]:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [options.python, options.server, "--http", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        await _wait_until_healthy(url, process, options.startup_timeout)
+        tools = await check_session(url)
+        # One short untimed round warms every worker's imports
+        await drive_load(url, options.clients, 1.0, options.seed)
+        result = await drive_load(url, options.clients, options.duration, options.seed)
+        result["workers"] = workers
+        result["tools_listed"] = tools
+        return result
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def run(options: argparse.Namespace) -> dict[str, Any]:
+    runs = []
+    for workers in options.workers:
+        result = await run_workers(options, workers)
+        print(
+            f"{workers:>3} worker(s)  {result['requests_per_second']:9.1f} req/s  "
+            f"p50 {result['p50_ms'] or 0:7.1f} ms  p99 {result['p99_ms'] or 0:7.1f} ms  "
+            f"rejected {result['rejected']}  errors {result['errors']}",
+            file=sys.stderr
+        )
+        runs.append(result)
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "server": options.server,
+        "clients": options.clients,
+        "duration": options.duration,
+        "runs": runs
+    }
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure Sound Healing MCP HTTP throughput per worker count.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16],
+                        help="Worker counts to measure (default: 1 4 16)")
+    parser.add_argument("--clients", type=int, default=64, help="Requests kept in flight (default: 64)")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load per worker count (default: 10)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the call arguments")
+    parser.add_argument("--server", default=str(SERVER_PATH), help="Server script to start (default: this checkout)")
+    parser.add_argument("--python", default=sys.executable, help="Interpreter to start the server with")
+    parser.add_argument("--startup-timeout", type=float, default=60, help="Seconds to wait for /health (default: 60)")
+    parser.add_argument("--output", default="bench_http.json", help="Results file (default: bench_http.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    options = parse_args(argv)
+    results = asyncio.run(run(options))
+    with open(options.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {options.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
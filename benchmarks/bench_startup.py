@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the Sound Healing MCP server.
+
+MCP clients spawn ``server.py`` as a fresh stdio process for every session,
+so this measures what a client waits for: the time from spawning the
+process to the ``initialize`` response, and to the first ``tools/list``
+response. A bare ``python -c pass`` is timed too, as the floor no server
+change can go below. Results are saved as JSON and can be compared against
+a baseline.
+
+    python benchmarks/bench_startup.py --output before.json
+    python benchmarks/bench_startup.py --baseline before.json --output after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+SERVER_PATH = Path(__file__).resolve().parent.parent / "server.py"
+RESULTS_VERSION = 1
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "bench-startup", "version": "1.0.0"}
+    }
+}
+INITIALIZED = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+LIST_TOOLS = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
+
+
+def _send(process: subprocess.Popen, message: dict[str, Any]) -> None:
+    process.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+    process.stdin.flush()
+
+
+def _wait_for(process: subprocess.Popen, request_id: int) -> None:
+    for line in process.stdout:
+        if json.loads(line).get("id") == request_id:
+            return
+    raise RuntimeError(f"Server exited before answering request {request_id}")
+
+
+def time_server_start(python: str, server: str, env: dict[str, str]) -> tuple[float, float]:
+    """Spawn the server once; return seconds to the initialize and tools/list responses."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [python, server],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env
+    )
+    try:
+        # Sent immediately, as clients do; the request sits in the pipe until the server reads it
+        _send(process, INITIALIZE)
+        _wait_for(process, INITIALIZE["id"])
+        ready = time.perf_counter() - started
+        _send(process, INITIALIZED)
+        _send(process, LIST_TOOLS)
+        _wait_for(process, LIST_TOOLS["id"])
+        listed = time.perf_counter() - started
+    finally:
+        process.stdin.close()
+        process.wait(timeout=10)
+    return ready, listed
+
+
+def time_interpreter_start(python: str, env: dict[str, str]) -> float:
+    started = time.perf_counter()
+    subprocess.run([python, "-c", "pass"], check=True, env=env)
+    return time.perf_counter() - started
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "min_ms": ordered[0] * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "max_ms": ordered[-1] * 1000
+    }
+
+
+def run(options: argparse.Namespace) -> dict[str, Any]:
+    env = dict(os.environ)
+    if options.no_bytecode:
+        env["PYTHONDONTWRITEBYTECODE"] = "1"
+
+    # One untimed start fills the bytecode caches of the dependencies
+    time_server_start(options.python, options.server, env)
+
+    interpreter, ready, listed = [], [], []
+    for _ in range(options.runs):
+        interpreter.append(time_interpreter_start(options.python, env))
+        to_ready, to_list = time_server_start(options.python, options.server, env)
+        ready.append(to_ready)
+        listed.append(to_list)
+
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "server": options.server,
+        "runs": options.runs,
+        "interpreter_start": summarize(interpreter),
+        "time_to_initialize": summarize(ready),
+        "time_to_tools_list": summarize(listed)
+    }
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure Sound Healing MCP server startup time.")
+    parser.add_argument("--runs", type=int, default=20, help="Server starts to time (default: 20)")
+    parser.add_argument("--server", default=str(SERVER_PATH), help="Server script to start (default: this checkout)")
+    parser.add_argument("--python", default=sys.executable, help="Interpreter to start the server with")
+    parser.add_argument("--no-bytecode", action="store_true", help="Set PYTHONDONTWRITEBYTECODE for the server")
+    parser.add_argument("--output", default="bench_startup.json", help="Results file (default: bench_startup.json)")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    options = parse_args(argv)
+    results = run(options)
+
+    for key in ("interpreter_start", "time_to_initialize", "time_to_tools_list"):
+        summary = results[key]
+        print(
+            f"{key:<20} min {summary['min_ms']:8.1f} ms  median {summary['median_ms']:8.1f} ms  "
+            f"max {summary['max_ms']:8.1f} ms",
+            file=sys.stderr
+        )
+
+    with open(options.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {options.output}", file=sys.stderr)
+
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nChange against {options.baseline}:", file=sys.stderr)
+        for key in ("time_to_initialize", "time_to_tools_list"):
+            before, after = baseline[key]["median_ms"], results[key]["median_ms"]
+            print(f"{key:<20} median {before:8.1f} -> {after:8.1f} ms ({(after - before) / before * 100:+.1f}%)",
+                  file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark for the Sound Healing MCP server.
+
+Runs ``server.app`` over in-memory stream pairs (no subprocess, no stdio)
+and drives every registered tool through a real ``ClientSession`` with
+seeded, realistic argument distributions. Reports p50/p99/max latency,
+requests per second, bytes per response and peak memory per tool, and
+saves the results as JSON so they can be compared against a baseline.
+
+    python benchmarks/bench_tools.py --output before.json
+    python benchmarks/bench_tools.py --baseline before.json --output after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import anyio
+from mcp import ClientSession
+from mcp.shared.memory import create_client_server_memory_streams
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import server  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+RESULTS_VERSION = 1
+
+Scenario = Callable[[random.Random], dict[str, Any]]
+
+
+# ---------------------------------------------------------------------------
+# Argument distributions
+#
+# Each scenario draws one call's arguments. Base frequencies mix catalog
+# tones (what clients mostly send) with arbitrary audible values; sizes are
+# skewed towards the small defaults with an occasional large request.
+# ---------------------------------------------------------------------------
+
+WELL_TONE_NAMES = list(server.WELL_TONE_FREQUENCIES)
+CHAKRA_NAMES = [name for name in WELL_TONE_NAMES if name.startswith("chakra_")]
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
+
+
+def _base_frequency(rng: random.Random) -> float:
+    if rng.random() < 0.6:
+        return server.WELL_TONE_FREQUENCIES[rng.choice(WELL_TONE_NAMES)]
+    return round(rng.uniform(20.0, 2000.0), 2)
+
+
+def _base_arguments(rng: random.Random) -> dict[str, Any]:
+    # Tools that accept a catalog name are also called by name, as clients browsing the catalog do
+    if rng.random() < 0.2:
+        return {"frequency_name": rng.choice(WELL_TONE_NAMES)}
+    return {"base_frequency": _base_frequency(rng)}
+
+
+def _size(rng: random.Random, typical: int, large: int) -> int:
+    return large if rng.random() < 0.05 else rng.randint(1, typical)
+
+
+def _output_format(rng: random.Random) -> dict[str, Any]:
+    roll = rng.random()
+    if roll < 0.8:
+        return {}
+    if roll < 0.9:
+        return {"output_format": "compact"}
+    return {"output_format": "rounded", "precision": rng.randint(1, 6)}
+
+
+def _audio_path(rng: random.Random) -> dict[str, Any]:
+    # Half the renders go to disk, the rest come back inline as base64
+    if rng.random() < 0.5:
+        return {"output_path": os.path.join(AUDIO_DIR, f"bench_{rng.randrange(4)}.wav")}
+    return {}
+
+
+def _session_arguments(rng: random.Random) -> dict[str, Any]:
+    # Segments come from a small pool, so repeated timelines reuse cached segment files as re-renders do
+    segments = [
+        {"frequency_names": [rng.choice(CHAKRA_NAMES)], "duration_seconds": rng.choice([0.5, 1.0, 2.0])}
+        for _ in range(rng.randint(2, 7))
+    ]
+    return {
+        "segments": segments,
+        "crossfade_seconds": 0.2,
+        "output_path": os.path.join(AUDIO_DIR, f"bench_session_{rng.randrange(4)}.wav"),
+        "cache_dir": os.path.join(AUDIO_DIR, "segments")
+    }
+
+
+def _roughness_arguments(rng: random.Random) -> dict[str, Any]:
+    frequencies = [round(rng.uniform(60.0, 1000.0), 2) for _ in range(_size(rng, 8, 1000))]
+    arguments = {"frequencies": frequencies, "partials": rng.randint(1, 8)}
+    if len(frequencies) <= 64 and rng.random() < 0.3:
+        arguments["subset_size"] = rng.randint(1, min(4, len(frequencies)))
+    return arguments
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "get_well_tone_frequency": lambda rng: {
+        "frequency_name": rng.choice(WELL_TONE_NAMES) if rng.random() < 0.95 else "unknown_tone"
+    },
+    "list_all_well_tones": lambda rng: {},
+    "get_chakra_frequencies": lambda rng: {},
+    "calculate_harmonic_series": lambda rng: {
+        **_base_arguments(rng),
+        "harmonics_count": _size(rng, 32, 20000),
+        **_output_format(rng)
+    },
+    "calculate_pythagorean_frequency": lambda rng: {
+        "base_frequency": _base_frequency(rng),
+        "numerator": rng.choice([1, 2, 3, 4, 9, 16, 27, 81, 243]),
+        "denominator": rng.choice([1, 2, 4, 8, 16, 64, 128])
+    },
+    "calculate_fibonacci_frequency": lambda rng: {
+        **_base_arguments(rng),
+        "fibonacci_index": rng.randint(0, 11)
+    },
+    "calculate_golden_ratio_frequency": lambda rng: {
+        "base_frequency": _base_frequency(rng)
+    },
+    "calculate_prime_harmonics": lambda rng: {
+        "base_frequency": _base_frequency(rng),
+        **({"primes": rng.sample(PRIMES, rng.randint(1, len(PRIMES)))} if rng.random() < 0.5 else {})
+    },
+    "generate_phi_spiral_frequencies": lambda rng: {
+        **_base_arguments(rng),
+        "count": _size(rng, 20, 1000),
+        **_output_format(rng)
+    },
+    "calculate_quantum_harmonic": lambda rng: {
+        "base_frequency": _base_frequency(rng),
+        "quantum_level": rng.randint(1, 10)
+    },
+    "generate_fractal_frequencies": lambda rng: {
+        "base_frequency": _base_frequency(rng),
+        "depth": _size(rng, 8, 2000),
+        # Clients rendering audio bound the result to the audible range
+        **({"min_frequency": 20.0, "max_frequency": 20000.0} if rng.random() < 0.3 else {}),
+        "annotate": rng.random() < 0.3,
+        "octave_equivalent": rng.random() < 0.5
+    },
+    "calculate_resonance_cascade": lambda rng: {
+        **_base_arguments(rng),
+        "steps": _size(rng, 12, 500)
+    },
+    "generate_custom_frequency_matrix": lambda rng: {
+        "base_frequency": _base_frequency(rng),
+        "matrix_size": _size(rng, 12, 200),
+        "include_fibonacci": rng.random() < 0.8,
+        "include_golden_ratio": rng.random() < 0.8,
+        "include_primes": rng.random() < 0.8,
+        "annotate": rng.random() < 0.3
+    },
+    "search_well_tones": lambda rng: rng.choice([
+        {"query": rng.choice(WELL_TONE_NAMES)[:rng.randint(3, 10)]},
+        {"category": rng.choice(["chakras", "solfeggio", "earth_resonance", "brainwaves"])},
+        {"min_frequency": 100 * rng.randint(0, 5), "max_frequency": 100 * rng.randint(5, 10)}
+    ]),
+    "find_nearest_well_tones": lambda rng: {
+        "frequencies": [round(rng.uniform(20.0, 2000.0), 2) for _ in range(_size(rng, 8, 5000))],
+        "k": rng.randint(1, 5),
+        "octave_equivalent": rng.random() < 0.5
+    },
+    "calculate_roughness": _roughness_arguments,
+    "find_rational_ratios": lambda rng: {
+        "frequencies": [round(rng.uniform(60.0, 1000.0), 2) for _ in range(_size(rng, 12, 2000) + 1)],
+        "tolerance_cents": rng.choice([1.0, 5.0, 15.0]),
+        **({"max_term": rng.choice([16, 64, 256])} if rng.random() < 0.3 else {})
+    },
+    "generate_scale": lambda rng: {
+        **_base_arguments(rng),
+        "system": rng.choice(["edo", "pythagorean", "just", "phi"]),
+        **({"divisions": rng.choice([5, 12, 19, 24, 31, 53])} if rng.random() < 0.5 else {}),
+        "lowest_octave": rng.randint(-3, 0),
+        "highest_octave": rng.randint(1, 3)
+    },
+    "snap_to_scale": lambda rng: {
+        "frequencies": [round(rng.uniform(20.0, 2000.0), 2) for _ in range(_size(rng, 16, 50000))],
+        **_base_arguments(rng),
+        "system": rng.choice(["edo", "pythagorean", "just", "phi"])
+    },
+    "batch_evaluate": lambda rng: {
+        "generator": rng.choice(list(server.BATCH_GENERATORS)),
+        "base_frequencies": [_base_frequency(rng) for _ in range(_size(rng, 64, 5000))],
+        "count": rng.randint(1, 16),
+        **_output_format(rng)
+    },
+    "run_pipeline": lambda rng: {
+        **_base_arguments(rng),
+        "stages": [
+            {"op": rng.choice(["phi_spiral", "fractal", "resonance_cascade"]), "count": rng.randint(2, 12)},
+            {"op": rng.choice(["harmonic_series", "quantum_harmonic"]), "count": _size(rng, 32, 2000)},
+            {"op": "filter", "min_frequency": 20, "max_frequency": 20000},
+            rng.choice([{"op": "dedupe", "tolerance_cents": rng.choice([0, 1, 5])}, {"op": "top_k", "k": 50}]),
+            {"op": "sort"}
+        ],
+        **_output_format(rng)
+    },
+    "synthesize_audio": lambda rng: {
+        "frequency_names": rng.sample(WELL_TONE_NAMES, rng.randint(1, 4)),
+        "duration_seconds": rng.choice([0.5, 1.0, 2.0]),
+        **_audio_path(rng)
+    },
+    "generate_binaural_beat": lambda rng: {
+        "carrier_name": rng.choice(WELL_TONE_NAMES),
+        "beat_name": rng.choice(sorted(server.BEAT_FREQUENCY_NAMES)),
+        "mode": rng.choice(["binaural", "isochronic"]),
+        "duration_seconds": rng.choice([0.5, 1.0, 2.0]),
+        "fade_seconds": 0.1,
+        **_audio_path(rng)
+    },
+    "render_session": _session_arguments,
+    "analyze_audio_spectrum": lambda rng: {
+        "input_path": os.path.join(AUDIO_DIR, RECORDING_NAME),
+        "fft_size": rng.choice([4096, 16384, 32768]),
+        "max_peaks": rng.randint(5, 40)
+    },
+    "cache_stats": lambda rng: {},
+    "server_stats": lambda rng: {"include_idle": rng.random() < 0.5},
+}
+
+# Audio renders and analysis are orders of magnitude slower than the calculators
+ITERATION_SCALE = {
+    "synthesize_audio": 0.1,
+    "generate_binaural_beat": 0.1,
+    "render_session": 0.1,
+    "analyze_audio_spectrum": 0.1,
+}
+
+# Set for the duration of a run; renders with an output_path land here, as
+# does the recording analyzed by the analyze_audio_spectrum scenario
+AUDIO_DIR = tempfile.gettempdir()
+RECORDING_NAME = "bench_recording.wav"
+RECORDING_SECONDS = 60
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+ERROR_PREFIXES = ('{"error"', '{\n  "error"', "Invalid arguments")
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, if the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def bench_tool(
+    session: ClientSession,
+    name: str,
+    scenario: Scenario,
+    iterations: int,
+    warmup: int,
+    concurrency: int,
+    seed: int,
+    trace_memory: bool
+) -> dict[str, Any]:
+    """Call one tool `iterations` times and summarise the observed latencies."""
+    rng = random.Random(f"{seed}:{name}")
+    for _ in range(warmup):
+        await session.call_tool(name, scenario(rng))
+
+    calls = [scenario(rng) for _ in range(iterations)]
+    latencies: list[float] = []
+    sizes: list[int] = []
+    errors = 0
+
+    async def worker(offset: int) -> None:
+        nonlocal errors
+        for arguments in calls[offset::concurrency]:
+            started = time.perf_counter()
+            result = await session.call_tool(name, arguments)
+            latencies.append(time.perf_counter() - started)
+            text = "".join(getattr(item, "text", "") for item in result.content)
+            sizes.append(len(text.encode("utf-8")))
+            if result.isError or text.startswith(ERROR_PREFIXES):
+                errors += 1
+
+    if trace_memory:
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        for offset in range(concurrency):
+            tg.start_soon(worker, offset)
+    elapsed = time.perf_counter() - started
+    peak_traced = tracemalloc.get_traced_memory()[1] if trace_memory else None
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "errors": errors,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": latencies[-1] * 1000 if latencies else 0.0,
+            "mean": sum(latencies) / len(latencies) * 1000 if latencies else 0.0
+        },
+        "requests_per_second": iterations / elapsed if elapsed > 0 else 0.0,
+        "response_bytes": {
+            "mean": sum(sizes) / len(sizes) if sizes else 0.0,
+            "max": max(sizes, default=0),
+            "total": sum(sizes)
+        },
+        "peak_traced_bytes": peak_traced
+    }
+
+
+async def run_benchmarks(options: argparse.Namespace) -> dict[str, Any]:
+    """Connect a client to the server over memory streams and bench each tool."""
+    global AUDIO_DIR
+    selected = options.tools or list(server.TOOL_REGISTRY)
+    missing = [name for name in selected if name not in SCENARIOS]
+    for name in missing:
+        print(f"warning: no scenario for tool '{name}', skipping", file=sys.stderr)
+
+    if options.no_cache:
+        server.RESPONSE_CACHE.max_entries = 0
+    if options.trace_memory:
+        tracemalloc.start()
+
+    results: dict[str, Any] = {}
+    audio_dir = tempfile.TemporaryDirectory(prefix="sound_healing_bench_")
+    AUDIO_DIR = audio_dir.name
+    if "analyze_audio_spectrum" in selected:
+        # A fixed recording for the spectrum analysis scenario
+        server._tool_synthesize_audio({
+            "frequency_names": ["solfeggio_528", "earth_432", "chakra_heart"],
+            "duration_seconds": RECORDING_SECONDS,
+            "output_path": os.path.join(AUDIO_DIR, RECORDING_NAME)
+        })
+    async with create_client_server_memory_streams() as (client_streams, server_streams):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(
+                server.app.run,
+                server_streams[0],
+                server_streams[1],
+                server.create_initialization_options()
+            )
+            async with ClientSession(client_streams[0], client_streams[1]) as session:
+                await session.initialize()
+                for name in selected:
+                    if name in missing:
+                        continue
+                    iterations = max(1, int(options.iterations * ITERATION_SCALE.get(name, 1.0)))
+                    results[name] = await bench_tool(
+                        session, name, SCENARIOS[name], iterations,
+                        min(options.warmup, iterations), options.concurrency,
+                        options.seed, options.trace_memory
+                    )
+                    print(format_row(name, results[name]), file=sys.stderr)
+            tg.cancel_scope.cancel()
+
+    if options.trace_memory:
+        tracemalloc.stop()
+    server.shutdown_executor()
+    audio_dir.cleanup()
+
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "settings": {
+            "iterations": options.iterations,
+            "warmup": options.warmup,
+            "concurrency": options.concurrency,
+            "seed": options.seed,
+            "cache_enabled": server.RESPONSE_CACHE.max_entries > 0,
+            "executor": server.EXECUTOR_KIND,
+            "offload_threshold": server.OFFLOAD_THRESHOLD
+        },
+        "peak_rss_bytes": peak_rss_bytes(),
+        "tools": results
+    }
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def format_row(name: str, result: dict[str, Any]) -> str:
+    latency = result["latency_ms"]
+    return (
+        f"{name:<34} p50 {latency['p50']:9.3f} ms  p99 {latency['p99']:9.3f} ms  "
+        f"max {latency['max']:9.3f} ms  {result['requests_per_second']:9.1f} req/s  "
+        f"{result['response_bytes']['mean']:11.0f} B/resp"
+    )
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    """Relative p50/p99/throughput change per tool present in both runs."""
+    lines = []
+    for name, result in current["tools"].items():
+        before = baseline.get("tools", {}).get(name)
+        if before is None:
+            continue
+
+        def change(old: float, new: float) -> str:
+            return f"{(new - old) / old * 100:+7.1f}%" if old else "    n/a"
+
+        lines.append(
+            f"{name:<34} p50 {change(before['latency_ms']['p50'], result['latency_ms']['p50'])}  "
+            f"p99 {change(before['latency_ms']['p99'], result['latency_ms']['p99'])}  "
+            f"req/s {change(before['requests_per_second'], result['requests_per_second'])}"
+        )
+    return lines
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark every Sound Healing MCP tool in-process.")
+    parser.add_argument("--iterations", type=int, default=200, help="Calls per tool (default: 200)")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed calls per tool (default: 10)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Calls in flight at once (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the argument distributions (default: 0)")
+    parser.add_argument("--tools", nargs="+", help="Only benchmark these tools")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the response cache")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record per-tool peak Python allocations with tracemalloc (slows every call)")
+    parser.add_argument("--output", default="bench_results.json", help="Results file (default: bench_results.json)")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    options = parse_args(argv)
+    results = anyio.run(run_benchmarks, options)
+
+    with open(options.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {options.output}", file=sys.stderr)
+
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nChange against {options.baseline}:", file=sys.stderr)
+        for line in compare(baseline, results):
+            print(line, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
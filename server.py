@@ -4,14 +4,75 @@ Provides tools and resources for accessing healing frequencies including
 well-tone frequencies, experimental frequencies, and innovative calculations.
 """
 
+from __future__ import annotations
+
 import asyncio
+import base64
+import contextlib
+import csv
+import hashlib
+import heapq
+import importlib.util
+import io
 import json
 import math
-from typing import Any, Sequence
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, Executor
+from dataclasses import dataclass, field, replace
+from functools import cached_property, partial
+from itertools import chain, combinations, islice
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Optional, Sequence
+from urllib.parse import unquote
+
 from mcp.server import Server
+from mcp.server.lowlevel import NotificationOptions
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.stdio import stdio_server
 from mcp.server.models import InitializationOptions
-from mcp.types import Tool, TextContent, ServerCapabilities
+from mcp.shared.exceptions import McpError
+from mcp.types import (
+    INVALID_PARAMS,
+    ErrorData,
+    Resource,
+    ResourcesCapability,
+    ResourceTemplate,
+    TextContent,
+    Tool,
+)
+from pydantic import AnyUrl
+
+
+def _lazy_import(name: str) -> Any:
+    """Return module ``name``, deferring its execution until first attribute access.
+
+    MCP clients start a fresh server process for every session, so modules
+    only some tools need (NumPy) are loaded by the first call that uses them
+    rather than at startup.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+np = _lazy_import("numpy")
 
 # Initialize the server
 app = Server("sound-healing-mcp")
@@ -45,6 +106,14 @@ WELL_TONE_FREQUENCIES = {
     "gamma": 40,  # Gamma brainwave
 }
 
+FIBONACCI_SEQUENCE = [1, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144]
+
+PHI = (1 + math.sqrt(5)) / 2
+
+# Generated values within this many cents of a smaller one are dropped as
+# duplicates, so float noise (527.9999999 next to 528) never adds an entry
+DEFAULT_DEDUPE_TOLERANCE_CENTS = 0.001
+
 
 def calculate_harmonic_series(base_freq: float, harmonics: int = 10) -> list[float]:
     """Calculate harmonic series from a base frequency."""
@@ -58,10 +127,9 @@ def calculate_pythagorean_ratio(freq: float, ratio: tuple[int, int]) -> float:
 
 def calculate_fibonacci_frequency(base: float, index: int) -> float:
     """Calculate frequency based on Fibonacci sequence."""
-    fibonacci = [1, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144]
-    if index < len(fibonacci):
-        return base * fibonacci[index]
-    return base * fibonacci[-1]
+    if not 0 <= index <= MAX_FIBONACCI_INDEX:
+        raise ValueError(f"Fibonacci index must be between 0 and {MAX_FIBONACCI_INDEX}")
+    return base * fibonacci_number(index)
 
 
 def calculate_golden_ratio_frequency(base: float) -> float:
@@ -86,15 +154,60 @@ def calculate_quantum_harmonics(freq: float, quantum_level: int) -> float:
     return freq * (quantum_level ** 2)
 
 
-def generate_fractal_frequencies(base: float, depth: int = 5) -> list[float]:
-    """Generate fractal-based frequencies using self-similar patterns."""
-    frequencies = [base]
-    for i in range(depth):
-        # Fractal pattern: each level multiplies by 2 and divides by golden ratio
-        phi = (1 + math.sqrt(5)) / 2
-        frequencies.append(frequencies[-1] * 2 / phi)
-        frequencies.append(frequencies[-1] * phi)
-    return sorted(set(frequencies))
+def generate_fractal_frequencies(
+    base: float,
+    depth: int = 5,
+    min_frequency: Optional[float] = None,
+    max_frequency: Optional[float] = None,
+    tolerance_cents: float = DEFAULT_DEDUPE_TOLERANCE_CENTS,
+) -> list[float]:
+    """Generate fractal-based frequencies using self-similar patterns.
+
+    Each level k multiplies by 2 and divides by the golden ratio, then
+    multiplies by phi again, contributing base * (2/phi)**k * phi**k ==
+    base * 2**k and base * (2/phi)**k * phi**(k - 1) == base * 2**k / phi.
+    Both are computed in closed form as exact power-of-two scalings, and only
+    the levels that can reach [min_frequency, max_frequency] are generated.
+    """
+    first, last = fractal_level_range(base, depth, min_frequency, max_frequency)
+    if first > last:
+        return []
+    levels = np.arange(first, last + 1)
+    values = np.concatenate([np.ldexp(float(base), levels), np.ldexp(base / PHI, levels[levels > 0])])
+    if min_frequency is not None:
+        values = values[values >= min_frequency]
+    if max_frequency is not None:
+        values = values[values <= max_frequency]
+    return dedupe_within_cents(values, tolerance_cents).tolist()
+
+
+def fractal_level_range(
+    base: float,
+    depth: int,
+    min_frequency: Optional[float] = None,
+    max_frequency: Optional[float] = None,
+) -> tuple[int, int]:
+    """First and last fractal level (within 0..depth) with values that can fall in the bounds.
+
+    Level k spans magnitudes |base| * 2**k / phi to |base| * 2**k; the window
+    is widened by a level on each side so rounding in log2 never drops one.
+    """
+    if base == 0:
+        inside = (min_frequency is None or min_frequency <= 0) and (max_frequency is None or max_frequency >= 0)
+        return (0, 0) if inside else (1, 0)
+    # Bounds on the signed values, as bounds on their magnitudes
+    low, high = (min_frequency, max_frequency) if base > 0 else (
+        None if max_frequency is None else -max_frequency,
+        None if min_frequency is None else -min_frequency,
+    )
+    if high is not None and high <= 0:
+        return 1, 0
+    first, last = 0, depth
+    if low is not None and low > 0:
+        first = max(first, math.floor(math.log2(low / abs(base))) - 1)
+    if high is not None:
+        last = min(last, math.ceil(math.log2(high * PHI / abs(base))) + 1)
+    return first, last
 
 
 def calculate_resonance_cascade(base: float, steps: int = 7) -> list[float]:
@@ -107,507 +220,5384 @@ def calculate_resonance_cascade(base: float, steps: int = 7) -> list[float]:
     return cascade
 
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List all available tools."""
-    return [
-        Tool(
-            name="get_well_tone_frequency",
-            description="Get a specific well-tone healing frequency by name (e.g., chakra_base, solfeggio_528, earth_432)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "frequency_name": {
-                        "type": "string",
-                        "description": "Name of the well-tone frequency to retrieve"
-                    }
-                },
-                "required": ["frequency_name"]
-            }
-        ),
-        Tool(
-            name="list_all_well_tones",
-            description="List all available well-tone frequencies organized by category",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="get_chakra_frequencies",
-            description="Get all chakra healing frequencies",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="calculate_harmonic_series",
-            description="Calculate harmonic series from a base frequency",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "base_frequency": {
-                        "type": "number",
-                        "description": "Base frequency in Hz"
-                    },
-                    "harmonics_count": {
-                        "type": "integer",
-                        "description": "Number of harmonics to calculate (default: 10)",
-                        "default": 10
-                    }
-                },
-                "required": ["base_frequency"]
-            }
-        ),
-        Tool(
-            name="calculate_pythagorean_frequency",
-            description="Calculate frequency using Pythagorean ratios",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "base_frequency": {
-                        "type": "number",
-                        "description": "Base frequency in Hz"
-                    },
-                    "numerator": {
-                        "type": "integer",
-                        "description": "Numerator of the ratio"
-                    },
-                    "denominator": {
-                        "type": "integer",
-                        "description": "Denominator of the ratio"
-                    }
-                },
-                "required": ["base_frequency", "numerator", "denominator"]
-            }
-        ),
-        Tool(
-            name="calculate_fibonacci_frequency",
-            description="Calculate frequency based on Fibonacci sequence",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "base_frequency": {
-                        "type": "number",
-                        "description": "Base frequency in Hz"
-                    },
-                    "fibonacci_index": {
-                        "type": "integer",
-                        "description": "Index in Fibonacci sequence (0-11)",
-                        "minimum": 0,
-                        "maximum": 11
-                    }
-                },
-                "required": ["base_frequency", "fibonacci_index"]
-            }
-        ),
-        Tool(
-            name="calculate_golden_ratio_frequency",
-            description="Calculate frequency using golden ratio (phi)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "base_frequency": {
-                        "type": "number",
-                        "description": "Base frequency in Hz"
-                    }
-                },
-                "required": ["base_frequency"]
-            }
-        ),
-        Tool(
-            name="calculate_prime_harmonics",
-            description="Calculate harmonics using prime numbers",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "base_frequency": {
-                        "type": "number",
-                        "description": "Base frequency in Hz"
-                    },
-                    "primes": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "List of prime numbers to use (default: first 10 primes)"
-                    }
-                },
-                "required": ["base_frequency"]
-            }
-        ),
-        Tool(
-            name="generate_phi_spiral_frequencies",
-            description="Generate frequencies based on golden ratio spiral",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "base_frequency": {
-                        "type": "number",
-                        "description": "Base frequency in Hz"
-                    },
-                    "count": {
-                        "type": "integer",
-                        "description": "Number of frequencies to generate (default: 10)",
-                        "default": 10
-                    }
-                },
-                "required": ["base_frequency"]
-            }
-        ),
-        Tool(
-            name="calculate_quantum_harmonic",
-            description="Calculate quantum-level harmonics based on energy levels",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "base_frequency": {
-                        "type": "number",
-                        "description": "Base frequency in Hz"
-                    },
-                    "quantum_level": {
-                        "type": "integer",
-                        "description": "Quantum energy level (1-10)",
-                        "minimum": 1,
-                        "maximum": 10
-                    }
-                },
-                "required": ["base_frequency", "quantum_level"]
-            }
-        ),
-        Tool(
-            name="generate_fractal_frequencies",
-            description="Generate fractal-based frequencies using self-similar patterns",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "base_frequency": {
-                        "type": "number",
-                        "description": "Base frequency in Hz"
-                    },
-                    "depth": {
-                        "type": "integer",
-                        "description": "Fractal depth (default: 5)",
-                        "default": 5
-                    }
-                },
-                "required": ["base_frequency"]
-            }
-        ),
-        Tool(
-            name="calculate_resonance_cascade",
-            description="Calculate resonance cascade frequencies",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "base_frequency": {
-                        "type": "number",
-                        "description": "Base frequency in Hz"
-                    },
-                    "steps": {
-                        "type": "integer",
-                        "description": "Number of cascade steps (default: 7)",
-                        "default": 7
-                    }
-                },
-                "required": ["base_frequency"]
-            }
-        ),
-        Tool(
-            name="generate_custom_frequency_matrix",
-            description="Generate a matrix of frequencies combining multiple mathematical principles",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "base_frequency": {
-                        "type": "number",
-                        "description": "Base frequency in Hz"
-                    },
-                    "include_fibonacci": {
-                        "type": "boolean",
-                        "description": "Include Fibonacci-based frequencies",
-                        "default": True
-                    },
-                    "include_golden_ratio": {
-                        "type": "boolean",
-                        "description": "Include golden ratio frequencies",
-                        "default": True
-                    },
-                    "include_primes": {
-                        "type": "boolean",
-                        "description": "Include prime-based harmonics",
-                        "default": True
-                    },
-                    "matrix_size": {
-                        "type": "integer",
-                        "description": "Size of the frequency matrix (default: 8)",
-                        "default": 8
-                    }
-                },
-                "required": ["base_frequency"]
-            }
-        )
-    ]
+# Exact Fibonacci numbers, indexed like FIBONACCI_SEQUENCE (1, 1, 2, 3, 5, ...).
+# Every number that fits in a float is memoized in a prefix table, grown on
+# first use and swapped in whole so concurrent readers never see a partial
+# list; larger indices use fast doubling, O(log n) big-integer products.
 
+MAX_FIBONACCI_INDEX = 1475  # largest index whose Fibonacci number converts to a float
+FIBONACCI_PREFIX_LIMIT = MAX_FIBONACCI_INDEX + 1
+_fibonacci_prefix = FIBONACCI_SEQUENCE[:2]
 
-@app.call_tool()
-async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
-    """Handle tool calls."""
-    
-    if name == "get_well_tone_frequency":
-        freq_name = arguments.get("frequency_name", "")
-        if freq_name in WELL_TONE_FREQUENCIES:
-            freq = WELL_TONE_FREQUENCIES[freq_name]
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "frequency_name": freq_name,
-                        "frequency_hz": freq,
-                        "description": f"Retrieved {freq_name} frequency"
-                    }, indent=2)
-                )
-            ]
+
+def _fibonacci_pair(n: int) -> tuple[int, int]:
+    """(F(n), F(n + 1)) with F(0) = 0, F(1) = 1, by fast doubling."""
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        a, b = (d, c + d) if bit == "1" else (c, d)
+    return a, b
+
+
+def fibonacci_prefix(count: int) -> list[int]:
+    """The first ``count`` Fibonacci numbers; up to FIBONACCI_PREFIX_LIMIT of them are memoized."""
+    global _fibonacci_prefix
+    prefix = _fibonacci_prefix
+    if len(prefix) < min(count, FIBONACCI_PREFIX_LIMIT):
+        prefix = list(prefix)
+        while len(prefix) < min(count, FIBONACCI_PREFIX_LIMIT):
+            prefix.append(prefix[-1] + prefix[-2])
+        _fibonacci_prefix = prefix
+    if count <= len(prefix):
+        return prefix[:count]
+    numbers = list(prefix)
+    while len(numbers) < count:
+        numbers.append(numbers[-1] + numbers[-2])
+    return numbers
+
+
+def fibonacci_number(index: int) -> int:
+    """Exact Fibonacci number at ``index`` (0-based, so fibonacci_number(11) == 144)."""
+    if index < 0:
+        raise ValueError("Fibonacci index must be non-negative")
+    if index < FIBONACCI_PREFIX_LIMIT:
+        prefix = _fibonacci_prefix
+        return prefix[index] if index < len(prefix) else fibonacci_prefix(index + 1)[index]
+    return _fibonacci_pair(index + 1)[0]
+
+
+def fibonacci_log(index: int) -> float:
+    """Natural log of fibonacci_number(index), without computing large numbers."""
+    if index < FIBONACCI_PREFIX_LIMIT:
+        return math.log(fibonacci_number(index))
+    phi = (1 + math.sqrt(5)) / 2
+    return (index + 1) * math.log(phi) - 0.5 * math.log(5)
+
+
+def fibonacci_multiples(base: float, count: int) -> list[float]:
+    """The first ``count`` Fibonacci multiples of ``base`` in one pass over the prefix table."""
+    return [base * number for number in fibonacci_prefix(count)]
+
+
+# Resumable generators behind paginated responses: each yields the same values
+# as the list-returning function above, starting at index ``start``.
+
+def iter_harmonic_series(base_freq: float, start: int = 0) -> Iterator[float]:
+    """Yield the harmonic series of ``base_freq`` from harmonic index ``start``."""
+    n = start
+    while True:
+        yield base_freq * (n + 1)
+        n += 1
+
+
+def iter_phi_based_frequencies(base: float, start: int = 0) -> Iterator[float]:
+    """Yield phi spiral frequencies of ``base`` from index ``start``."""
+    phi = (1 + math.sqrt(5)) / 2
+    n = start
+    while True:
+        yield base * (phi ** n)
+        n += 1
+
+
+def iter_fibonacci_frequencies(base: float, start: int = 0) -> Iterator[float]:
+    """Yield Fibonacci multiples of ``base`` from sequence index ``start``."""
+    a, b = _fibonacci_pair(start + 1)
+    while True:
+        yield base * a
+        a, b = b, a + b
+
+
+def iter_resonance_cascade(base: float, start: int = 0) -> Iterator[float]:
+    """Yield resonance cascade frequencies of ``base`` from step ``start``."""
+    freq = base
+    for _ in range(start):
+        freq = freq * math.sqrt(2)
+    while True:
+        yield freq
+        freq = freq * math.sqrt(2)
+
+
+def dedupe_within_cents(values: np.ndarray, tolerance_cents: float) -> np.ndarray:
+    """Sorted distinct values, dropping any within ``tolerance_cents`` above a kept one.
+
+    Generators dedupe through this rather than ``set()``, whose exact float
+    equality keeps near-duplicates that differ only by rounding.
+    """
+    values = np.unique(values)
+    if not tolerance_cents or len(values) < 2:
+        return values
+    negative, positive = values[values < 0], values[values > 0]
+    # Negative values are deduped by magnitude, so the kept one is the nearest to zero
+    return np.concatenate([
+        -_dedupe_magnitudes(-negative[::-1], tolerance_cents)[::-1],
+        values[values == 0],
+        _dedupe_magnitudes(positive, tolerance_cents),
+    ])
+
+
+def _dedupe_magnitudes(values: np.ndarray, tolerance_cents: float) -> np.ndarray:
+    keys = np.log2(values)
+    step = tolerance_cents / 1200.0
+    if not (np.diff(keys) <= step).any():
+        return values
+    kept = []
+    i = 0
+    # One binary search per kept value: each jumps past the values it absorbs
+    while i < len(keys):
+        kept.append(i)
+        i = int(np.searchsorted(keys, keys[i] + step, side="right"))
+    return values[kept]
+
+
+# ---------------------------------------------------------------------------
+# Vectorized batch calculators
+#
+# Each function takes a 1-D array of base frequencies and returns a 2-D array
+# with one row per base, computed in a single NumPy broadcast. Rows match the
+# scalar calculators above for the same base and parameters.
+# ---------------------------------------------------------------------------
+
+def batch_harmonic_series(bases: np.ndarray, harmonics: int = 10) -> np.ndarray:
+    """Harmonic series for many bases as an outer product."""
+    return np.outer(bases, np.arange(1, harmonics + 1))
+
+
+def batch_pythagorean_ratios(bases: np.ndarray, ratios: list[tuple[int, int]]) -> np.ndarray:
+    """Frequencies for every (base, ratio) pair."""
+    ratio_values = np.array([numerator / denominator for numerator, denominator in ratios])
+    return np.outer(bases, ratio_values)
+
+
+def batch_fibonacci_frequencies(bases: np.ndarray, indices: list[int]) -> np.ndarray:
+    """Fibonacci multiples of every base for the given sequence indices (each <= MAX_FIBONACCI_INDEX)."""
+    indices = np.asarray(indices, dtype=np.intp)
+    count = int(indices.max()) + 1 if indices.size else 0
+    fibonacci = np.array([float(number) for number in fibonacci_prefix(count)], dtype=np.float64)
+    return np.outer(bases, fibonacci[indices])
+
+
+def batch_golden_ratio_frequencies(bases: np.ndarray) -> np.ndarray:
+    """Golden ratio frequency of every base, as a single-column matrix."""
+    phi = (1 + math.sqrt(5)) / 2
+    return bases[:, None] * phi
+
+
+def batch_prime_harmonics(bases: np.ndarray, primes: list[int]) -> np.ndarray:
+    """Prime harmonics of every base as an outer product."""
+    return np.outer(bases, np.asarray(primes, dtype=np.float64))
+
+
+def batch_phi_based_frequencies(bases: np.ndarray, count: int = 10) -> np.ndarray:
+    """Phi spiral of every base: base[:, None] * phi ** arange(count)."""
+    phi = (1 + math.sqrt(5)) / 2
+    return bases[:, None] * phi ** np.arange(count)
+
+
+def batch_quantum_harmonics(bases: np.ndarray, quantum_levels: list[int]) -> np.ndarray:
+    """Quantum harmonics of every base for each energy level."""
+    levels = np.asarray(quantum_levels, dtype=np.float64)
+    return np.outer(bases, levels ** 2)
+
+
+def batch_fractal_frequencies(bases: np.ndarray, depth: int = 5) -> np.ndarray:
+    """Fractal frequencies of every base in closed form, each row sorted ascending."""
+    levels = np.arange(1, depth + 1)
+    columns = np.empty((len(bases), 2 * depth + 1))
+    columns[:, 0] = bases
+    columns[:, 1::2] = np.ldexp(bases[:, None] / PHI, levels)
+    columns[:, 2::2] = np.ldexp(bases[:, None], levels)
+    # Rows of non-negative bases are already ascending: 2**k < 2**(k + 1) / phi < 2**(k + 1)
+    return np.sort(columns, axis=1) if (bases < 0).any() else columns
+
+
+def batch_resonance_cascade(bases: np.ndarray, steps: int = 7) -> np.ndarray:
+    """Resonance cascade of every base as a cumulative sqrt(2) product."""
+    factors = np.empty((len(bases), max(steps, 1)))
+    factors[:, 0] = bases
+    factors[:, 1:] = math.sqrt(2)
+    return np.cumprod(factors, axis=1)
+
+
+# ---------------------------------------------------------------------------
+# Well-tone index
+#
+# Nearest-tone lookups use a sorted array of log2 frequencies (or of pitch
+# classes, log2 mod 1, for octave-equivalent matching) and searchsorted, so
+# annotating n values against m tones costs O(n log m) rather than O(n * m).
+# ---------------------------------------------------------------------------
+
+class ToneIndex:
+    """Sorted log-frequency index over a name -> frequency catalog.
+
+    Catalog entries sharing a frequency (e.g. chakra_solar_plexus,
+    love_frequency and solfeggio_528) are grouped into one indexed tone.
+    """
+
+    def __init__(self, catalog: dict[str, float]) -> None:
+        grouped: dict[float, list[str]] = {}
+        for name, frequency in catalog.items():
+            if frequency > 0:
+                grouped.setdefault(float(frequency), []).append(name)
+        self.frequencies = np.array(sorted(grouped), dtype=np.float64)
+        self.names = [grouped[f] for f in self.frequencies.tolist()]
+        self._log2 = np.log2(self.frequencies)
+        pitch_classes = self._log2 % 1.0
+        self._pc_order = np.argsort(pitch_classes, kind="stable")
+        self._pc_sorted = pitch_classes[self._pc_order]
+
+    def __len__(self) -> int:
+        return len(self.frequencies)
+
+    def nearest(
+        self,
+        queries: Sequence[float],
+        k: int = 1,
+        octave_equivalent: bool = False,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return (tone indices, octave shifts), each queries x k, nearest first.
+
+        Distance is measured in log-frequency (cents). With
+        ``octave_equivalent`` a tone matches at whichever octave is closest
+        to the query, and the returned shift is that octave offset.
+        """
+        log_queries = np.log2(np.asarray(queries, dtype=np.float64))
+        k = min(k, len(self))
+        if octave_equivalent:
+            keys, order = self._pc_sorted, self._pc_order
+            targets = log_queries % 1.0
         else:
-            available = ", ".join(WELL_TONE_FREQUENCIES.keys())
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "error": f"Frequency '{freq_name}' not found",
-                        "available_frequencies": available
-                    }, indent=2)
-                )
-            ]
-    
-    elif name == "list_all_well_tones":
-        categorized = {
-            "chakras": {k: v for k, v in WELL_TONE_FREQUENCIES.items() if k.startswith("chakra_")},
-            "solfeggio": {k: v for k, v in WELL_TONE_FREQUENCIES.items() if k.startswith("solfeggio_")},
-            "earth_resonance": {k: v for k, v in WELL_TONE_FREQUENCIES.items() if k.startswith("earth_")},
-            "brainwaves": {k: v for k, v in WELL_TONE_FREQUENCIES.items() if k in ["theta", "delta", "alpha", "beta", "gamma"]},
-            "special": {k: v for k, v in WELL_TONE_FREQUENCIES.items() if k == "love_frequency"}
+            keys, order = self._log2, None
+            targets = log_queries
+
+        size = len(keys)
+        if 2 * k >= size:
+            candidates = np.broadcast_to(np.arange(size), (len(targets), size))
+            valid = np.ones(candidates.shape, dtype=bool)
+        else:
+            start = np.searchsorted(keys, targets)
+            candidates = start[:, None] + np.arange(-k, k)
+            if octave_equivalent:
+                candidates = candidates % size
+                valid = np.ones(candidates.shape, dtype=bool)
+            else:
+                valid = (candidates >= 0) & (candidates < size)
+                candidates = np.clip(candidates, 0, size - 1)
+
+        offsets = targets[:, None] - keys[candidates]
+        if octave_equivalent:
+            offsets = (offsets + 0.5) % 1.0 - 0.5
+        distance = np.where(valid, np.abs(offsets), np.inf)
+        best = np.argsort(distance, axis=1, kind="stable")[:, :k]
+        tones = np.take_along_axis(candidates, best, axis=1)
+        if order is not None:
+            tones = order[tones]
+        shifts = np.rint(log_queries[:, None] - self._log2[tones]) if octave_equivalent else np.zeros(tones.shape)
+        return tones, shifts.astype(np.int64)
+
+    def describe(self, query: float, tone: int, shift: int) -> dict[str, Any]:
+        """Describe one match of ``query`` against indexed tone ``tone``."""
+        matched = float(self.frequencies[tone] * 2.0 ** shift)
+        return {
+            "names": self.names[tone],
+            "frequency_hz": float(self.frequencies[tone]),
+            "octave_shift": int(shift),
+            "matched_frequency_hz": matched,
+            "distance_hz": query - matched,
+            "distance_cents": 1200 * math.log2(query / matched)
         }
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps(categorized, indent=2)
-            )
-        ]
-    
-    elif name == "get_chakra_frequencies":
-        chakras = {k: v for k, v in WELL_TONE_FREQUENCIES.items() if k.startswith("chakra_")}
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps(chakras, indent=2)
-            )
-        ]
-    
-    elif name == "calculate_harmonic_series":
-        base = arguments["base_frequency"]
-        count = arguments.get("harmonics_count", 10)
-        harmonics = calculate_harmonic_series(base, count)
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({
-                    "base_frequency": base,
-                    "harmonics": harmonics,
-                    "count": len(harmonics)
-                }, indent=2)
-            )
-        ]
-    
-    elif name == "calculate_pythagorean_frequency":
-        base = arguments["base_frequency"]
-        num = arguments["numerator"]
-        den = arguments["denominator"]
-        freq = calculate_pythagorean_ratio(base, (num, den))
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({
-                    "base_frequency": base,
-                    "ratio": f"{num}/{den}",
-                    "calculated_frequency": freq
-                }, indent=2)
-            )
-        ]
-    
-    elif name == "calculate_fibonacci_frequency":
-        base = arguments["base_frequency"]
-        index = arguments["fibonacci_index"]
-        freq = calculate_fibonacci_frequency(base, index)
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({
-                    "base_frequency": base,
-                    "fibonacci_index": index,
-                    "calculated_frequency": freq
-                }, indent=2)
-            )
-        ]
-    
-    elif name == "calculate_golden_ratio_frequency":
-        base = arguments["base_frequency"]
-        freq = calculate_golden_ratio_frequency(base)
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({
-                    "base_frequency": base,
-                    "golden_ratio_frequency": freq,
-                    "phi": (1 + math.sqrt(5)) / 2
-                }, indent=2)
-            )
-        ]
-    
-    elif name == "calculate_prime_harmonics":
-        base = arguments["base_frequency"]
-        primes = arguments.get("primes", [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
-        harmonics = calculate_prime_harmonics(base, primes)
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({
-                    "base_frequency": base,
-                    "primes_used": primes,
-                    "prime_harmonics": harmonics
-                }, indent=2)
-            )
-        ]
-    
-    elif name == "generate_phi_spiral_frequencies":
-        base = arguments["base_frequency"]
-        count = arguments.get("count", 10)
-        frequencies = generate_phi_based_frequencies(base, count)
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({
-                    "base_frequency": base,
-                    "phi_spiral_frequencies": frequencies,
-                    "count": len(frequencies)
-                }, indent=2)
-            )
-        ]
-    
-    elif name == "calculate_quantum_harmonic":
-        base = arguments["base_frequency"]
-        level = arguments["quantum_level"]
-        freq = calculate_quantum_harmonics(base, level)
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({
-                    "base_frequency": base,
-                    "quantum_level": level,
-                    "quantum_harmonic_frequency": freq
-                }, indent=2)
-            )
-        ]
-    
-    elif name == "generate_fractal_frequencies":
-        base = arguments["base_frequency"]
-        depth = arguments.get("depth", 5)
-        frequencies = generate_fractal_frequencies(base, depth)
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({
-                    "base_frequency": base,
-                    "fractal_depth": depth,
-                    "fractal_frequencies": frequencies,
-                    "count": len(frequencies)
-                }, indent=2)
-            )
-        ]
-    
-    elif name == "calculate_resonance_cascade":
-        base = arguments["base_frequency"]
-        steps = arguments.get("steps", 7)
-        cascade = calculate_resonance_cascade(base, steps)
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({
-                    "base_frequency": base,
-                    "steps": steps,
-                    "resonance_cascade": cascade
-                }, indent=2)
-            )
-        ]
-    
-    elif name == "generate_custom_frequency_matrix":
-        base = arguments["base_frequency"]
-        include_fib = arguments.get("include_fibonacci", True)
-        include_phi = arguments.get("include_golden_ratio", True)
-        include_primes = arguments.get("include_primes", True)
-        size = arguments.get("matrix_size", 8)
-        
-        matrix = []
-        if include_fib:
-            fib_freqs = [calculate_fibonacci_frequency(base, i) for i in range(min(size, 12))]
-            matrix.extend(fib_freqs)
-        if include_phi:
-            phi_freqs = generate_phi_based_frequencies(base, size)
-            matrix.extend(phi_freqs)
-        if include_primes:
-            primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29][:size]
-            prime_freqs = calculate_prime_harmonics(base, primes)
-            matrix.extend(prime_freqs)
-        
-        # Remove duplicates and sort
-        matrix = sorted(set(matrix))
-        
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({
-                    "base_frequency": base,
-                    "matrix_size": len(matrix),
-                    "frequency_matrix": matrix,
-                    "includes": {
-                        "fibonacci": include_fib,
-                        "golden_ratio": include_phi,
-                        "primes": include_primes
-                    }
-                }, indent=2)
-            )
+
+    def annotate(self, values: Sequence[float], octave_equivalent: bool = False) -> list[Optional[dict[str, Any]]]:
+        """Nearest tone for every value in one vectorized lookup (None for values <= 0)."""
+        values = [float(v) for v in values]
+        positive = [v for v in values if v > 0]
+        if not positive or not len(self):
+            return [None] * len(values)
+        tones, shifts = self.nearest(positive, 1, octave_equivalent)
+        matches = iter(zip(positive, tones[:, 0].tolist(), shifts[:, 0].tolist()))
+        return [self.describe(*next(matches)) if v > 0 else None for v in values]
+
+
+
+# ---------------------------------------------------------------------------
+# Well-tone catalog
+#
+# The named-tone catalog is WELL_TONE_FREQUENCIES unless SOUND_HEALING_CATALOG
+# points at a JSON, TOML or CSV file. Each load produces an immutable
+# ToneCatalog snapshot with a name hash, a category index, a sorted
+# frequency list for range queries and (built on first use) a trigram index
+# for "did you mean" suggestions and the nearest-tone ToneIndex. When the
+# file's mtime changes the new catalog is parsed off the event loop and
+# swapped in with a single assignment; requests already running keep the
+# snapshot they started with.
+# ---------------------------------------------------------------------------
+
+CATALOG_PATH = os.environ.get("SOUND_HEALING_CATALOG")
+CATALOG_CHECK_INTERVAL_SECONDS = float(os.environ.get("SOUND_HEALING_CATALOG_CHECK_INTERVAL", 2))
+CATALOG_CATEGORIES = ("chakras", "solfeggio", "earth_resonance", "brainwaves", "special")
+BRAINWAVE_NAMES = ("theta", "delta", "alpha", "beta", "gamma")
+# Misses list every name only for catalogs small enough to read
+MAX_LISTED_NAMES = 100
+
+
+class CatalogError(ValueError):
+    """A catalog file that cannot be loaded."""
+
+
+def default_category(name: str) -> str:
+    """Category implied by the built-in naming scheme, for entries without one."""
+    if name.startswith("chakra_"):
+        return "chakras"
+    if name.startswith("solfeggio_"):
+        return "solfeggio"
+    if name.startswith("earth_"):
+        return "earth_resonance"
+    if name in BRAINWAVE_NAMES:
+        return "brainwaves"
+    if name == "love_frequency":
+        return "special"
+    return "other"
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ToneCatalog:
+    """Immutable, indexed snapshot of a name -> frequency catalog."""
+
+    def __init__(
+        self,
+        entries: Iterable[tuple[str, float, str]],
+        source: Optional[str] = None,
+        stamp: Optional[tuple[int, int]] = None,
+    ) -> None:
+        self.frequencies: dict[str, float] = {}
+        self.category_of: dict[str, str] = {}
+        self.categories: dict[str, dict[str, float]] = {category: {} for category in CATALOG_CATEGORIES}
+        for name, frequency, category in entries:
+            if name in self.frequencies:
+                raise CatalogError(f"Duplicate tone name '{name}'")
+            self.frequencies[name] = frequency
+            self.category_of[name] = category
+            self.categories.setdefault(category, {})[name] = frequency
+        self.names = list(self.frequencies)
+        self.source = source
+        self.stamp = stamp
+
+    @classmethod
+    def from_mapping(cls, mapping: dict[str, float], **kwargs: Any) -> "ToneCatalog":
+        return cls(((name, frequency, default_category(name)) for name, frequency in mapping.items()), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.frequencies)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.frequencies
+
+    @cached_property
+    def _by_frequency(self) -> tuple[list[float], list[str]]:
+        ordered = sorted(self.frequencies.items(), key=lambda item: item[1])
+        return [frequency for _, frequency in ordered], [name for name, _ in ordered]
+
+    def in_range(self, low: float = 0.0, high: float = math.inf) -> list[str]:
+        """Names with low <= frequency <= high, in ascending frequency order."""
+        frequencies, names = self._by_frequency
+        return names[bisect_left(frequencies, low):bisect_right(frequencies, high)]
+
+    @cached_property
+    def _trigram_index(self) -> tuple[dict[str, list[int]], list[int]]:
+        index: dict[str, list[int]] = {}
+        sizes = []
+        for position, name in enumerate(self.names):
+            grams = _trigrams(name)
+            sizes.append(len(grams))
+            for gram in grams:
+                index.setdefault(gram, []).append(position)
+        return index, sizes
+
+    def suggest(self, query: str, limit: Optional[int] = 5, min_score: float = 0.3) -> list[tuple[str, float]]:
+        """Names most similar to ``query`` (trigram Dice coefficient), best first."""
+        index, sizes = self._trigram_index
+        query_grams = _trigrams(query)
+        shared: dict[int, int] = {}
+        for gram in query_grams:
+            for position in index.get(gram, ()):
+                shared[position] = shared.get(position, 0) + 1
+        scored = [
+            (2 * count / (len(query_grams) + sizes[position]), position)
+            for position, count in shared.items()
         ]
-    
+        scored = [(score, position) for score, position in scored if score >= min_score]
+        ranked = heapq.nlargest(limit, scored) if limit is not None else sorted(scored, reverse=True)
+        return [(self.names[position], score) for score, position in ranked]
+
+    def build_indexes(self) -> "ToneCatalog":
+        """Build the lazily created search indexes now (e.g. off the event loop)."""
+        self._by_frequency
+        self._trigram_index
+        return self
+
+    @cached_property
+    def tone_index(self) -> ToneIndex:
+        return ToneIndex(self.frequencies)
+
+    def not_found(self, name: str) -> dict[str, Any]:
+        """Error payload for an unknown tone name."""
+        error: dict[str, Any] = {
+            "error": f"Frequency '{name}' not found",
+            "did_you_mean": [suggestion for suggestion, _ in self.suggest(name)]
+        }
+        if len(self) <= MAX_LISTED_NAMES:
+            error["available_frequencies"] = ", ".join(self.names)
+        return error
+
+
+def _catalog_entry(name: Any, frequency: Any, category: Any) -> tuple[str, float, str]:
+    if not isinstance(name, str) or not name:
+        raise CatalogError(f"Tone names must be non-empty strings, got {name!r}")
+    if not _is_number(frequency) or not 0 < frequency < math.inf:
+        raise CatalogError(f"Tone '{name}' needs a positive, finite frequency, got {frequency!r}")
+    if category is not None and not isinstance(category, str):
+        raise CatalogError(f"Category of tone '{name}' must be a string, got {category!r}")
+    return name, frequency, category or default_category(name)
+
+
+def _entries_from_document(document: Any) -> Iterator[tuple[str, float, str]]:
+    """Entries of a parsed JSON/TOML catalog.
+
+    Accepts a flat {name: frequency} mapping, {category: {name: frequency}}
+    groups (the shape list_all_well_tones returns), or a list of
+    {"name", "frequency", "category"} objects, optionally under "tones".
+    """
+    if isinstance(document, dict) and isinstance(document.get("tones"), list):
+        document = document["tones"]
+    if isinstance(document, list):
+        for position, item in enumerate(document):
+            if not isinstance(item, dict) or "name" not in item:
+                raise CatalogError(f"Catalog entry {position} must be an object with 'name' and 'frequency'")
+            frequency = item.get("frequency", item.get("frequency_hz"))
+            yield _catalog_entry(item["name"], frequency, item.get("category"))
+    elif isinstance(document, dict):
+        for key, value in document.items():
+            if isinstance(value, dict):
+                for name, frequency in value.items():
+                    yield _catalog_entry(name, frequency, key)
+            else:
+                yield _catalog_entry(key, value, None)
     else:
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({"error": f"Unknown tool: {name}"})
-            )
-        ]
+        raise CatalogError("A catalog must be an object or a list of tone entries")
 
 
-async def main():
-    """Run the MCP server."""
-    import sys
-    # Write to stderr so it doesn't interfere with stdio communication
-    print("Sound Healing MCP Server starting...", file=sys.stderr)
-    print("Server name: sound-healing-mcp", file=sys.stderr)
-    print("Version: 1.0.0", file=sys.stderr)
-    print("Communication: stdio (standard input/output)", file=sys.stderr)
-    print("Ready for MCP client connections...", file=sys.stderr)
-    print("(Note: This server uses stdio, not HTTP/ports)", file=sys.stderr)
-    
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="sound-healing-mcp",
-                server_version="1.0.0",
-                capabilities=ServerCapabilities()
+def _parse_csv_number(text: str) -> Any:
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return float(text)
+        except ValueError:
+            return text
+
+
+def _entries_from_csv(text: str) -> Iterator[tuple[str, float, str]]:
+    """Entries of a CSV catalog with name and frequency (or frequency_hz) columns and an optional category."""
+    reader = csv.DictReader(io.StringIO(text))
+    fields = reader.fieldnames or []
+    frequency_column = "frequency" if "frequency" in fields else "frequency_hz"
+    if "name" not in fields or frequency_column not in fields:
+        raise CatalogError("CSV catalogs need 'name' and 'frequency' columns")
+    for row in reader:
+        try:
+            yield _catalog_entry(
+                (row["name"] or "").strip(),
+                _parse_csv_number((row[frequency_column] or "").strip()),
+                (row.get("category") or "").strip() or None,
             )
+        except CatalogError as exc:
+            raise CatalogError(f"Line {reader.line_num}: {exc}") from None
+
+
+def _parse_toml(data: bytes) -> Any:
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise CatalogError("TOML catalogs need Python 3.11+ or the tomli package") from None
+    return tomllib.loads(data.decode("utf-8"))
+
+
+def _file_stamp(path: str) -> tuple[int, int]:
+    status = os.stat(path)
+    return status.st_mtime_ns, status.st_size
+
+
+def load_catalog(path: str) -> ToneCatalog:
+    """Parse a .json, .toml or .csv catalog file."""
+    stamp = _file_stamp(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == ".json":
+            entries = list(_entries_from_document(json.loads(data)))
+        elif extension == ".toml":
+            entries = list(_entries_from_document(_parse_toml(data)))
+        elif extension == ".csv":
+            entries = list(_entries_from_csv(data.decode("utf-8-sig")))
+        else:
+            raise CatalogError(f"Unsupported catalog format '{extension}' (use .json, .toml or .csv)")
+    except (ValueError, UnicodeDecodeError) as exc:
+        if isinstance(exc, CatalogError):
+            raise
+        raise CatalogError(f"Could not parse {path}: {exc}") from None
+    return ToneCatalog(entries, source=path, stamp=stamp)
+
+
+_catalog: Optional[ToneCatalog] = None
+_catalog_checked_at = 0.0
+_failed_stamp: Optional[tuple[int, int]] = None
+_reload_inline = False  # set in pool workers, which have no watcher task
+
+
+def tone_catalog() -> ToneCatalog:
+    """The current catalog snapshot; callers should fetch it once per request."""
+    if _catalog is None:
+        install_catalog(load_catalog(CATALOG_PATH) if CATALOG_PATH else ToneCatalog.from_mapping(WELL_TONE_FREQUENCIES))
+    elif _reload_inline and CATALOG_PATH:
+        catalog = load_changed_catalog()
+        if catalog is not None:
+            install_catalog(catalog)
+    return _catalog
+
+
+def well_tone_index() -> ToneIndex:
+    """The ToneIndex over the current catalog, built on first use."""
+    return tone_catalog().tone_index
+
+
+def load_changed_catalog(force: bool = False) -> Optional[ToneCatalog]:
+    """Load CATALOG_PATH if it changed since the current snapshot, else None.
+
+    Checks are rate-limited to one stat() per CATALOG_CHECK_INTERVAL_SECONDS
+    unless ``force`` is set. A file that fails to parse is reported once and
+    the current catalog stays in place until the file changes again.
+    """
+    global _catalog_checked_at, _failed_stamp
+    now = time.monotonic()
+    if not force and now - _catalog_checked_at < CATALOG_CHECK_INTERVAL_SECONDS:
+        return None
+    _catalog_checked_at = now
+    try:
+        stamp = _file_stamp(CATALOG_PATH)
+    except OSError:
+        return None
+    if (_catalog is not None and stamp == _catalog.stamp) or stamp == _failed_stamp:
+        return None
+    try:
+        return load_catalog(CATALOG_PATH)
+    except (OSError, CatalogError) as exc:
+        _failed_stamp = stamp
+        print(f"Keeping the current catalog; reload of {CATALOG_PATH} failed: {exc}", file=sys.stderr)
+        return None
+
+
+def install_catalog(catalog: ToneCatalog) -> None:
+    """Make ``catalog`` current and drop every response derived from the old one."""
+    global _catalog
+    previous, _catalog = _catalog, catalog
+    if previous is not None:
+        _rebuild_static_responses()
+        invalidate_resources()
+        RESPONSE_CACHE.clear()
+
+
+async def watch_catalog(interval: float) -> None:
+    """Poll the catalog file and swap in new versions as they appear."""
+    while True:
+        await asyncio.sleep(interval)
+        catalog = await asyncio.to_thread(load_changed_catalog, True)
+        if catalog is not None:
+            await asyncio.to_thread(catalog.build_indexes)
+            install_catalog(catalog)
+            print(f"Reloaded catalog from {catalog.source} ({len(catalog)} tones)", file=sys.stderr)
+            await notify_resource_updates()
+
+# ---------------------------------------------------------------------------
+# Family tables
+#
+# `python server.py --build-tables PATH` precomputes the harmonic, phi
+# spiral, resonance cascade and Fibonacci families of every catalog tone
+# into one file: a fixed prefix, a JSON header (family column offsets and
+# tone names, i.e. the offset index) and then one fixed-stride row of
+# little-endian float64 per tone. With SOUND_HEALING_TABLES set the server
+# maps that file read-only, so tools given a frequency_name slice the row
+# instead of recomputing it, and all server processes on a host share the
+# same pages. Rows are built with the same generators the tools use, so
+# table and computed results are identical; a tone whose frequency no
+# longer matches its row (catalog edited since the build) is computed.
+# ---------------------------------------------------------------------------
+
+TABLES_PATH = os.environ.get("SOUND_HEALING_TABLES")
+TABLE_MAGIC = b"SHFT"
+TABLE_VERSION = 1
+DEFAULT_TABLE_WIDTH = 64
+_TABLE_PREFIX = struct.Struct("<4sB3xIQ")  # magic, version, pad, header bytes, data offset
+_TABLE_ALIGNMENT = 64
+
+# family -> (resumable generator(base, start), fixed width or None for the table width)
+TABLE_FAMILIES: dict[str, tuple[Callable[[float, int], Iterator[float]], Optional[int]]] = {
+    "harmonics": (iter_harmonic_series, None),
+    "phi_spiral": (iter_phi_based_frequencies, None),
+    "resonance_cascade": (iter_resonance_cascade, None),
+    "fibonacci": (iter_fibonacci_frequencies, None),
+}
+
+
+def build_family_tables(path: str, catalog: ToneCatalog, width: int = DEFAULT_TABLE_WIDTH) -> dict[str, Any]:
+    """Write the family tables of every tone in ``catalog`` to ``path`` (atomically)."""
+    families = []
+    column = 1  # column 0 holds the tone's base frequency
+    for family, (_, fixed_width) in TABLE_FAMILIES.items():
+        family_width = fixed_width or width
+        families.append({"name": family, "offset": column, "width": family_width})
+        column += family_width
+    header = json.dumps({
+        "families": families,
+        "stride": column,
+        "tones": catalog.names,
+        "source": catalog.source
+    }, separators=(",", ":")).encode("utf-8")
+    data_offset = -(-(_TABLE_PREFIX.size + len(header)) // _TABLE_ALIGNMENT) * _TABLE_ALIGNMENT
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(_TABLE_PREFIX.pack(TABLE_MAGIC, TABLE_VERSION, len(header), data_offset))
+        f.write(header)
+        f.write(b"\0" * (data_offset - _TABLE_PREFIX.size - len(header)))
+        for name in catalog.names:
+            base = catalog.frequencies[name]
+            row = array("d", [base])
+            for family, (generator, fixed_width) in TABLE_FAMILIES.items():
+                row.extend(islice(generator(base, 0), fixed_width or width))
+            if sys.byteorder != "little":
+                row.byteswap()
+            f.write(row.tobytes())
+    os.replace(temporary, path)
+    return {"path": path, "tones": len(catalog), "stride": column, "bytes": data_offset + len(catalog) * column * 8}
+
+
+class FamilyTables:
+    """Read-only mapping of a family table file."""
+
+    def __init__(self, path: str) -> None:
+        if sys.byteorder != "little":
+            raise ValueError("Family tables are little-endian; this host is not")
+        self.stamp = _file_stamp(path)
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_size, data_offset = _TABLE_PREFIX.unpack_from(self._mmap)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError(f"{path} is not a version {TABLE_VERSION} family table file")
+        header = json.loads(self._mmap[_TABLE_PREFIX.size:_TABLE_PREFIX.size + header_size])
+        self.stride = header["stride"]
+        self.families = {family["name"]: (family["offset"], family["width"]) for family in header["families"]}
+        self.rows = {name: row for row, name in enumerate(header["tones"])}
+        self._values = memoryview(self._mmap)[data_offset:data_offset + len(self.rows) * self.stride * 8].cast("d")
+
+    def lookup(self, name: str, base: float, family: str, stop: int) -> Optional[memoryview]:
+        """The first ``stop`` values of a family for tone ``name``, or None if the table can't serve them."""
+        row = self.rows.get(name)
+        if row is None or family not in self.families:
+            return None
+        offset, width = self.families[family]
+        start = row * self.stride
+        if stop > width or self._values[start] != base:
+            return None
+        return self._values[start + offset:start + offset + stop]
+
+
+_tables: Optional[FamilyTables] = None
+_tables_checked_at = 0.0
+_tables_failed_stamp: Any = ()  # stamp of the last file that could not be opened (None: missing)
+
+
+def family_tables() -> Optional[FamilyTables]:
+    """The mapped TABLES_PATH, reopened when the file is rebuilt; None without tables."""
+    global _tables, _tables_checked_at, _tables_failed_stamp
+    if not TABLES_PATH:
+        return None
+    now = time.monotonic()
+    if _tables is not None and now - _tables_checked_at < CATALOG_CHECK_INTERVAL_SECONDS:
+        return _tables
+    _tables_checked_at = now
+    try:
+        stamp: Optional[tuple[int, int]] = _file_stamp(TABLES_PATH)
+    except OSError:
+        stamp = None
+    if (_tables is not None and stamp == _tables.stamp) or stamp == _tables_failed_stamp:
+        return _tables
+    try:
+        # Views handed out from a previous mapping stay valid until released
+        _tables = FamilyTables(TABLES_PATH)
+    except (OSError, ValueError, KeyError) as exc:
+        _tables_failed_stamp = stamp
+        print(f"Family tables unavailable ({TABLES_PATH}): {exc}", file=sys.stderr)
+    return _tables
+
+
+def family_source(
+    frequency_name: Optional[str],
+    base: float,
+    family: str,
+    stop: int,
+) -> Callable[[int], Iterator[float]]:
+    """``items_from`` for paginate(): slices of the table row when it covers ``stop`` values, else the generator."""
+    tables = family_tables() if frequency_name else None
+    values = tables.lookup(frequency_name, base, family, stop) if tables is not None else None
+    if values is None:
+        generator = TABLE_FAMILIES[family][0]
+        return lambda start: generator(base, start)
+    return lambda start: iter(values[start:stop].tolist())
+
+
+# ---------------------------------------------------------------------------
+# Audio synthesis
+#
+# Audio is rendered in fixed-size blocks so memory is bounded by the block
+# size however long the render is. Each partial's phase is carried between
+# blocks as a unit complex number, so a block is one complex matrix-vector
+# product against a precomputed rotation table: no sin() per sample and no
+# discontinuity at block boundaries.
+# ---------------------------------------------------------------------------
+
+DEFAULT_SAMPLE_RATE = 44100
+DEFAULT_BLOCK_SIZE = 8192
+# Each partial holds a block-sized complex128 rotation table (128 KiB at the default block size)
+MAX_SYNTH_PARTIALS = 512
+PCM_SAMPLE_WIDTH = 2  # 16-bit signed little-endian
+# The RIFF chunk size (36 + data size) is a 32-bit field, capping a WAV's PCM data
+MAX_WAV_DATA_BYTES = 0xFFFFFFFF - 36
+
+
+class SineBank:
+    """A bank of sine partials rendered block by block with continuous phase."""
+
+    def __init__(
+        self,
+        frequencies: Sequence[float],
+        amplitudes: Sequence[float],
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        start_frame: int = 0,
+    ) -> None:
+        self.block_size = block_size
+        frequencies = np.asarray(frequencies, dtype=np.float64)
+        self._omega = 2 * np.pi * frequencies / sample_rate
+        self._amplitudes = np.asarray(amplitudes, dtype=np.float64)
+        # rotation[k, n] = exp(i * omega_k * n) over one block
+        self._rotation = np.exp(1j * np.outer(self._omega, np.arange(block_size)))
+        self._block_step = np.exp(1j * self._omega * block_size)
+        # Phase at start_frame from the whole-cycle remainder, so a bank started
+        # mid-render lines up with one that has been running since frame 0
+        self._phase = np.exp(2j * np.pi * (np.mod(frequencies * start_frame, sample_rate) / sample_rate))
+
+    def render(self, frames: int) -> np.ndarray:
+        """Render the next ``frames`` samples (at most one block) as float64."""
+        block = ((self._amplitudes * self._phase) @ self._rotation[:, :frames]).imag
+        if frames == self.block_size:
+            self._phase *= self._block_step
+        else:
+            self._phase *= np.exp(1j * self._omega * frames)
+        # Renormalize so rounding error never accumulates into the amplitude
+        self._phase /= np.abs(self._phase)
+        return block
+
+
+def fade_ramp(fade_frames: int) -> np.ndarray:
+    """Precompute a linear 0 -> 1 fade-in lookup table of ``fade_frames`` samples."""
+    return np.arange(1, fade_frames + 1, dtype=np.float64) / max(fade_frames, 1)
+
+
+def apply_fades(
+    block: np.ndarray,
+    start: int,
+    total_frames: int,
+    ramp: np.ndarray,
+    fade_out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Apply fade-in/fade-out from a precomputed ramp to a block starting at frame ``start``.
+
+    ``fade_out`` gives the fade-out its own ramp (default: ``ramp``). Blocks
+    away from the edges are returned untouched; edge blocks are multiplied
+    by slices of the ramp tables, so nothing is evaluated per sample.
+    """
+    if fade_out is None:
+        fade_out = ramp
+    fade_in_frames, fade_out_frames = len(ramp), len(fade_out)
+    end = start + len(block)
+    if start >= fade_in_frames and end <= total_frames - fade_out_frames:
+        return block
+    gain = np.ones(len(block))
+    if start < fade_in_frames:
+        stop = min(end, fade_in_frames)
+        gain[:stop - start] *= ramp[start:stop]
+    fade_out_start = max(start, total_frames - fade_out_frames)
+    if fade_out_start < end:
+        # frame j of the fade-out uses fade_out[total_frames - 1 - j]
+        gain[fade_out_start - start:] *= fade_out[total_frames - end:total_frames - fade_out_start][::-1]
+    if block.ndim == 2:
+        gain = gain[:, None]
+    return block * gain
+
+
+def render_additive_blocks(
+    frequencies: Sequence[float],
+    amplitudes: Sequence[float],
+    total_frames: int,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    fade_frames: int = 0,
+) -> Iterator[np.ndarray]:
+    """Yield mono float64 blocks of an additive sine render."""
+    bank = SineBank(frequencies, amplitudes, sample_rate, block_size)
+    ramp = fade_ramp(fade_frames)
+    for start in range(0, total_frames, block_size):
+        frames = min(block_size, total_frames - start)
+        yield apply_fades(bank.render(frames), start, total_frames, ramp)
+
+
+# Brainwave bands and Schumann resonances usable as beat frequencies
+BEAT_FREQUENCY_NAMES = ["delta", "theta", "alpha", "beta", "gamma", "earth_7_83", "earth_8"]
+PULSE_TABLE_SIZE = 4096
+
+
+def isochronic_pulse_table(duty_cycle: float = 0.5, size: int = PULSE_TABLE_SIZE) -> np.ndarray:
+    """Precompute one period of an isochronic pulse as a lookup table.
+
+    The pulse is on for ``duty_cycle`` of the period with raised-cosine
+    edges (a quarter of the on-time each) to avoid clicks.
+    """
+    position = np.arange(size) / size
+    on = np.clip(position / duty_cycle, 0.0, 1.0)
+    edge = 0.25
+    rise = np.clip(on / edge, 0.0, 1.0)
+    fall = np.clip((1.0 - on) / edge, 0.0, 1.0)
+    table = 0.5 - 0.5 * np.cos(np.pi * np.minimum(rise, fall))
+    table[position >= duty_cycle] = 0.0
+    return table
+
+
+def render_beat_blocks(
+    carrier: float,
+    beat: float,
+    mode: str,
+    total_frames: int,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    fade_frames: int = 0,
+    volume: float = 0.8,
+    duty_cycle: float = 0.5,
+) -> Iterator[np.ndarray]:
+    """Yield stereo (frames x 2) float64 blocks of a binaural or isochronic beat.
+
+    Binaural: the left ear hears the carrier and the right ear the carrier
+    plus the beat. Isochronic: the carrier is gated on both channels by a
+    pulse train at the beat rate, read from a precomputed lookup table.
+    Phase is carried across blocks, so memory use is constant in duration.
+    """
+    ramp = fade_ramp(fade_frames)
+    if mode == "binaural":
+        left = SineBank([carrier], [volume], sample_rate, block_size)
+        right = SineBank([carrier + beat], [volume], sample_rate, block_size)
+        for start in range(0, total_frames, block_size):
+            frames = min(block_size, total_frames - start)
+            block = np.column_stack((left.render(frames), right.render(frames)))
+            yield apply_fades(block, start, total_frames, ramp)
+        return
+
+    tone = SineBank([carrier], [volume], sample_rate, block_size)
+    pulse = isochronic_pulse_table(duty_cycle)
+    cycles_per_frame = beat / sample_rate
+    offsets = np.arange(block_size)
+    for start in range(0, total_frames, block_size):
+        frames = min(block_size, total_frames - start)
+        # Pulse phase from the absolute frame index: sample-accurate, no drift
+        phase = ((start + offsets[:frames]) * cycles_per_frame) % 1.0
+        mono = tone.render(frames) * pulse[(phase * PULSE_TABLE_SIZE).astype(np.intp)]
+        yield apply_fades(np.column_stack((mono, mono)), start, total_frames, ramp)
+
+
+def pcm16_bytes(block: np.ndarray) -> bytes:
+    """Convert a float block in [-1, 1] (frames or frames x channels) to 16-bit PCM."""
+    return (np.clip(block, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def check_wav_size(total_frames: int, sample_rate: int, channels: int) -> None:
+    """Raise ToolError if a render of ``total_frames`` does not fit in a WAV file."""
+    if total_frames * channels * PCM_SAMPLE_WIDTH > MAX_WAV_DATA_BYTES:
+        max_seconds = MAX_WAV_DATA_BYTES // (channels * PCM_SAMPLE_WIDTH) / sample_rate
+        raise ToolError(
+            f"A {channels}-channel WAV at {sample_rate} Hz is limited to {max_seconds:.0f} seconds; "
+            "shorten the render, lower the sample rate or use format 'pcm'",
+            max_duration_seconds=max_seconds,
         )
 
 
+def wav_header(total_frames: int, sample_rate: int, channels: int) -> bytes:
+    """Build a 44-byte PCM WAV header for a render of known length."""
+    check_wav_size(total_frames, sample_rate, channels)
+    data_size = total_frames * channels * PCM_SAMPLE_WIDTH
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate,
+        sample_rate * channels * PCM_SAMPLE_WIDTH, channels * PCM_SAMPLE_WIDTH, PCM_SAMPLE_WIDTH * 8,
+        b"data", data_size,
+    )
+
+
+def encode_audio_stream(
+    blocks: Iterable[np.ndarray],
+    total_frames: int,
+    sample_rate: int,
+    channels: int,
+    container: str = "wav",
+) -> Iterator[bytes]:
+    """The encoded byte stream (optional WAV header, then PCM blocks).
+
+    The header is built before this returns, so a render too long for WAV
+    fails before any output file is opened.
+    """
+    header = [wav_header(total_frames, sample_rate, channels)] if container == "wav" else []
+    return chain(header, (pcm16_bytes(block) for block in blocks))
+
+
+def write_audio_output(
+    chunks: Iterable[bytes],
+    output_path: Optional[str],
+    stream_chunk_bytes: int = 65536,
+) -> dict[str, Any]:
+    """Write an encoded stream to ``output_path`` or collect it as base64 chunks."""
+    started = time.perf_counter()
+    if output_path:
+        bytes_written = 0
+        with open(output_path, "wb") as handle:
+            try:
+                for chunk in chunks:
+                    check_cancelled()
+                    handle.write(chunk)
+                    bytes_written += len(chunk)
+            except BaseException:
+                # Don't leave a truncated file behind a failed or cancelled render
+                handle.close()
+                with contextlib.suppress(OSError):
+                    os.remove(output_path)
+                raise
+        return {
+            "output_path": os.path.abspath(output_path),
+            "bytes": bytes_written,
+            "render_seconds": time.perf_counter() - started
+        }
+
+    encoded = []
+    pending = bytearray()
+    total = 0
+    for chunk in chunks:
+        check_cancelled()
+        pending += chunk
+        total += len(chunk)
+        while len(pending) >= stream_chunk_bytes:
+            encoded.append(base64.b64encode(pending[:stream_chunk_bytes]).decode("ascii"))
+            del pending[:stream_chunk_bytes]
+    if pending:
+        encoded.append(base64.b64encode(pending).decode("ascii"))
+    return {
+        "encoding": "base64",
+        "chunks": encoded,
+        "bytes": total,
+        "render_seconds": time.perf_counter() - started
+    }
+
+
+# ---------------------------------------------------------------------------
+# Session sequencing
+#
+# A session is a timeline of tone sets played one after another, each
+# crossfaded into the next. Every segment's contribution (its own span plus
+# the crossfades into and out of it, already multiplied by the fade ramps)
+# is rendered to a 16-bit PCM file in a cache directory, named by a hash of
+# everything that determines its samples; a re-render reuses the files of
+# unchanged segments and only synthesizes the rest. The session file is
+# then assembled block by block from the segment files, summing the two
+# that overlap inside a crossfade, so memory stays constant at any length.
+#
+# Phase is taken from absolute session time (SineBank's start_frame): a
+# tone present on both sides of a boundary is the same sinusoid in both
+# segments, and the complementary crossfade ramps (gains summing to exactly
+# one) keep it at constant level with no phase jump. The price is that a
+# segment's file depends on where it starts, so changing a duration
+# re-renders the segments after it. The cache directory defaults to
+# SOUND_HEALING_SESSION_CACHE, then a directory under the system temp dir;
+# it can be cleared at any time.
+# ---------------------------------------------------------------------------
+
+SESSION_CACHE_DIR = os.environ.get("SOUND_HEALING_SESSION_CACHE")
+SESSION_CACHE_VERSION = 1
+DEFAULT_CROSSFADE_SECONDS = 5.0
+MAX_SESSION_SEGMENTS = 256
+MAX_SESSION_SECONDS = 14400
+
+
+def crossfade_ramp(frames: int) -> np.ndarray:
+    """A 0 -> 1 crossfade ramp sampled at frame centres: it and its reverse sum to exactly one."""
+    return (np.arange(frames, dtype=np.float64) + 0.5) / max(frames, 1)
+
+
+@dataclass(frozen=True)
+class SessionSegment:
+    """One segment's contribution to a session render.
+
+    ``start`` and ``frames`` locate the contribution in session frames,
+    including the crossfades into and out of the segment; ``fade_in`` and
+    ``fade_out`` are (kind, frames) with kind "fade" (session edges) or
+    "crossfade".
+    """
+    frequencies: tuple[float, ...]
+    amplitudes: tuple[float, ...]
+    sample_rate: int
+    start: int
+    frames: int
+    fade_in: tuple[str, int]
+    fade_out: tuple[str, int]
+
+    def digest(self) -> str:
+        """Content hash naming this contribution's file in the segment cache."""
+        encoded = json.dumps(
+            [SESSION_CACHE_VERSION, DEFAULT_BLOCK_SIZE, self.frequencies, self.amplitudes,
+             self.sample_rate, self.start, self.frames, self.fade_in, self.fade_out],
+            separators=(",", ":")
+        ).encode()
+        return hashlib.sha256(encoded).hexdigest()[:32]
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        """Yield the contribution as mono float64 blocks, fades applied."""
+        bank = SineBank(self.frequencies, self.amplitudes, self.sample_rate, start_frame=self.start)
+        fade_in = _edge_ramp(*self.fade_in)
+        fade_out = _edge_ramp(*self.fade_out)
+        for offset in range(0, self.frames, DEFAULT_BLOCK_SIZE):
+            frames = min(DEFAULT_BLOCK_SIZE, self.frames - offset)
+            yield apply_fades(bank.render(frames), offset, self.frames, fade_in, fade_out)
+
+
+def _edge_ramp(kind: str, frames: int) -> np.ndarray:
+    return fade_ramp(frames) if kind == "fade" else crossfade_ramp(frames)
+
+
+def session_cache_dir(path: Optional[str] = None) -> str:
+    """The segment cache directory, created if needed."""
+    if path is None:
+        path = SESSION_CACHE_DIR
+    if path is None:
+        import tempfile
+
+        path = os.path.join(tempfile.gettempdir(), "sound-healing-sessions")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def write_segment_file(segment: SessionSegment, path: str, advance: Callable[[int], None]) -> None:
+    """Render a segment's contribution to ``path`` (atomically) as 16-bit PCM."""
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporary, "wb") as f:
+            for block in segment.blocks():
+                check_cancelled()
+                f.write(pcm16_bytes(block))
+                advance(len(block))
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def mix_segment_files(
+    segments: Sequence[SessionSegment],
+    paths: Sequence[str],
+    total_frames: int,
+    advance: Callable[[int], None],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Iterator[bytes]:
+    """Yield the session's PCM stream assembled from its segment files.
+
+    Spans covered by one segment are copied through unchanged; inside a
+    crossfade the two overlapping contributions are summed.
+    """
+    # Segments are in session order, so a sweep keeps the (at most two) active ones
+    position = 0
+    upcoming = 0
+    active: list[int] = []
+    handles: dict[int, Any] = {}
+    try:
+        while position < total_frames:
+            while upcoming < len(segments) and segments[upcoming].start <= position:
+                handles[upcoming] = open(paths[upcoming], "rb")
+                active.append(upcoming)
+                upcoming += 1
+            # Stop at the next point where a segment starts or ends
+            stop = min(
+                position + block_size,
+                total_frames,
+                segments[upcoming].start if upcoming < len(segments) else total_frames,
+                *(segments[i].start + segments[i].frames for i in active)
+            )
+            frames = stop - position
+            if len(active) == 1:
+                yield handles[active[0]].read(frames * PCM_SAMPLE_WIDTH)
+            else:
+                mixed = np.zeros(frames, dtype=np.int32)
+                for i in active:
+                    mixed += np.frombuffer(handles[i].read(frames * PCM_SAMPLE_WIDTH), dtype="<i2")
+                yield np.clip(mixed, -32767, 32767).astype("<i2").tobytes()
+            for i in [i for i in active if segments[i].start + segments[i].frames == stop]:
+                handles.pop(i).close()
+                active.remove(i)
+            position = stop
+            advance(frames)
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+
+# ---------------------------------------------------------------------------
+# Audio analysis
+#
+# Recordings are read a block at a time, never whole: a Welch spectrum
+# averages the power of Hann-windowed, overlapping FFT segments, computed a
+# batch of segments at a time as strided views of one decoded block, so
+# memory is bounded by ANALYSIS_BLOCK_SAMPLES however long the file is. Long files can
+# be split into contiguous segment ranges summed by separate processes.
+# Peaks are refined to sub-bin accuracy by fitting a parabola through the
+# log power of the peak bin and its neighbours.
+# ---------------------------------------------------------------------------
+
+# sample format -> (bytes per sample, NumPy dtype; None for packed 24-bit)
+AUDIO_SAMPLE_FORMATS = {
+    "u8": (1, "u1"),
+    "s16le": (2, "<i2"),
+    "s24le": (3, None),
+    "s32le": (4, "<i4"),
+    "f32le": (4, "<f4"),
+    "f64le": (8, "<f8")
+}
+# (WAVE format tag, bits per sample) -> sample format
+_WAVE_SAMPLE_FORMATS = {
+    (1, 8): "u8", (1, 16): "s16le", (1, 24): "s24le", (1, 32): "s32le", (3, 32): "f32le", (3, 64): "f64le"
+}
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+ANALYSIS_BLOCK_SAMPLES = 1 << 20
+DEFAULT_FFT_SIZE = 32768
+
+
+class AudioFileError(ValueError):
+    """An audio file that cannot be analyzed."""
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """Where an audio file's samples are and how they are encoded."""
+
+    path: str
+    sample_rate: int
+    channels: int
+    sample_format: str
+    data_offset: int
+    frames: int
+
+    def read(self, start: int, count: int) -> np.ndarray:
+        """Up to ``count`` frames from frame ``start``, one row per frame."""
+        width, dtype = AUDIO_SAMPLE_FORMATS[self.sample_format]
+        count = max(0, min(count, self.frames - start))
+        samples = np.fromfile(
+            self.path,
+            dtype=dtype or "u1",
+            count=count * self.channels * (1 if dtype else width),
+            offset=self.data_offset + start * self.channels * width
+        )
+        return samples.reshape(count, self.channels, width) if dtype is None else samples.reshape(count, self.channels)
+
+
+def read_wav_format(path: str) -> AudioFormat:
+    """Locate the sample data of a RIFF/WAVE file without reading it."""
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as handle:
+        riff, _, wave = struct.unpack("<4sI4s", handle.read(12).ljust(12, b"\0"))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise AudioFileError(f"{path} is not a RIFF/WAVE file")
+        fmt = None
+        while True:
+            header = handle.read(8)
+            if len(header) < 8:
+                raise AudioFileError(f"{path} has no data chunk")
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                body = handle.read(size)
+                tag, channels, sample_rate, _, block_align, bits = struct.unpack("<HHIIHH", body[:16])
+                if tag == _WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    # The sub-format GUID starts with the real format tag
+                    tag = struct.unpack("<H", body[24:26])[0]
+                fmt = (tag, channels, sample_rate, block_align, bits)
+                handle.seek(size & 1, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                break
+            else:
+                handle.seek(size + (size & 1), os.SEEK_CUR)
+        data_offset = handle.tell()
+    if fmt is None:
+        raise AudioFileError(f"{path} has no fmt chunk before its data")
+    tag, channels, sample_rate, block_align, bits = fmt
+    sample_format = _WAVE_SAMPLE_FORMATS.get((tag, bits))
+    if sample_format is None or channels < 1 or block_align != channels * AUDIO_SAMPLE_FORMATS[sample_format][0]:
+        raise AudioFileError(f"Unsupported WAVE encoding (format {tag}, {bits}-bit, {channels} channels)")
+    # Streamed files may leave the data size at 0 or 0xFFFFFFFF; trust the file length instead
+    available = file_size - data_offset
+    data_size = size if 0 < size <= available else available
+    return AudioFormat(path, sample_rate, channels, sample_format, data_offset, data_size // block_align)
+
+
+def raw_pcm_format(path: str, sample_rate: int, channels: int, sample_format: str) -> AudioFormat:
+    width = AUDIO_SAMPLE_FORMATS[sample_format][0]
+    return AudioFormat(path, sample_rate, channels, sample_format, 0, os.path.getsize(path) // (width * channels))
+
+
+def decode_mono(samples: np.ndarray, sample_format: str) -> np.ndarray:
+    """Frames read by AudioFormat.read as float64 in [-1, 1), averaged over channels."""
+    if sample_format == "s24le":
+        packed = samples.astype(np.int32)
+        values = packed[..., 0] | (packed[..., 1] << 8) | (packed[..., 2] << 16)
+        values = ((values ^ 0x800000) - 0x800000) / float(1 << 23)
+    elif sample_format == "u8":
+        values = (samples.astype(np.float64) - 128.0) / 128.0
+    elif sample_format in ("s16le", "s32le"):
+        values = samples / float(1 << (8 * AUDIO_SAMPLE_FORMATS[sample_format][0] - 1))
+    else:
+        values = samples.astype(np.float64)
+    return values.mean(axis=1)
+
+
+def welch_segment_count(frames: int, fft_size: int, hop: int) -> int:
+    # A file shorter than one segment is analyzed as a single zero-padded segment
+    return 1 if frames <= fft_size else 1 + (frames - fft_size) // hop
+
+
+def welch_power_sum(audio: AudioFormat, fft_size: int, hop: int, first: int, stop: int) -> np.ndarray:
+    """Sum of the windowed power spectra of segments ``first`` to ``stop``."""
+    window = np.hanning(fft_size)
+    power = np.zeros(fft_size // 2 + 1)
+    batch = max(1, ANALYSIS_BLOCK_SAMPLES // fft_size)
+    for start in range(first, stop, batch):
+        check_cancelled()
+        end = min(stop, start + batch)
+        begin, length = start * hop, (end - start - 1) * hop + fft_size
+        block = decode_mono(audio.read(begin, length), audio.sample_format)
+        if len(block) < length:
+            block = np.concatenate([block, np.zeros(length - len(block))])
+        segments = np.lib.stride_tricks.sliding_window_view(block, fft_size)[::hop]
+        spectra = np.fft.rfft(segments * window, axis=1)
+        power += (spectra.real ** 2 + spectra.imag ** 2).sum(axis=0)
+    return power
+
+
+def _welch_power_sum_in_worker(
+    audio: AudioFormat,
+    fft_size: int,
+    hop: int,
+    first: int,
+    stop: int,
+    slot: Optional[int],
+) -> np.ndarray:
+    # Polls the parent call's cancel flag, so cancelling the tool call stops every segment
+    _worker_state.slot = slot
+    return welch_power_sum(audio, fft_size, hop, first, stop)
+
+
+def welch_spectrum(audio: AudioFormat, fft_size: int, overlap: float, workers: int = 1) -> tuple[np.ndarray, int]:
+    """Welch-averaged power spectrum of a file and the number of segments averaged."""
+    hop = max(1, int(round(fft_size * (1.0 - overlap))))
+    count = welch_segment_count(audio.frames, fft_size, hop)
+    workers = max(1, min(workers, count))
+    if workers == 1:
+        return welch_power_sum(audio, fft_size, hop, 0, count) / count, count
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    bounds = [count * i // workers for i in range(workers + 1)]
+    slot = getattr(_worker_state, "slot", None) if _cancel_flags is not None else None
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(_cancel_flags, _progress),
+    ) as pool:
+        parts = pool.map(
+            _welch_power_sum_in_worker,
+            *zip(*[(audio, fft_size, hop, first, stop, slot) for first, stop in zip(bounds, bounds[1:])])
+        )
+        return sum(parts) / count, count
+
+
+def spectral_peaks(
+    power: np.ndarray,
+    sample_rate: int,
+    fft_size: int,
+    min_frequency: float,
+    max_frequency: float,
+    threshold_db: float,
+    limit: int,
+) -> list[tuple[float, float]]:
+    """Strongest local maxima as (frequency, level in dB relative to the strongest), strongest first."""
+    levels = 10.0 * np.log10(np.maximum(power, np.finfo(np.float64).tiny))
+    bin_hz = sample_rate / fft_size
+    bins = np.arange(1, len(power) - 1)
+    center, left, right = levels[1:-1], levels[:-2], levels[2:]
+    candidates = bins[(center > left) & (center >= right)
+                      & (bins * bin_hz >= min_frequency) & (bins * bin_hz <= max_frequency)]
+    if not len(candidates):
+        return []
+    a, b, c = levels[candidates - 1], levels[candidates], levels[candidates + 1]
+    # Vertex of the parabola through the three log-power points, within half a bin of the peak
+    offsets = 0.5 * (a - c) / (a - 2.0 * b + c)
+    peak_levels = b - 0.25 * (a - c) * offsets
+    relative = peak_levels - peak_levels.max()
+    keep = relative >= -threshold_db
+    order = np.argsort(-relative[keep], kind="stable")[:limit]
+    frequencies = ((candidates[keep] + offsets[keep]) * bin_hz)[order]
+    return list(zip(frequencies.tolist(), relative[keep][order].tolist()))
+
+
+# ---------------------------------------------------------------------------
+# Sensory roughness
+#
+# Sethares' parameterization of the Plomp-Levelt dissonance curve, summed over
+# every pair of partials of a frequency set. Each tone contributes a harmonic
+# spectrum with geometrically decaying amplitudes. The curve peaks near a
+# quarter of a critical bandwidth and then decays exponentially, so partials
+# are sorted and, for each one, searchsorted finds the last partial still
+# within ROUGHNESS_CUTOFF scaled bandwidths; only those upper-triangle pairs
+# are evaluated, in vectorized chunks of at most ROUGHNESS_CHUNK_PAIRS.
+# ---------------------------------------------------------------------------
+
+SETHARES_DSTAR = 0.24
+SETHARES_S1 = 0.0207
+SETHARES_S2 = 18.96
+SETHARES_A1 = 3.51
+SETHARES_A2 = 5.75
+SETHARES_C = 5.0
+_SETHARES_PEAK_SEPARATION = math.log(SETHARES_A2 / SETHARES_A1) / (SETHARES_A2 - SETHARES_A1)
+SETHARES_PEAK = SETHARES_C * (
+    math.exp(-SETHARES_A1 * _SETHARES_PEAK_SEPARATION) - math.exp(-SETHARES_A2 * _SETHARES_PEAK_SEPARATION)
+)
+# Pairs further apart than this (in scaled bandwidths) contribute under this fraction of their peak
+ROUGHNESS_PRUNE_FRACTION = 1e-6
+ROUGHNESS_CUTOFF = math.log(SETHARES_C / (ROUGHNESS_PRUNE_FRACTION * SETHARES_PEAK)) / SETHARES_A1
+ROUGHNESS_CHUNK_PAIRS = 1 << 20
+DENSE_PAIR_LIMIT = 1 << 22
+MAX_ROUGHNESS_PARTIALS = 200_000
+# Subsets are ranked exhaustively up to this many candidates, then by beam search
+EXHAUSTIVE_SUBSET_LIMIT = 200_000
+SUBSET_BEAM_WIDTH = 64
+MAX_SUBSET_TONES = 512
+
+
+def tone_partials(
+    frequencies: Sequence[float],
+    amplitudes: Sequence[float],
+    partials: int,
+    decay: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Partial frequencies, amplitudes and owning tone indices, sorted by frequency."""
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    multiples = np.arange(1, partials + 1, dtype=np.float64)
+    freqs = (frequencies[:, None] * multiples).ravel()
+    amps = (np.asarray(amplitudes, dtype=np.float64)[:, None] * decay ** (multiples - 1)).ravel()
+    tones = np.repeat(np.arange(len(frequencies)), partials)
+    order = np.argsort(freqs, kind="stable")
+    return freqs[order], amps[order], tones[order]
+
+
+def sethares_roughness(low: np.ndarray, high: np.ndarray, amp_low: np.ndarray, amp_high: np.ndarray) -> np.ndarray:
+    """Roughness of partial pairs, elementwise; ``low`` <= ``high``."""
+    scaled = SETHARES_DSTAR / (SETHARES_S1 * low + SETHARES_S2) * (high - low)
+    curve = np.exp(-SETHARES_A1 * scaled) - np.exp(-SETHARES_A2 * scaled)
+    return SETHARES_C * np.minimum(amp_low, amp_high) * curve
+
+
+def _sum_by_key(keys: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    unique, inverse = np.unique(keys, return_inverse=True)
+    return unique, np.bincount(inverse, weights=values, minlength=len(unique))
+
+
+def pairwise_roughness(
+    freqs: np.ndarray,
+    amps: np.ndarray,
+    tones: np.ndarray,
+    tone_count: int,
+) -> dict[str, Any]:
+    """Roughness of sorted partials, split into within-tone and tone-pair totals.
+
+    Returns ``intrinsic`` (per tone), ``pair_keys`` (i * tone_count + j with
+    i < j) with their ``pair_values``, and the number of partial pairs
+    evaluated and pruned.
+    """
+    size = len(freqs)
+    reach = freqs + ROUGHNESS_CUTOFF * (SETHARES_S1 * freqs + SETHARES_S2) / SETHARES_DSTAR
+    # Partials i + 1 .. last[i] are close enough to i to matter
+    last = np.searchsorted(freqs, reach, side="right") - 1
+    counts = np.maximum(last - np.arange(size), 0)
+    evaluated = int(counts.sum())
+
+    intrinsic = np.zeros(tone_count)
+    # Tone-pair sums go in a dense tone_count**2 grid when it is small, else are reduced by key
+    dense = np.zeros(tone_count * tone_count) if tone_count * tone_count <= DENSE_PAIR_LIMIT else None
+    key_parts, value_parts = [], []
+    row_ends = np.cumsum(counts)
+    row = 0
+    while row < size:
+        check_cancelled()
+        # Whole rows up to about ROUGHNESS_CHUNK_PAIRS pairs per chunk
+        done = row_ends[row - 1] if row else 0
+        stop = max(int(np.searchsorted(row_ends, done + ROUGHNESS_CHUNK_PAIRS, side="right")), row + 1)
+        rows = np.arange(row, stop)
+        lengths = counts[row:stop]
+        first = np.repeat(rows, lengths)
+        # Ragged arange: 1..count for each row, offset from the row's own partial
+        steps = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths) + 1
+        second = first + steps
+        values = sethares_roughness(freqs[first], freqs[second], amps[first], amps[second])
+
+        tone_a, tone_b = tones[first], tones[second]
+        same = tone_a == tone_b
+        intrinsic += np.bincount(tone_a[same], weights=values[same], minlength=tone_count)
+        cross = ~same
+        keys = np.minimum(tone_a[cross], tone_b[cross]) * tone_count + np.maximum(tone_a[cross], tone_b[cross])
+        if dense is not None:
+            dense += np.bincount(keys, weights=values[cross], minlength=len(dense))
+        else:
+            unique, sums = _sum_by_key(keys, values[cross])
+            key_parts.append(unique)
+            value_parts.append(sums)
+        row = stop
+
+    if dense is not None:
+        pair_keys = np.flatnonzero(dense)
+        pair_values = dense[pair_keys]
+    elif key_parts:
+        pair_keys, pair_values = _sum_by_key(np.concatenate(key_parts), np.concatenate(value_parts))
+    else:
+        pair_keys, pair_values = np.zeros(0, dtype=np.int64), np.zeros(0)
+    return {
+        "intrinsic": intrinsic,
+        "pair_keys": pair_keys,
+        "pair_values": pair_values,
+        "evaluated": evaluated,
+        "pruned": size * (size - 1) // 2 - evaluated
+    }
+
+
+def rank_subsets(
+    intrinsic: np.ndarray,
+    pair_matrix: np.ndarray,
+    size: int,
+    top: int,
+) -> tuple[list[tuple[float, tuple[int, ...]]], str]:
+    """Most consonant ``size``-subsets of tones, least rough first, and the search used.
+
+    A subset's roughness is its tones' intrinsic roughness plus every pair
+    between them, so it is exact whichever search is used; only beam search
+    may miss the true optimum.
+    """
+    n = len(intrinsic)
+    if math.comb(n, size) <= EXHAUSTIVE_SUBSET_LIMIT:
+        count = math.comb(n, size)
+        subsets = np.fromiter(
+            (i for combo in combinations(range(n), size) for i in combo),
+            dtype=np.intp,
+            count=count * size
+        ).reshape(count, size)
+        scores = intrinsic[subsets].sum(axis=1)
+        for a, b in combinations(range(size), 2):
+            scores += pair_matrix[subsets[:, a], subsets[:, b]]
+        best = np.argsort(scores, kind="stable")[:top]
+        return [(float(scores[i]), tuple(subsets[i].tolist())) for i in best], "exhaustive"
+
+    # Grow subsets one tone at a time, keeping the SUBSET_BEAM_WIDTH least rough
+    beam = max(SUBSET_BEAM_WIDTH, top)
+    frontier = [(float(intrinsic[i]), (i,)) for i in np.argsort(intrinsic, kind="stable")[:beam].tolist()]
+    for _ in range(size - 1):
+        check_cancelled()
+        candidates: dict[tuple[int, ...], float] = {}
+        for score, members in frontier:
+            added = score + intrinsic + pair_matrix[list(members)].sum(axis=0)
+            added[list(members)] = np.inf
+            for tone in np.argsort(added, kind="stable")[:beam].tolist():
+                key = tuple(sorted(members + (tone,)))
+                candidates.setdefault(key, float(added[tone]))
+        frontier = [(score, members) for members, score in heapq.nsmallest(beam, candidates.items(), key=lambda c: c[1])]
+    return frontier[:top], "beam"
+
+
+# ---------------------------------------------------------------------------
+# Rational ratios
+#
+# The simplest fraction p/q within a tolerance of an interval is found by
+# Stern-Brocot descent, run as a continued fraction over both ends of the
+# tolerance window: terms are shared while the ends agree and the search
+# stops at the first integer the window contains. The descent is vectorized
+# across every ratio at once, one NumPy step per continued-fraction term.
+# All pairs of a set are visited in flat chunks of the upper triangle; ratios
+# repeated within a chunk (common in harmonic sets) are solved once through
+# np.unique. Prime limits use a smallest-prime-factor sieve grown on demand.
+# ---------------------------------------------------------------------------
+
+DEFAULT_RATIO_TOLERANCE_CENTS = 5.0
+DEFAULT_MAX_RATIO_TERM = 4096
+MAX_RATIO_TERM = 1 << 20
+MAX_RATIO_FREQUENCIES = 10_000
+RATIO_CHUNK_PAIRS = 1 << 20
+# Intervals are matched after rounding to this many cents, so near-identical ratios share one solve
+RATIO_KEY_RESOLUTION_CENTS = 1e-6
+_MAX_CONTINUED_FRACTION_TERMS = 96
+# Relative widening of each continued-fraction window, far below RATIO_KEY_RESOLUTION_CENTS
+RATIO_WINDOW_SLACK = 1e-12
+# Prime limits only factor ratio terms, so the cached sieve never needs more than this
+SIEVE_CACHE_LIMIT = MAX_RATIO_TERM + 1
+_smallest_prime_factors: Optional[np.ndarray] = None
+
+
+def simplest_ratios(
+    low: np.ndarray,
+    high: np.ndarray,
+    max_term: int = DEFAULT_MAX_RATIO_TERM,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Simplest fraction in each closed interval [low, high], 0 < low <= high.
+
+    Returns (numerators, denominators) in lowest terms; both are 0 where the
+    simplest fraction needs a term larger than ``max_term``.
+    """
+    size = len(low)
+    numerators = np.zeros(size, dtype=np.int64)
+    denominators = np.zeros(size, dtype=np.int64)
+    active = np.arange(size)
+    lo, hi = np.asarray(low, dtype=np.float64), np.asarray(high, dtype=np.float64)
+    # Convergent recurrences h(n) = a h(n-1) + h(n-2), k likewise, carried as exact floats
+    h1, h0 = np.ones(size), np.zeros(size)
+    k1, k0 = np.zeros(size), np.ones(size)
+    for _ in range(_MAX_CONTINUED_FRACTION_TERMS):
+        if not len(active):
+            break
+        whole = np.floor(lo)
+        # Reciprocals carry a few ulps of error, so an end within RATIO_WINDOW_SLACK of an
+        # integer counts as that integer; otherwise an exact 7/4 would recurse on noise
+        slack = RATIO_WINDOW_SLACK * np.maximum(hi, 1.0)
+        ceiling = np.ceil(lo - slack)
+        # The window contains an integer: the smallest one is the final term
+        done = ceiling <= hi + slack
+        numerator = ceiling[done] * h1[done] + h0[done]
+        denominator = ceiling[done] * k1[done] + k0[done]
+        fits = (numerator <= max_term) & (denominator <= max_term)
+        numerators[active[done][fits]] = numerator[fits]
+        denominators[active[done][fits]] = denominator[fits]
+
+        # Otherwise both ends share the term floor(lo); recurse on the reciprocal window
+        going = ~done
+        whole, lo, hi = whole[going], lo[going], hi[going]
+        h1, h0 = whole * h1[going] + h0[going], h1[going]
+        k1, k0 = whole * k1[going] + k0[going], k1[going]
+        active = active[going]
+        # Later convergents only grow, so a term already past max_term cannot fit
+        within = (h1 <= max_term) & (k1 <= max_term)
+        lo, hi = 1.0 / (hi[within] - whole[within]), 1.0 / (lo[within] - whole[within])
+        h1, h0, k1, k0, active = h1[within], h0[within], k1[within], k0[within], active[within]
+    return numerators, denominators
+
+
+def smallest_prime_factors(limit: int) -> np.ndarray:
+    """Sieve of smallest prime factors for 0..limit (0 and 1 map to themselves).
+
+    Tables up to SIEVE_CACHE_LIMIT entries are kept for reuse; larger ones
+    are built for the call and dropped.
+    """
+    global _smallest_prime_factors
+    table = _smallest_prime_factors
+    if table is not None and len(table) > limit:
+        return table
+    grown = min(2 * len(table), SIEVE_CACHE_LIMIT) if table is not None else 0
+    size = max(limit + 1, grown, 1024)
+    table = np.zeros(size, dtype=np.int32)
+    for p in range(2, math.isqrt(size - 1) + 1):
+        if table[p] == 0:
+            multiples = table[p * p::p]
+            multiples[multiples == 0] = p
+    unset = table == 0
+    table[unset] = np.flatnonzero(unset)
+    if size <= SIEVE_CACHE_LIMIT:
+        # Swapped in whole, so concurrent callers see either the old or the new table
+        _smallest_prime_factors = table
+    return table
+
+
+def prime_limits(values: np.ndarray) -> np.ndarray:
+    """Largest prime factor of each positive integer (1 for 1)."""
+    values = np.asarray(values, dtype=np.int64)
+    if not len(values):
+        return values.copy()
+    spf = smallest_prime_factors(int(values.max()))
+    remaining = values.copy()
+    largest = np.ones(len(values), dtype=np.int64)
+    while True:
+        composite = remaining > 1
+        if not composite.any():
+            return largest
+        factors = spf[remaining[composite]]
+        largest[composite] = np.maximum(largest[composite], factors)
+        remaining[composite] //= factors
+
+
+def odd_part(values: np.ndarray) -> np.ndarray:
+    """Each positive integer with its factors of two removed."""
+    values = np.asarray(values, dtype=np.int64)
+    return values // (values & -values)
+
+
+def upper_triangle_pairs(n: int, start: int, stop: int) -> tuple[np.ndarray, np.ndarray]:
+    """Index pairs (i, j), i < j, at flat positions start..stop of the row-major upper triangle."""
+    rows = np.arange(n, dtype=np.int64)
+    row_starts = rows * (2 * n - rows - 1) // 2
+    positions = np.arange(start, stop, dtype=np.int64)
+    first = np.searchsorted(row_starts, positions, side="right") - 1
+    return first, positions - row_starts[first] + first + 1
+
+
+def interval_ratios(
+    cents: np.ndarray,
+    tolerance_cents: float,
+    max_term: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Simplest ratios of intervals given in cents, solving each distinct interval once."""
+    keys, inverse = np.unique(np.rint(cents / RATIO_KEY_RESOLUTION_CENTS).astype(np.int64), return_inverse=True)
+    interval = keys * RATIO_KEY_RESOLUTION_CENTS
+    low = np.exp2((interval - tolerance_cents) / 1200.0)
+    high = np.exp2((interval + tolerance_cents) / 1200.0)
+    numerators, denominators = simplest_ratios(low, high, max_term)
+    return numerators[inverse], denominators[inverse]
+
+
+# ---------------------------------------------------------------------------
+# Tuning systems
+#
+# A scale is a set of degrees within a repeating period (the octave, or phi
+# for the phi system), as log2 offsets from the reference pitch. A table for
+# a range of octaves is the outer sum of period multiples and degrees, built
+# in one NumPy operation and kept, read-only, in a bounded LRU cache keyed by
+# (system, divisions, reference, octave range); its size is configurable
+# with SOUND_HEALING_SCALE_CACHE_SIZE. Snapping frequencies to the nearest
+# degree is a searchsorted over the table's sorted log2 offsets.
+# ---------------------------------------------------------------------------
+
+TUNING_SYSTEMS = ["edo", "pythagorean", "just", "phi"]
+# Five-limit chromatic just intonation
+JUST_INTONATION_RATIOS = [
+    (1, 1), (16, 15), (9, 8), (6, 5), (5, 4), (4, 3), (45, 32), (3, 2), (8, 5), (5, 3), (9, 5), (15, 8)
+]
+DEFAULT_EDO_DIVISIONS = 12
+MAX_SCALE_DIVISIONS = 1200
+MAX_SCALE_OCTAVES = 10
+SCALE_CACHE_SIZE = int(os.environ.get("SOUND_HEALING_SCALE_CACHE_SIZE", 64))
+
+
+@dataclass(frozen=True)
+class ScaleTable:
+    """Every degree of a scale within an octave range, sorted by pitch.
+
+    ``offsets`` are log2(frequency / reference); ``degrees`` give each
+    entry's degree within its period, whose own offsets (and ratios, for
+    the rational systems) are ``period_offsets`` and ``ratios``.
+    """
+
+    system: str
+    reference: float
+    offsets: np.ndarray
+    frequencies: np.ndarray
+    degrees: np.ndarray
+    period_offsets: np.ndarray
+    ratios: Optional[list[tuple[int, int]]]
+
+    def snap(self, frequencies: Sequence[float]) -> tuple[np.ndarray, np.ndarray]:
+        """Index of the nearest table entry for each frequency, and the deviation in cents."""
+        targets = np.log2(np.asarray(frequencies, dtype=np.float64) / self.reference)
+        if len(self.offsets) == 1:
+            nearest = np.zeros(len(targets), dtype=np.intp)
+        else:
+            upper = np.clip(np.searchsorted(self.offsets, targets), 1, len(self.offsets) - 1)
+            lower = upper - 1
+            nearest = np.where(targets - self.offsets[lower] <= self.offsets[upper] - targets, lower, upper)
+        return nearest, 1200.0 * (targets - self.offsets[nearest])
+
+
+def scale_degrees(system: str, divisions: int) -> tuple[np.ndarray, float, Optional[list[tuple[int, int]]]]:
+    """Log2 offsets of one period's degrees, the period in octaves, and the ratios if rational."""
+    if system == "edo":
+        return np.arange(divisions) / divisions, 1.0, None
+    if system == "phi":
+        period = math.log2((1 + math.sqrt(5)) / 2)
+        return np.arange(divisions) * (period / divisions), period, None
+    # The octave is the period, so 2/1 is degree 0 of the next one
+    ratios = PYTHAGOREAN_RATIOS[:-1] if system == "pythagorean" else JUST_INTONATION_RATIOS
+    multipliers = np.array([calculate_pythagorean_ratio(1.0, ratio) for ratio in ratios])
+    order = np.argsort(multipliers, kind="stable")
+    return np.log2(multipliers[order]), 1.0, [ratios[i] for i in order.tolist()]
+
+
+def build_scale_table(system: str, reference: float, low: int, high: int, divisions: int) -> ScaleTable:
+    """Scale degrees from ``low`` to ``high`` octaves around ``reference``, both ends included."""
+    degrees, period, ratios = scale_degrees(system, divisions)
+    periods = np.arange(math.floor(low / period), math.ceil(high / period) + 1)
+    offsets = np.add.outer(periods * period, degrees).ravel()
+    # Allow for rounding at the range ends, e.g. 12 steps of 1/12 summing to just under 1
+    within = (offsets >= low - 1e-12) & (offsets <= high + 1e-12)
+    offsets = offsets[within]
+    degree_numbers = np.broadcast_to(np.arange(len(degrees)), (len(periods), len(degrees))).ravel()[within]
+    frequencies = reference * np.exp2(offsets)
+    for table in (offsets, frequencies, degree_numbers, degrees):
+        table.setflags(write=False)
+    return ScaleTable(system, reference, offsets, frequencies, degree_numbers, degrees, ratios)
+
+
+class ScaleCache:
+    """Bounded LRU cache of scale tables, shared by the tuning tools."""
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max_entries
+        self._tables: OrderedDict[tuple[Any, ...], ScaleTable] = OrderedDict()
+        # Handlers may run on several executor threads at once
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, system: str, reference: float, low: int, high: int, divisions: int) -> ScaleTable:
+        if system in ("pythagorean", "just"):
+            divisions = 0
+        key = (system, divisions, float(reference), low, high)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return table
+            self.misses += 1
+        table = build_scale_table(system, float(reference), low, high, divisions)
+        with self._lock:
+            if self.max_entries > 0:
+                self._tables[key] = table
+                while len(self._tables) > self.max_entries:
+                    self._tables.popitem(last=False)
+                    self.evictions += 1
+        return table
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "max_entries": self.max_entries,
+            "entries": len(self._tables),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+SCALE_CACHE = ScaleCache(SCALE_CACHE_SIZE)
+
+
+# ---------------------------------------------------------------------------
+# Tool registry
+#
+# Each tool registers its handler, input schema and output serializer once at
+# import time. The Tool objects, the list_tools response and the argument
+# validators are all built from the registry, so dispatch is a single dict
+# lookup and nothing schema-related is rebuilt per request.
+# ---------------------------------------------------------------------------
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_integer(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+_JSON_TYPE_CHECKS: dict[str, Callable[[Any], bool]] = {
+    "number": _is_number,
+    "integer": _is_integer,
+    "string": lambda value: isinstance(value, str),
+    "boolean": lambda value: isinstance(value, bool),
+    "array": lambda value: isinstance(value, list),
+    "object": lambda value: isinstance(value, dict),
+}
+
+
+def _compile_schema(schema: dict[str, Any], label: str = "arguments") -> Callable[[Any], Optional[str]]:
+    """Compile a JSON schema into a validator returning an error message or None.
+
+    Only the subset of JSON Schema used by the tool definitions is supported:
+    type, enum, minimum/exclusiveMinimum/maximum, minItems/maxItems, items,
+    properties and required. Integer-valued floats accepted for "integer"
+    properties and items are converted to int in place, so handlers only
+    ever see ints there.
+    """
+    checks: list[Callable[[Any], Optional[str]]] = []
+
+    expected_type = schema.get("type")
+    if expected_type is not None:
+        is_type = _JSON_TYPE_CHECKS[expected_type]
+        checks.append(
+            lambda value: None if is_type(value) else f"{label} must be of type '{expected_type}'"
+        )
+
+    if "enum" in schema:
+        allowed = tuple(schema["enum"])
+        checks.append(
+            lambda value: None if value in allowed else f"{label} must be one of {list(allowed)}"
+        )
+
+    if "minimum" in schema:
+        minimum = schema["minimum"]
+        checks.append(lambda value: None if value >= minimum else f"{label} must be >= {minimum}")
+
+    if "exclusiveMinimum" in schema:
+        exclusive_minimum = schema["exclusiveMinimum"]
+        checks.append(
+            lambda value: None if value > exclusive_minimum else f"{label} must be > {exclusive_minimum}"
+        )
+
+    if "maximum" in schema:
+        maximum = schema["maximum"]
+        checks.append(lambda value: None if value <= maximum else f"{label} must be <= {maximum}")
+
+    if "minItems" in schema:
+        min_items = schema["minItems"]
+        checks.append(
+            lambda value: None if len(value) >= min_items else f"{label} must have at least {min_items} items"
+        )
+
+    if "maxItems" in schema:
+        max_items = schema["maxItems"]
+        checks.append(
+            lambda value: None if len(value) <= max_items else f"{label} must have at most {max_items} items"
+        )
+
+    if "items" in schema:
+        check_item = _compile_schema(schema["items"], f"{label}[]")
+        integer_items = schema["items"].get("type") == "integer"
+
+        def check_items(value: list[Any]) -> Optional[str]:
+            for index, item in enumerate(value):
+                error = check_item(item)
+                if error:
+                    return error
+                if integer_items and isinstance(item, float):
+                    value[index] = int(item)
+            return None
+
+        checks.append(check_items)
+
+    if "properties" in schema or "required" in schema:
+        property_checks = {
+            key: _compile_schema(subschema, f"'{key}'")
+            for key, subschema in schema.get("properties", {}).items()
+        }
+        required = tuple(schema.get("required", ()))
+        integer_keys = frozenset(
+            key for key, subschema in schema.get("properties", {}).items() if subschema.get("type") == "integer"
+        )
+
+        def check_properties(value: dict[str, Any]) -> Optional[str]:
+            for key in required:
+                if key not in value:
+                    return f"Missing required argument '{key}'"
+            for key, item in list(value.items()):
+                check = property_checks.get(key)
+                if check is not None:
+                    error = check(item)
+                    if error:
+                        return error
+                    if key in integer_keys and isinstance(item, float):
+                        value[key] = int(item)
+            return None
+
+        checks.append(check_properties)
+
+    def validate(value: Any) -> Optional[str]:
+        for check in checks:
+            error = check(value)
+            if error:
+                return error
+        return None
+
+    return validate
+
+
+# ---------------------------------------------------------------------------
+# Output encodings
+#
+# Tools that return frequency arrays declare which payload fields are arrays
+# and get the output_format/precision arguments added to their schema. All
+# of them share serialize_output, which can emit pretty JSON (the default),
+# compact JSON, JSON rounded to a number of decimals, or the array fields as
+# base64 packed little-endian float32/float64 with a small binary header.
+# ---------------------------------------------------------------------------
+
+OUTPUT_FORMATS = ["json", "compact", "rounded", "base64_f32", "base64_f64"]
+
+OUTPUT_FORMAT_PROPERTIES = {
+    "output_format": {
+        "type": "string",
+        "enum": OUTPUT_FORMATS,
+        "description": "json (pretty), compact (no whitespace), rounded (compact, rounded to 'precision' "
+                       "decimals), or base64_f32/base64_f64 (arrays packed as little-endian floats) "
+                       "(default: json)",
+        "default": "json"
+    },
+    "precision": {
+        "type": "integer",
+        "minimum": 0,
+        "maximum": 15,
+        "description": "Decimal places for the rounded output format (default: 6)",
+        "default": 6
+    }
+}
+
+# Packed array blob: magic, version, item size, ndim, pad, ndim x uint32 shape, data
+PACKED_ARRAY_MAGIC = b"SHFA"
+PACKED_ARRAY_VERSION = 1
+_PACKED_DTYPES = {"base64_f32": ("<f4", "float32"), "base64_f64": ("<f8", "float64")}
+
+
+def _is_numpy(value: Any) -> bool:
+    # Checked by module name first so plain payloads never trigger the NumPy import
+    return type(value).__module__ == "numpy"
+
+
+def _json_default(value: Any) -> Any:
+    if _is_numpy(value):
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, np.generic):
+            return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def pack_array(values: Any, dtype: str = "<f8") -> bytes:
+    """Pack a numeric array as header + little-endian float data."""
+    array = np.ascontiguousarray(values, dtype=dtype)
+    header = struct.pack(
+        f"<4sBBBx{array.ndim}I",
+        PACKED_ARRAY_MAGIC, PACKED_ARRAY_VERSION, array.itemsize, array.ndim, *array.shape,
+    )
+    return header + array.tobytes()
+
+
+def unpack_array(blob: bytes) -> np.ndarray:
+    """Decode bytes produced by pack_array (after base64 decoding)."""
+    magic, version, itemsize, ndim = struct.unpack_from("<4sBBBx", blob)
+    if magic != PACKED_ARRAY_MAGIC or version != PACKED_ARRAY_VERSION:
+        raise ValueError("Not a packed frequency array")
+    shape = struct.unpack_from(f"<{ndim}I", blob, 8)
+    dtype = {4: "<f4", 8: "<f8"}[itemsize]
+    return np.frombuffer(blob, dtype=dtype, offset=8 + 4 * ndim).reshape(shape)
+
+
+def _round_floats(value: Any, digits: int) -> Any:
+    if isinstance(value, float):
+        return round(value, digits)
+    if _is_numpy(value) and isinstance(value, np.ndarray):
+        return np.round(value, digits).tolist()
+    if isinstance(value, dict):
+        return {key: _round_floats(item, digits) for key, item in value.items()}
+    if isinstance(value, list):
+        if value and all(type(item) is float for item in value):
+            return np.round(np.asarray(value), digits).tolist()
+        return [_round_floats(item, digits) for item in value]
+    return value
+
+
+def serialize_output(payload: Any, arguments: dict[str, Any], array_fields: tuple[str, ...] = ()) -> str:
+    """Serialize a tool payload in the format requested by ``output_format``."""
+    output_format = arguments.get("output_format", "json")
+    if output_format == "json":
+        return json.dumps(payload, indent=2, default=_json_default)
+    if output_format == "compact":
+        return json.dumps(payload, separators=(",", ":"), default=_json_default)
+    if output_format == "rounded":
+        return json.dumps(
+            _round_floats(payload, arguments.get("precision", 6)),
+            separators=(",", ":"),
+            default=_json_default,
+        )
+
+    dtype, dtype_name = _PACKED_DTYPES[output_format]
+    packed = dict(payload)
+    for key in array_fields:
+        if key in packed:
+            blob = pack_array(packed[key], dtype)
+            packed[key] = {
+                "encoding": "base64",
+                "dtype": dtype_name,
+                "shape": list(np.shape(packed[key])),
+                "data": base64.b64encode(blob).decode("ascii")
+            }
+    return json.dumps(packed, separators=(",", ":"), default=_json_default)
+
+
+# ---------------------------------------------------------------------------
+# Limits and pagination
+#
+# Count-like arguments are capped by server-side limits (schema maxima plus
+# overflow checks done before any work starts), and long series are returned
+# one page at a time. A page is produced lazily with islice over a resumable
+# generator, so memory is bounded by the page size. Cursors are opaque,
+# stateless tokens holding the next offset and a digest of the arguments.
+# Limits are configurable with SOUND_HEALING_MAX_ITEMS and
+# SOUND_HEALING_PAGE_SIZE.
+# ---------------------------------------------------------------------------
+
+MAX_RESULT_ITEMS = int(os.environ.get("SOUND_HEALING_MAX_ITEMS", 1_000_000))
+PAGE_SIZE = int(os.environ.get("SOUND_HEALING_PAGE_SIZE", 10_000))
+_MAX_FLOAT_LOG = math.log(sys.float_info.max)
+
+PAGINATION_PROPERTIES = {
+    "cursor": {
+        "type": "string",
+        "description": "Opaque cursor from a previous page's next_cursor (send the same other arguments)"
+    },
+    "page_size": {
+        "type": "integer",
+        "minimum": 1,
+        "maximum": PAGE_SIZE,
+        "description": f"Maximum number of values per page (default and maximum: {PAGE_SIZE})"
+    }
+}
+
+# Arguments that may change between pages without invalidating a cursor
+_PAGE_INDEPENDENT_ARGUMENTS = frozenset(["cursor", "page_size", "output_format", "precision"])
+
+
+class ToolError(Exception):
+    """A tool failure reported to the client as a structured error payload."""
+
+    def __init__(self, message: str, **details: Any) -> None:
+        super().__init__(message)
+        self.payload = {"error": message, **details}
+
+
+def check_finite_growth(base: float, growth_log: float, what: str) -> None:
+    """Raise ToolError if ``base`` scaled by e**growth_log would overflow a float."""
+    if base and math.log(abs(base)) + growth_log > _MAX_FLOAT_LOG:
+        raise ToolError(
+            f"{what} would overflow to infinity; reduce the count or the base frequency",
+            max_float=sys.float_info.max,
+        )
+
+
+def _arguments_digest(arguments: dict[str, Any]) -> str:
+    significant = {k: v for k, v in arguments.items() if k not in _PAGE_INDEPENDENT_ARGUMENTS}
+    encoded = json.dumps(significant, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def encode_cursor(offset: int, arguments: dict[str, Any]) -> str:
+    token = json.dumps({"v": 1, "o": offset, "d": _arguments_digest(arguments)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(token.encode()).decode("ascii")
+
+
+def decode_cursor(cursor: str, arguments: dict[str, Any]) -> int:
+    """Return the offset stored in ``cursor``, checking it belongs to these arguments."""
+    try:
+        token = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        offset, digest = int(token["o"]), token["d"]
+    except (ValueError, KeyError, TypeError):
+        raise ToolError("Invalid cursor")
+    if offset < 0:
+        raise ToolError("Invalid cursor")
+    if digest != _arguments_digest(arguments):
+        raise ToolError("Cursor does not match the request arguments")
+    return offset
+
+
+def paginate(
+    arguments: dict[str, Any],
+    total: int,
+    items_from: Callable[[int], Iterator[float]],
+) -> tuple[list[float], dict[str, Any]]:
+    """Return one page of a ``total``-item series and its paging metadata.
+
+    ``items_from(start)`` must yield the series from index ``start``. Results
+    that fit in a single page with no cursor are returned whole with empty
+    metadata, so small responses are unchanged.
+    """
+    page_size = arguments.get("page_size", PAGE_SIZE)
+    cursor = arguments.get("cursor")
+    offset = decode_cursor(cursor, arguments) if cursor else 0
+    if offset > total:
+        raise ToolError("Invalid cursor")
+    if cursor is None and total <= page_size:
+        return list(islice(items_from(0), total)), {}
+    stop = min(total, offset + page_size)
+    items = list(islice(items_from(offset), max(stop - offset, 0)))
+    return items, {
+        "offset": offset,
+        "total_count": total,
+        "next_cursor": encode_cursor(stop, arguments) if stop < total else None
+    }
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """A registered tool: its MCP definition, handler, validator and serializer.
+
+    ``cost`` estimates the work of a call (roughly, values computed) for
+    offloading decisions, ``defaults`` holds the schema defaults used to
+    normalize cache keys, ``static_text`` the prebuilt response of
+    tools whose output never depends on their arguments, and
+    ``path_arguments`` the arguments naming files the tool reads or writes.
+    """
+
+    tool: Tool
+    handler: Callable[[dict[str, Any]], Any]
+    validate: Callable[[Any], Optional[str]]
+    serialize: Callable[[Any, dict[str, Any]], str]
+    cost: Optional[Callable[[dict[str, Any]], float]] = None
+    cacheable: bool = False
+    defaults: dict[str, Any] = field(default_factory=dict)
+    static_text: Optional[str] = None
+    path_arguments: tuple[str, ...] = ()
+
+
+TOOL_REGISTRY: dict[str, ToolSpec] = {}
+_tool_list_cache: Optional[list[Tool]] = None
+
+
+def register_tool(
+    name: str,
+    description: str,
+    input_schema: dict[str, Any],
+    serializer: Callable[..., str] = serialize_output,
+    array_fields: Sequence[str] = (),
+    pageable: bool = False,
+    cost: Optional[Callable[[dict[str, Any]], float]] = None,
+    cacheable: bool = False,
+    static: bool = False,
+    path_arguments: Sequence[str] = (),
+) -> Callable[[Callable[[dict[str, Any]], Any]], Callable[[dict[str, Any]], Any]]:
+    """Register a tool handler together with its schema and output serializer.
+
+    The handler receives the validated arguments dict and returns a
+    JSON-serializable payload (NumPy arrays allowed); the serializer turns
+    it into response text. Tools listing ``array_fields`` accept the shared
+    output_format/precision arguments, and ``pageable`` tools the
+    cursor/page_size arguments used by paginate(). Calls whose ``cost``
+    reaches OFFLOAD_THRESHOLD run in the worker pool. Responses of ``cacheable`` tools are
+    kept in RESPONSE_CACHE; ``static`` tools take no arguments and have their
+    response built once here. ``path_arguments`` are confined by
+    confine_tool_paths() when the server is shared over HTTP.
+    """
+    def decorator(handler: Callable[[dict[str, Any]], Any]) -> Callable[[dict[str, Any]], Any]:
+        global _tool_list_cache
+        if name in TOOL_REGISTRY:
+            raise ValueError(f"Tool '{name}' is already registered")
+        properties = dict(input_schema.get("properties", {}))
+        if array_fields:
+            properties.update(OUTPUT_FORMAT_PROPERTIES)
+        if pageable:
+            properties.update(PAGINATION_PROPERTIES)
+        schema = {**input_schema, "properties": properties}
+        serialize = partial(serializer, array_fields=tuple(array_fields))
+        TOOL_REGISTRY[name] = ToolSpec(
+            tool=Tool(name=name, description=description, inputSchema=schema),
+            handler=handler,
+            validate=_compile_schema(schema),
+            serialize=serialize,
+            cost=cost,
+            cacheable=cacheable,
+            defaults={
+                key: subschema["default"]
+                for key, subschema in schema.get("properties", {}).items()
+                if "default" in subschema
+            },
+            static_text=serialize(handler({}), {}) if static else None,
+            path_arguments=tuple(path_arguments),
+        )
+        TOOL_METRICS[name] = ToolMetrics()
+        _tool_list_cache = None
+        return handler
+
+    return decorator
+
+
+def _rebuild_static_responses() -> None:
+    """Rebuild the prebuilt responses of static tools (after a catalog reload)."""
+    for name, spec in list(TOOL_REGISTRY.items()):
+        if spec.static_text is not None:
+            TOOL_REGISTRY[name] = replace(spec, static_text=spec.serialize(spec.handler({}), {}))
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+#
+# Serialized response text of cacheable tools, keyed by tool name and the
+# arguments normalized with the schema defaults, so repeated requests skip
+# both the computation and json.dumps. Sizes and TTL are configurable with
+# the SOUND_HEALING_CACHE_SIZE and SOUND_HEALING_CACHE_TTL environment
+# variables (0 disables the cache / expiry respectively).
+# ---------------------------------------------------------------------------
+
+class ResponseCache:
+    """Bounded LRU cache of serialized tool responses with optional TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 0,
+        max_entry_bytes: int = 1 << 20,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: tuple[str, str]) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, text = entry
+        if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return text
+
+    def put(self, key: tuple[str, str], text: str) -> None:
+        if self.max_entries <= 0 or len(text) > self.max_entry_bytes:
+            return
+        self._entries[key] = (time.monotonic(), text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.max_entries > 0,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "max_entry_bytes": self.max_entry_bytes,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+RESPONSE_CACHE = ResponseCache(
+    max_entries=int(os.environ.get("SOUND_HEALING_CACHE_SIZE", 256)),
+    ttl_seconds=float(os.environ.get("SOUND_HEALING_CACHE_TTL", 0)),
+)
+
+
+def _cache_key(name: str, arguments: dict[str, Any], defaults: dict[str, Any]) -> tuple[str, str]:
+    normalized = {**defaults, **arguments} if defaults else arguments
+    return name, json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+#
+# Per-tool call counts, error counts, in-flight requests, and fixed-bucket
+# histograms of latency and serialized response size, recorded around
+# dispatch in call_tool. Every tool's counters are allocated once at
+# registration, so recording a call is a bisect and a few integer updates.
+# Snapshots are served by the server_stats tool and, when
+# SOUND_HEALING_STATS_FILE is set, appended to that file as JSON lines
+# every SOUND_HEALING_STATS_INTERVAL seconds (default: 60).
+# ---------------------------------------------------------------------------
+
+LATENCY_BUCKETS_SECONDS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+RESPONSE_SIZE_BUCKETS_BYTES = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216
+)
+STATS_FILE = os.environ.get("SOUND_HEALING_STATS_FILE")
+STATS_INTERVAL_SECONDS = float(os.environ.get("SOUND_HEALING_STATS_INTERVAL", 60))
+
+
+def _histogram_quantile(counts: list[int], bounds: Sequence[float], total: int, q: float, observed_max: float) -> float:
+    """Upper bound of the bucket holding quantile q (the observed max for the overflow bucket)."""
+    target = q * total
+    cumulative = 0
+    for bound, count in zip(bounds, counts):
+        cumulative += count
+        if cumulative >= target:
+            return min(bound, observed_max)
+    return observed_max
+
+
+class ToolMetrics:
+    """Counters and histograms for one tool."""
+
+    __slots__ = (
+        "calls", "errors", "cache_hits", "in_flight", "latency_counts", "latency_total",
+        "latency_max", "size_counts", "size_total", "size_max"
+    )
+
+    def __init__(self) -> None:
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS_SECONDS) + 1)
+        self.size_counts = [0] * (len(RESPONSE_SIZE_BUCKETS_BYTES) + 1)
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = self.errors = self.cache_hits = 0
+        self.in_flight = 0
+        self.latency_total = self.latency_max = 0.0
+        self.size_total = self.size_max = 0
+        for counts in (self.latency_counts, self.size_counts):
+            counts[:] = [0] * len(counts)
+
+    def record(self, elapsed: float, size: int, succeeded: bool, cache_hit: bool) -> None:
+        self.calls += 1
+        if not succeeded:
+            self.errors += 1
+        if cache_hit:
+            self.cache_hits += 1
+        self.latency_counts[bisect_left(LATENCY_BUCKETS_SECONDS, elapsed)] += 1
+        self.latency_total += elapsed
+        if elapsed > self.latency_max:
+            self.latency_max = elapsed
+        self.size_counts[bisect_left(RESPONSE_SIZE_BUCKETS_BYTES, size)] += 1
+        self.size_total += size
+        if size > self.size_max:
+            self.size_max = size
+
+    def snapshot(self) -> dict[str, Any]:
+        calls = self.calls
+        latency = {
+            f"p{round(q * 100)}_ms": _histogram_quantile(
+                self.latency_counts, LATENCY_BUCKETS_SECONDS, calls, q, self.latency_max
+            ) * 1000
+            for q in (0.5, 0.9, 0.99)
+        } if calls else {}
+        return {
+            "calls": calls,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "in_flight": self.in_flight,
+            "latency": {
+                "mean_ms": self.latency_total / calls * 1000 if calls else 0.0,
+                "max_ms": self.latency_max * 1000,
+                **latency,
+                "buckets_seconds": list(LATENCY_BUCKETS_SECONDS),
+                "counts": list(self.latency_counts)
+            },
+            "response_bytes": {
+                "mean": self.size_total / calls if calls else 0.0,
+                "max": self.size_max,
+                "total": self.size_total,
+                "buckets": list(RESPONSE_SIZE_BUCKETS_BYTES),
+                "counts": list(self.size_counts)
+            }
+        }
+
+
+TOOL_METRICS: dict[str, ToolMetrics] = {}
+_metrics_started_at = time.time()
+_unknown_tool_calls = 0
+
+
+def metrics_snapshot(include_idle: bool = False) -> dict[str, Any]:
+    """Server-wide view of TOOL_METRICS; idle tools are omitted unless requested."""
+    tools = {
+        name: metrics.snapshot()
+        for name, metrics in TOOL_METRICS.items()
+        if include_idle or metrics.calls or metrics.in_flight
+    }
+    return {
+        "timestamp": time.time(),
+        "uptime_seconds": time.time() - _metrics_started_at,
+        "total_calls": sum(metrics.calls for metrics in TOOL_METRICS.values()),
+        "total_errors": sum(metrics.errors for metrics in TOOL_METRICS.values()),
+        "in_flight": sum(metrics.in_flight for metrics in TOOL_METRICS.values()),
+        "unknown_tool_calls": _unknown_tool_calls,
+        "tools": tools
+    }
+
+
+def reset_metrics() -> None:
+    global _metrics_started_at, _unknown_tool_calls
+    for metrics in TOOL_METRICS.values():
+        in_flight = metrics.in_flight
+        metrics.reset()
+        metrics.in_flight = in_flight
+    _metrics_started_at = time.time()
+    _unknown_tool_calls = 0
+
+
+async def dump_metrics_periodically(path: str, interval: float) -> None:
+    """Append a metrics snapshot to ``path`` as a JSON line every ``interval`` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        write_metrics_line(path)
+
+
+def write_metrics_line(path: str) -> None:
+    try:
+        with open(path, "a") as f:
+            f.write(json.dumps(metrics_snapshot(), separators=(",", ":")) + "\n")
+    except OSError as exc:
+        print(f"Could not write stats to {path}: {exc}", file=sys.stderr)
+
+
+# ---------------------------------------------------------------------------
+# Executor
+#
+# Tool calls whose estimated cost reaches OFFLOAD_THRESHOLD run (handler and
+# serialization) in a process or thread pool so the stdio loop stays free
+# for cheap requests; everything else runs inline. Each offloaded call gets
+# a slot in a shared flag array that long-running handlers poll through
+# check_cancelled(), which is how MCP cancellation and per-request timeouts
+# reach work already running in a worker. Handlers that know how far along
+# they are call report_progress(), which writes to a second per-slot array;
+# while an offloaded call runs, the event loop polls its slot and relays
+# changes as MCP progress notifications to clients that sent a progress
+# token. Configured with
+# SOUND_HEALING_EXECUTOR (process or thread), SOUND_HEALING_WORKERS,
+# SOUND_HEALING_OFFLOAD_THRESHOLD and SOUND_HEALING_TOOL_TIMEOUT (seconds,
+# 0 for no timeout).
+# ---------------------------------------------------------------------------
+
+EXECUTOR_KIND = os.environ.get("SOUND_HEALING_EXECUTOR", "process")
+EXECUTOR_WORKERS = int(os.environ.get("SOUND_HEALING_WORKERS", min(4, os.cpu_count() or 1)))
+OFFLOAD_THRESHOLD = float(os.environ.get("SOUND_HEALING_OFFLOAD_THRESHOLD", 100_000))
+TOOL_TIMEOUT_SECONDS = float(os.environ.get("SOUND_HEALING_TOOL_TIMEOUT", 300))
+MAX_OFFLOADED_CALLS = 256
+PROGRESS_INTERVAL_SECONDS = 0.5
+
+_executor: Optional[Executor] = None
+_cancel_flags: Any = None  # multiprocessing.Array of per-slot cancel flags
+_progress: Any = None  # multiprocessing.Array of per-slot (progress, total) pairs
+_free_slots: "queue.SimpleQueue[int]" = queue.SimpleQueue()
+_worker_state = threading.local()
+
+
+def _init_worker(cancel_flags: Any, progress: Any) -> None:
+    global _cancel_flags, _progress, _reload_inline
+    _cancel_flags = cancel_flags
+    _progress = progress
+    _reload_inline = True
+
+
+def _get_executor() -> Executor:
+    global _executor, _cancel_flags, _progress
+    if _executor is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        context = multiprocessing.get_context("spawn")
+        if _cancel_flags is None:
+            _cancel_flags = context.Array("b", MAX_OFFLOADED_CALLS, lock=False)
+            _progress = context.Array("d", 2 * MAX_OFFLOADED_CALLS, lock=False)
+            for slot in range(MAX_OFFLOADED_CALLS):
+                _free_slots.put(slot)
+        if EXECUTOR_KIND == "thread":
+            # Finish the lazy NumPy import here: LazyLoader is not thread-safe before Python 3.12
+            np.ndarray
+            _executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix="tool-worker")
+        else:
+            _executor = ProcessPoolExecutor(
+                max_workers=EXECUTOR_WORKERS,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(_cancel_flags, _progress),
+            )
+    return _executor
+
+
+def shutdown_executor(wait: bool = False) -> None:
+    """Stop the worker pool, cancelling queued calls.
+
+    With ``wait`` every running call is flagged as cancelled and the
+    workers are joined, so the pool's resources are released before exit.
+    """
+    global _executor
+    if _executor is not None:
+        if wait:
+            _cancel_flags[:] = [1] * MAX_OFFLOADED_CALLS
+        _executor.shutdown(wait=wait, cancel_futures=True)
+        _executor = None
+
+
+def check_cancelled() -> None:
+    """Raise ToolError if the offloaded call running on this worker was cancelled."""
+    slot = getattr(_worker_state, "slot", None)
+    if slot is not None and _cancel_flags[slot]:
+        raise ToolError("Tool call was cancelled")
+
+
+def report_progress(progress: float, total: float) -> None:
+    """Publish how far the offloaded call running on this worker has got."""
+    slot = getattr(_worker_state, "slot", None)
+    if slot is not None and _progress is not None:
+        _progress[2 * slot + 1] = total
+        _progress[2 * slot] = progress
+
+
+def _execute_tool(name: str, arguments: dict[str, Any], slot: Optional[int] = None) -> tuple[str, bool]:
+    """Run a tool's handler and serializer; returns (text, succeeded).
+
+    Handlers report failures either by raising ToolError or by returning a
+    dict with an "error" key; both count as unsuccessful.
+    """
+    spec = TOOL_REGISTRY[name]
+    _worker_state.slot = slot
+    try:
+        payload = spec.handler(arguments)
+        return spec.serialize(payload, arguments), not (isinstance(payload, dict) and "error" in payload)
+    except ToolError as exc:
+        return json.dumps(exc.payload, indent=2), False
+    finally:
+        _worker_state.slot = None
+
+
+async def _await_reporting_progress(
+    wrapped: asyncio.Future,
+    slot: int,
+    on_progress: Optional[Callable[[float, float], Awaitable[None]]],
+) -> tuple[str, bool]:
+    """Await an offloaded call, relaying its progress slot while it runs."""
+    if on_progress is None:
+        return await wrapped
+    reported = (0.0, 0.0)
+    try:
+        while True:
+            done, _ = await asyncio.wait((wrapped,), timeout=PROGRESS_INTERVAL_SECONDS)
+            if done:
+                return wrapped.result()
+            current = (_progress[2 * slot], _progress[2 * slot + 1])
+            if current != reported and current[1] > 0:
+                reported = current
+                try:
+                    await on_progress(*current)
+                except Exception:
+                    # A client that went away gets no more notifications; the call itself carries on
+                    return await wrapped
+    except asyncio.CancelledError:
+        wrapped.cancel()
+        raise
+
+
+async def _execute_offloaded(
+    name: str,
+    arguments: dict[str, Any],
+    on_progress: Optional[Callable[[float, float], Awaitable[None]]] = None,
+) -> tuple[str, bool]:
+    """Run _execute_tool in the worker pool, honoring cancellation and the timeout."""
+    executor = _get_executor()
+    try:
+        slot = _free_slots.get_nowait()
+    except queue.Empty:
+        return json.dumps({"error": "Too many long-running tool calls in flight; retry later"}, indent=2), False
+    _cancel_flags[slot] = 0
+    _progress[2 * slot] = _progress[2 * slot + 1] = 0.0
+    try:
+        future = executor.submit(_execute_tool, name, arguments, slot)
+    except BrokenExecutor:
+        shutdown_executor()
+        _free_slots.put(slot)
+        raise
+    # Free the slot only once the worker is done with it
+    future.add_done_callback(lambda _: _free_slots.put(slot))
+    try:
+        return await asyncio.wait_for(
+            _await_reporting_progress(asyncio.wrap_future(future), slot, on_progress),
+            TOOL_TIMEOUT_SECONDS or None
+        )
+    except asyncio.TimeoutError:
+        _cancel_flags[slot] = 1
+        return json.dumps({
+            "error": f"Tool '{name}' timed out after {TOOL_TIMEOUT_SECONDS:g} seconds"
+        }, indent=2), False
+    except asyncio.CancelledError:
+        _cancel_flags[slot] = 1
+        raise
+    except BrokenExecutor:
+        shutdown_executor()
+        raise
+
+
+def _text_response(text: str) -> list[TextContent]:
+    return [TextContent(type="text", text=text)]
+
+
+# ---------------------------------------------------------------------------
+# Tool handlers
+# ---------------------------------------------------------------------------
+
+BASE_FREQUENCY_SCHEMA = {
+    "type": "number",
+    "description": "Base frequency in Hz"
+}
+
+DEDUPE_TOLERANCE_SCHEMA = {
+    "type": "number",
+    "minimum": 0,
+    "maximum": 1200,
+    "description": "Frequencies within this many cents of a smaller one are dropped as duplicates "
+                   f"(default: {DEFAULT_DEDUPE_TOLERANCE_CENTS:g}; 0 drops exact duplicates only)",
+    "default": DEFAULT_DEDUPE_TOLERANCE_CENTS
+}
+
+ANNOTATE_SCHEMA = {
+    "type": "boolean",
+    "description": "Annotate each frequency with its nearest well-tone (default: false)",
+    "default": False
+}
+
+OCTAVE_EQUIVALENT_SCHEMA = {
+    "type": "boolean",
+    "description": "Match well-tones at any octave (default: false)",
+    "default": False
+}
+
+FREQUENCY_NAME_SCHEMA = {
+    "type": "string",
+    "description": "Catalog tone to use as the base frequency instead of base_frequency (served from the family tables when available)"
+}
+
+DEFAULT_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+
+
+def _resolve_base_frequency(arguments: dict[str, Any]) -> tuple[float, dict[str, Any]]:
+    """Base frequency from ``frequency_name`` or ``base_frequency``, plus the fields echoing it."""
+    name = arguments.get("frequency_name")
+    if name is None:
+        if "base_frequency" not in arguments:
+            raise ToolError("Provide 'base_frequency' or 'frequency_name'")
+        return arguments["base_frequency"], {"base_frequency": arguments["base_frequency"]}
+    catalog = tone_catalog()
+    if name not in catalog:
+        details = catalog.not_found(name)
+        raise ToolError(details.pop("error"), **details)
+    # Always a float, so results are the same whether or not they come from the tables
+    base = float(catalog.frequencies[name])
+    return base, {"base_frequency": base, "frequency_name": name}
+
+
+@register_tool(
+    "get_well_tone_frequency",
+    "Get a specific well-tone healing frequency by name (e.g., chakra_base, solfeggio_528, earth_432)",
+    {
+        "type": "object",
+        "properties": {
+            "frequency_name": {
+                "type": "string",
+                "description": "Name of the well-tone frequency to retrieve"
+            }
+        },
+        "required": ["frequency_name"]
+    },
+    cacheable=True,
+)
+def _tool_get_well_tone_frequency(arguments: dict[str, Any]) -> dict[str, Any]:
+    freq_name = arguments.get("frequency_name", "")
+    catalog = tone_catalog()
+    if freq_name in catalog:
+        return {
+            "frequency_name": freq_name,
+            "frequency_hz": catalog.frequencies[freq_name],
+            "description": f"Retrieved {freq_name} frequency"
+        }
+    return catalog.not_found(freq_name)
+
+
+@register_tool(
+    "list_all_well_tones",
+    "List all available well-tone frequencies organized by category",
+    {
+        "type": "object",
+        "properties": {}
+    },
+    static=True,
+)
+def _tool_list_all_well_tones(arguments: dict[str, Any]) -> dict[str, Any]:
+    return tone_catalog().categories
+
+
+@register_tool(
+    "get_chakra_frequencies",
+    "Get all chakra healing frequencies",
+    {
+        "type": "object",
+        "properties": {}
+    },
+    static=True,
+)
+def _tool_get_chakra_frequencies(arguments: dict[str, Any]) -> dict[str, Any]:
+    return tone_catalog().categories["chakras"]
+
+
+@register_tool(
+    "calculate_harmonic_series",
+    "Calculate harmonic series from a base frequency",
+    {
+        "type": "object",
+        "properties": {
+            "base_frequency": BASE_FREQUENCY_SCHEMA,
+            "frequency_name": FREQUENCY_NAME_SCHEMA,
+            "harmonics_count": {
+                "type": "integer",
+                "minimum": 0,
+                "maximum": MAX_RESULT_ITEMS,
+                "description": "Number of harmonics to calculate (default: 10)",
+                "default": 10
+            }
+        }
+    },
+    array_fields=["harmonics"],
+    pageable=True,
+    cost=lambda args: min(args.get("harmonics_count", 10), args.get("page_size", PAGE_SIZE)),
+    cacheable=True,
+)
+def _tool_calculate_harmonic_series(arguments: dict[str, Any]) -> dict[str, Any]:
+    base, echo = _resolve_base_frequency(arguments)
+    count = arguments.get("harmonics_count", 10)
+    check_finite_growth(base, math.log(max(count, 1)), "Harmonic series")
+    source = family_source(echo.get("frequency_name"), base, "harmonics", count)
+    harmonics, page = paginate(arguments, count, source)
+    return {
+        **echo,
+        "harmonics": harmonics,
+        "count": len(harmonics),
+        **page
+    }
+
+
+@register_tool(
+    "calculate_pythagorean_frequency",
+    "Calculate frequency using Pythagorean ratios",
+    {
+        "type": "object",
+        "properties": {
+            "base_frequency": BASE_FREQUENCY_SCHEMA,
+            "numerator": {
+                "type": "integer",
+                "description": "Numerator of the ratio"
+            },
+            "denominator": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Denominator of the ratio"
+            }
+        },
+        "required": ["base_frequency", "numerator", "denominator"]
+    },
+    cacheable=True,
+)
+def _tool_calculate_pythagorean_frequency(arguments: dict[str, Any]) -> dict[str, Any]:
+    base = arguments["base_frequency"]
+    num = arguments["numerator"]
+    den = arguments["denominator"]
+    return {
+        "base_frequency": base,
+        "ratio": f"{num}/{den}",
+        "calculated_frequency": calculate_pythagorean_ratio(base, (num, den))
+    }
+
+
+@register_tool(
+    "calculate_fibonacci_frequency",
+    "Calculate frequency based on Fibonacci sequence",
+    {
+        "type": "object",
+        "properties": {
+            "base_frequency": BASE_FREQUENCY_SCHEMA,
+            "frequency_name": FREQUENCY_NAME_SCHEMA,
+            "fibonacci_index": {
+                "type": "integer",
+                "description": f"Index in the Fibonacci sequence 1, 1, 2, 3, 5, ... (0-{MAX_FIBONACCI_INDEX})",
+                "minimum": 0,
+                "maximum": MAX_FIBONACCI_INDEX
+            }
+        },
+        "required": ["fibonacci_index"]
+    },
+    cacheable=True,
+)
+def _tool_calculate_fibonacci_frequency(arguments: dict[str, Any]) -> dict[str, Any]:
+    base, echo = _resolve_base_frequency(arguments)
+    index = arguments["fibonacci_index"]
+    check_finite_growth(base, fibonacci_log(index), "Fibonacci frequency")
+    source = family_source(echo.get("frequency_name"), base, "fibonacci", index + 1)
+    return {
+        **echo,
+        "fibonacci_index": index,
+        "calculated_frequency": next(source(index))
+    }
+
+
+@register_tool(
+    "calculate_golden_ratio_frequency",
+    "Calculate frequency using golden ratio (phi)",
+    {
+        "type": "object",
+        "properties": {
+            "base_frequency": BASE_FREQUENCY_SCHEMA
+        },
+        "required": ["base_frequency"]
+    },
+    cacheable=True,
+)
+def _tool_calculate_golden_ratio_frequency(arguments: dict[str, Any]) -> dict[str, Any]:
+    base = arguments["base_frequency"]
+    return {
+        "base_frequency": base,
+        "golden_ratio_frequency": calculate_golden_ratio_frequency(base),
+        "phi": (1 + math.sqrt(5)) / 2
+    }
+
+
+@register_tool(
+    "calculate_prime_harmonics",
+    "Calculate harmonics using prime numbers",
+    {
+        "type": "object",
+        "properties": {
+            "base_frequency": BASE_FREQUENCY_SCHEMA,
+            "primes": {
+                "type": "array",
+                "items": {"type": "integer"},
+                "description": "List of prime numbers to use (default: first 10 primes)"
+            }
+        },
+        "required": ["base_frequency"]
+    },
+    array_fields=["prime_harmonics"],
+    cacheable=True,
+)
+def _tool_calculate_prime_harmonics(arguments: dict[str, Any]) -> dict[str, Any]:
+    base = arguments["base_frequency"]
+    primes = arguments.get("primes", DEFAULT_PRIMES)
+    return {
+        "base_frequency": base,
+        "primes_used": primes,
+        "prime_harmonics": calculate_prime_harmonics(base, primes)
+    }
+
+
+@register_tool(
+    "generate_phi_spiral_frequencies",
+    "Generate frequencies based on golden ratio spiral",
+    {
+        "type": "object",
+        "properties": {
+            "base_frequency": BASE_FREQUENCY_SCHEMA,
+            "frequency_name": FREQUENCY_NAME_SCHEMA,
+            "count": {
+                "type": "integer",
+                "minimum": 0,
+                "maximum": MAX_RESULT_ITEMS,
+                "description": "Number of frequencies to generate (default: 10)",
+                "default": 10
+            }
+        }
+    },
+    array_fields=["phi_spiral_frequencies"],
+    pageable=True,
+    cost=lambda args: min(args.get("count", 10), args.get("page_size", PAGE_SIZE)),
+    cacheable=True,
+)
+def _tool_generate_phi_spiral_frequencies(arguments: dict[str, Any]) -> dict[str, Any]:
+    base, echo = _resolve_base_frequency(arguments)
+    count = arguments.get("count", 10)
+    phi = (1 + math.sqrt(5)) / 2
+    check_finite_growth(base, max(count - 1, 0) * math.log(phi), "Phi spiral")
+    source = family_source(echo.get("frequency_name"), base, "phi_spiral", count)
+    frequencies, page = paginate(arguments, count, source)
+    return {
+        **echo,
+        "phi_spiral_frequencies": frequencies,
+        "count": len(frequencies),
+        **page
+    }
+
+
+@register_tool(
+    "calculate_quantum_harmonic",
+    "Calculate quantum-level harmonics based on energy levels",
+    {
+        "type": "object",
+        "properties": {
+            "base_frequency": BASE_FREQUENCY_SCHEMA,
+            "quantum_level": {
+                "type": "integer",
+                "description": "Quantum energy level (1-10)",
+                "minimum": 1,
+                "maximum": 10
+            }
+        },
+        "required": ["base_frequency", "quantum_level"]
+    },
+    cacheable=True,
+)
+def _tool_calculate_quantum_harmonic(arguments: dict[str, Any]) -> dict[str, Any]:
+    base = arguments["base_frequency"]
+    level = arguments["quantum_level"]
+    return {
+        "base_frequency": base,
+        "quantum_level": level,
+        "quantum_harmonic_frequency": calculate_quantum_harmonics(base, level)
+    }
+
+
+@register_tool(
+    "generate_fractal_frequencies",
+    "Generate fractal-based frequencies using self-similar patterns",
+    {
+        "type": "object",
+        "properties": {
+            "base_frequency": BASE_FREQUENCY_SCHEMA,
+            "depth": {
+                "type": "integer",
+                "minimum": 0,
+                "maximum": MAX_RESULT_ITEMS // 2,
+                "description": "Fractal depth (default: 5)",
+                "default": 5
+            },
+            "min_frequency": {
+                "type": "number",
+                "description": "Only return frequencies at or above this value; lower levels are not generated"
+            },
+            "max_frequency": {
+                "type": "number",
+                "description": "Only return frequencies at or below this value; higher levels are not generated"
+            },
+            "tolerance_cents": DEDUPE_TOLERANCE_SCHEMA,
+            "annotate": ANNOTATE_SCHEMA,
+            "octave_equivalent": OCTAVE_EQUIVALENT_SCHEMA
+        },
+        "required": ["base_frequency"]
+    },
+    array_fields=["fractal_frequencies"],
+    pageable=True,
+    cost=lambda args: 2 * args.get("depth", 5) + 1,
+    cacheable=True,
+)
+def _tool_generate_fractal_frequencies(arguments: dict[str, Any]) -> dict[str, Any]:
+    base = arguments["base_frequency"]
+    depth = arguments.get("depth", 5)
+    low, high = arguments.get("min_frequency"), arguments.get("max_frequency")
+    # The largest value is base * 2 ** last, for the last level the bounds reach
+    _, last = fractal_level_range(base, depth, low, high)
+    check_finite_growth(base, max(last, 0) * math.log(2), "Fractal frequencies")
+    # Overflow bounds the levels to ~1000, so the full list is small enough to build
+    all_frequencies = generate_fractal_frequencies(
+        base, depth, low, high, arguments.get("tolerance_cents", DEFAULT_DEDUPE_TOLERANCE_CENTS)
+    )
+    frequencies, page = paginate(arguments, len(all_frequencies), lambda start: iter(all_frequencies[start:]))
+    result = {
+        "base_frequency": base,
+        "fractal_depth": depth,
+        **({"min_frequency": low} if low is not None else {}),
+        **({"max_frequency": high} if high is not None else {}),
+        "fractal_frequencies": frequencies,
+        "count": len(frequencies),
+        **page
+    }
+    if arguments.get("annotate", False):
+        result["annotations"] = well_tone_index().annotate(frequencies, arguments.get("octave_equivalent", False))
+    return result
+
+
+@register_tool(
+    "calculate_resonance_cascade",
+    "Calculate resonance cascade frequencies",
+    {
+        "type": "object",
+        "properties": {
+            "base_frequency": BASE_FREQUENCY_SCHEMA,
+            "frequency_name": FREQUENCY_NAME_SCHEMA,
+            "steps": {
+                "type": "integer",
+                "minimum": 0,
+                "maximum": MAX_RESULT_ITEMS,
+                "description": "Number of cascade steps (default: 7)",
+                "default": 7
+            }
+        }
+    },
+    array_fields=["resonance_cascade"],
+    pageable=True,
+    cost=lambda args: min(args.get("steps", 7), args.get("page_size", PAGE_SIZE)),
+    cacheable=True,
+)
+def _tool_calculate_resonance_cascade(arguments: dict[str, Any]) -> dict[str, Any]:
+    base, echo = _resolve_base_frequency(arguments)
+    steps = arguments.get("steps", 7)
+    check_finite_growth(base, max(steps - 1, 0) * math.log(math.sqrt(2)), "Resonance cascade")
+    # The cascade always contains the base frequency, even for zero steps
+    source = family_source(echo.get("frequency_name"), base, "resonance_cascade", max(steps, 1))
+    cascade, page = paginate(arguments, max(steps, 1), source)
+    return {
+        **echo,
+        "steps": steps,
+        "resonance_cascade": cascade,
+        **page
+    }
+
+
+@register_tool(
+    "generate_custom_frequency_matrix",
+    "Generate a matrix of frequencies combining multiple mathematical principles",
+    {
+        "type": "object",
+        "properties": {
+            "base_frequency": BASE_FREQUENCY_SCHEMA,
+            "include_fibonacci": {
+                "type": "boolean",
+                "description": "Include Fibonacci-based frequencies",
+                "default": True
+            },
+            "include_golden_ratio": {
+                "type": "boolean",
+                "description": "Include golden ratio frequencies",
+                "default": True
+            },
+            "include_primes": {
+                "type": "boolean",
+                "description": "Include prime-based harmonics",
+                "default": True
+            },
+            "matrix_size": {
+                "type": "integer",
+                "minimum": 0,
+                "maximum": MAX_RESULT_ITEMS,
+                "description": "Size of the frequency matrix (default: 8)",
+                "default": 8
+            },
+            "tolerance_cents": DEDUPE_TOLERANCE_SCHEMA,
+            "annotate": ANNOTATE_SCHEMA,
+            "octave_equivalent": OCTAVE_EQUIVALENT_SCHEMA
+        },
+        "required": ["base_frequency"]
+    },
+    array_fields=["frequency_matrix"],
+    cost=lambda args: 3 * args.get("matrix_size", 8),
+    cacheable=True,
+)
+def _tool_generate_custom_frequency_matrix(arguments: dict[str, Any]) -> dict[str, Any]:
+    base = arguments["base_frequency"]
+    include_fib = arguments.get("include_fibonacci", True)
+    include_phi = arguments.get("include_golden_ratio", True)
+    include_primes = arguments.get("include_primes", True)
+    size = arguments.get("matrix_size", 8)
+    if include_phi:
+        check_finite_growth(base, max(size - 1, 0) * math.log(PHI), "Frequency matrix")
+    if include_fib and size > 0:
+        if size > MAX_FIBONACCI_INDEX + 1:
+            raise ToolError(
+                f"Fibonacci frequencies are limited to the first {MAX_FIBONACCI_INDEX + 1} multiples; "
+                "reduce matrix_size or set include_fibonacci to false",
+                max_matrix_size=MAX_FIBONACCI_INDEX + 1
+            )
+        check_finite_growth(base, fibonacci_log(size - 1), "Frequency matrix")
+
+    matrix = []
+    if include_fib:
+        fib_freqs = fibonacci_multiples(base, size)
+        matrix.extend(fib_freqs)
+    if include_phi:
+        phi_freqs = generate_phi_based_frequencies(base, size)
+        matrix.extend(phi_freqs)
+    if include_primes:
+        prime_freqs = calculate_prime_harmonics(base, DEFAULT_PRIMES[:size])
+        matrix.extend(prime_freqs)
+
+    # Remove duplicates, including values that differ only by rounding, and sort
+    matrix = dedupe_within_cents(
+        np.asarray(matrix, dtype=np.float64), arguments.get("tolerance_cents", DEFAULT_DEDUPE_TOLERANCE_CENTS)
+    ).tolist()
+
+    result = {
+        "base_frequency": base,
+        "matrix_size": len(matrix),
+        "frequency_matrix": matrix,
+        "includes": {
+            "fibonacci": include_fib,
+            "golden_ratio": include_phi,
+            "primes": include_primes
+        }
+    }
+    if arguments.get("annotate", False):
+        result["annotations"] = well_tone_index().annotate(matrix, arguments.get("octave_equivalent", False))
+    return result
+
+
+@register_tool(
+    "search_well_tones",
+    "Search the well-tone catalog by approximate name, category and frequency range",
+    {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "Approximate tone name; results are ranked by similarity"
+            },
+            "category": {
+                "type": "string",
+                "description": "Only tones in this category (e.g. chakras, solfeggio)"
+            },
+            "min_frequency": {
+                "type": "number",
+                "minimum": 0,
+                "description": "Lowest frequency in Hz to include"
+            },
+            "max_frequency": {
+                "type": "number",
+                "minimum": 0,
+                "description": "Highest frequency in Hz to include"
+            }
+        }
+    },
+    pageable=True,
+    cacheable=True,
+)
+def _tool_search_well_tones(arguments: dict[str, Any]) -> dict[str, Any]:
+    catalog = tone_catalog()
+    query = arguments.get("query")
+    category = arguments.get("category")
+    if category is not None and category not in catalog.categories:
+        return {"error": f"Unknown category '{category}'", "categories": list(catalog.categories)}
+
+    low = arguments.get("min_frequency", 0.0)
+    high = arguments.get("max_frequency", math.inf)
+    bounded = "min_frequency" in arguments or "max_frequency" in arguments
+    scores: dict[str, float] = {}
+    # Start from the most selective index, then filter
+    if query:
+        scores = dict(catalog.suggest(query, limit=None))
+        names = list(scores)
+        if bounded:
+            names = [name for name in names if low <= catalog.frequencies[name] <= high]
+    elif bounded:
+        names = catalog.in_range(low, high)
+    else:
+        names = list(catalog.categories[category]) if category is not None else catalog.names
+    if category is not None and (query or bounded):
+        names = [name for name in names if catalog.category_of[name] == category]
+
+    def entries(start: int) -> Iterator[dict[str, Any]]:
+        for name in islice(names, start, None):
+            entry = {"name": name, "frequency_hz": catalog.frequencies[name], "category": catalog.category_of[name]}
+            if query:
+                entry["score"] = round(scores[name], 4)
+            yield entry
+
+    results, page = paginate(arguments, len(names), entries)
+    return {
+        "matches": len(names),
+        "results": results,
+        "catalog_size": len(catalog),
+        **page
+    }
+
+
+@register_tool(
+    "find_nearest_well_tones",
+    "Find the k nearest named well-tone frequencies to one or many query frequencies, "
+    "with distances in Hz and cents",
+    {
+        "type": "object",
+        "properties": {
+            "frequencies": {
+                "type": "array",
+                "items": {"type": "number", "exclusiveMinimum": 0},
+                "minItems": 1,
+                "maxItems": MAX_RESULT_ITEMS,
+                "description": "Query frequencies in Hz"
+            },
+            "k": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Number of nearest tones to return per query (default: 3)",
+                "default": 3
+            },
+            "octave_equivalent": OCTAVE_EQUIVALENT_SCHEMA
+        },
+        "required": ["frequencies"]
+    },
+    cost=lambda args: len(args["frequencies"]) * args.get("k", 3),
+    cacheable=True,
+)
+def _tool_find_nearest_well_tones(arguments: dict[str, Any]) -> dict[str, Any]:
+    queries = arguments["frequencies"]
+    octave_equivalent = arguments.get("octave_equivalent", False)
+    index = well_tone_index()
+    tones, shifts = index.nearest(queries, arguments.get("k", 3), octave_equivalent)
+    return {
+        "octave_equivalent": octave_equivalent,
+        "results": [
+            {
+                "frequency": query,
+                "nearest": [
+                    index.describe(query, tone, shift)
+                    for tone, shift in zip(row_tones, row_shifts)
+                ]
+            }
+            for query, row_tones, row_shifts in zip(queries, tones.tolist(), shifts.tolist())
+        ]
+    }
+
+
+@register_tool(
+    "calculate_roughness",
+    "Score the sensory roughness (Plomp-Levelt/Sethares dissonance, including partials) of a frequency set, "
+    "per tone pair and in total, and rank its most consonant subsets",
+    {
+        "type": "object",
+        "properties": {
+            "frequencies": {
+                "type": "array",
+                "items": {"type": "number", "exclusiveMinimum": 0},
+                "minItems": 1,
+                "maxItems": MAX_ROUGHNESS_PARTIALS,
+                "description": "Tone frequencies in Hz"
+            },
+            "amplitudes": {
+                "type": "array",
+                "items": {"type": "number", "minimum": 0},
+                "description": "Amplitude of each tone's fundamental (default: 1 for every tone)"
+            },
+            "partials": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": 64,
+                "description": "Harmonic partials per tone, including the fundamental (default: 6)",
+                "default": 6
+            },
+            "amplitude_decay": {
+                "type": "number",
+                "exclusiveMinimum": 0,
+                "maximum": 1,
+                "description": "Amplitude ratio between successive partials (default: 0.88)",
+                "default": 0.88
+            },
+            "subset_size": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Rank the most consonant subsets of this many tones"
+            },
+            "top_subsets": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": 100,
+                "description": "Number of subsets to return (default: 5)",
+                "default": 5
+            }
+        },
+        "required": ["frequencies"]
+    },
+    pageable=True,
+    cost=lambda args: (len(args["frequencies"]) * args.get("partials", 6)) ** 2 // 2,
+    cacheable=True,
+)
+def _tool_calculate_roughness(arguments: dict[str, Any]) -> dict[str, Any]:
+    frequencies = arguments["frequencies"]
+    amplitudes = arguments.get("amplitudes", [1.0] * len(frequencies))
+    partials = arguments.get("partials", 6)
+    decay = arguments.get("amplitude_decay", 0.88)
+    subset_size = arguments.get("subset_size")
+    n = len(frequencies)
+    if len(amplitudes) != n:
+        raise ToolError("'amplitudes' must have one entry per frequency", frequencies=n, amplitudes=len(amplitudes))
+    if n * partials > MAX_ROUGHNESS_PARTIALS:
+        raise ToolError(
+            f"At most {MAX_ROUGHNESS_PARTIALS} partials can be scored; reduce frequencies or partials",
+            max_partials=MAX_ROUGHNESS_PARTIALS
+        )
+    if subset_size is not None:
+        if n > MAX_SUBSET_TONES:
+            raise ToolError(
+                f"Subsets can be ranked for at most {MAX_SUBSET_TONES} frequencies",
+                max_subset_tones=MAX_SUBSET_TONES
+            )
+        if subset_size > n:
+            raise ToolError("'subset_size' cannot exceed the number of frequencies", frequencies=n)
+
+    freqs, amps, tones = tone_partials(frequencies, amplitudes, partials, decay)
+    scored = pairwise_roughness(freqs, amps, tones, n)
+    intrinsic, keys, values = scored["intrinsic"], scored["pair_keys"], scored["pair_values"]
+
+    # Most dissonant pairs first; pairs with nothing left after pruning are omitted
+    order = np.argsort(-values, kind="stable")
+    first, second = (keys[order] // n).tolist(), (keys[order] % n).tolist()
+    pair_values = values[order].tolist()
+
+    def pairs(start: int) -> Iterator[dict[str, Any]]:
+        for i, j, value in islice(zip(first, second, pair_values), start, None):
+            yield {"indices": [i, j], "frequencies": [frequencies[i], frequencies[j]], "roughness": value}
+
+    pair_roughness, page = paginate(arguments, len(pair_values), pairs)
+    result = {
+        "tone_count": n,
+        "partials": partials,
+        "amplitude_decay": decay,
+        "total_roughness": float(intrinsic.sum() + values.sum()),
+        "intrinsic_roughness": float(intrinsic.sum()),
+        "pair_roughness": pair_roughness,
+        "interacting_pairs": len(pair_values),
+        "partial_pairs_evaluated": scored["evaluated"],
+        "partial_pairs_pruned": scored["pruned"],
+        **page
+    }
+    if subset_size is not None:
+        matrix = np.zeros((n, n))
+        rows, columns = keys // n, keys % n
+        matrix[rows, columns] = values
+        matrix[columns, rows] = values
+        ranked, method = rank_subsets(intrinsic, matrix, subset_size, arguments.get("top_subsets", 5))
+        result["subset_search"] = method
+        result["most_consonant_subsets"] = [
+            {"indices": list(members), "frequencies": [frequencies[i] for i in members], "roughness": score}
+            for score, members in ranked
+        ]
+    return result
+
+
+@register_tool(
+    "find_rational_ratios",
+    "Find the simplest rational ratio p/q within a tolerance in cents for every pair of a frequency set, "
+    "with odd-limit and prime-limit classification (the inverse of calculate_pythagorean_frequency)",
+    {
+        "type": "object",
+        "properties": {
+            "frequencies": {
+                "type": "array",
+                "items": {"type": "number", "exclusiveMinimum": 0},
+                "minItems": 2,
+                "maxItems": MAX_RATIO_FREQUENCIES,
+                "description": "Frequencies in Hz; every pair is compared"
+            },
+            "tolerance_cents": {
+                "type": "number",
+                "exclusiveMinimum": 0,
+                "maximum": 600,
+                "description": f"Largest accepted deviation from the exact ratio, in cents (default: {DEFAULT_RATIO_TOLERANCE_CENTS:g})",
+                "default": DEFAULT_RATIO_TOLERANCE_CENTS
+            },
+            "max_term": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": MAX_RATIO_TERM,
+                "description": "Largest numerator or denominator accepted; pairs needing more get no ratio "
+                               f"(default: {DEFAULT_MAX_RATIO_TERM})",
+                "default": DEFAULT_MAX_RATIO_TERM
+            }
+        },
+        "required": ["frequencies"]
+    },
+    pageable=True,
+    cost=lambda args: len(args["frequencies"]) * (len(args["frequencies"]) - 1) // 2,
+    cacheable=True,
+)
+def _tool_find_rational_ratios(arguments: dict[str, Any]) -> dict[str, Any]:
+    frequencies = arguments["frequencies"]
+    tolerance = arguments.get("tolerance_cents", DEFAULT_RATIO_TOLERANCE_CENTS)
+    max_term = arguments.get("max_term", DEFAULT_MAX_RATIO_TERM)
+    n = len(frequencies)
+    log2 = np.log2(np.asarray(frequencies, dtype=np.float64))
+    total = n * (n - 1) // 2
+
+    def pair_ratios(start: int, stop: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        first, second = upper_triangle_pairs(n, start, stop)
+        cents = 1200.0 * (log2[second] - log2[first])
+        numerators, denominators = interval_ratios(cents, tolerance, max_term)
+        return first, second, cents, numerators, denominators
+
+    # Summary over every pair, one chunk at a time; only the ratio counts are kept
+    ratio_keys, ratio_counts = [], []
+    for start in range(0, total, RATIO_CHUNK_PAIRS):
+        check_cancelled()
+        *_, numerators, denominators = pair_ratios(start, min(total, start + RATIO_CHUNK_PAIRS))
+        keys, counts = np.unique(numerators * (MAX_RATIO_TERM + 1) + denominators, return_counts=True)
+        ratio_keys.append(keys)
+        ratio_counts.append(counts)
+    keys, inverse = np.unique(np.concatenate(ratio_keys), return_inverse=True)
+    counts = np.bincount(inverse, weights=np.concatenate(ratio_counts)).astype(np.int64)
+    ratio_numerators, ratio_denominators = keys // (MAX_RATIO_TERM + 1), keys % (MAX_RATIO_TERM + 1)
+    matched = ratio_denominators > 0
+    unmatched = int(counts[~matched].sum())
+    keys, counts = keys[matched], counts[matched]
+    ratio_numerators, ratio_denominators = ratio_numerators[matched], ratio_denominators[matched]
+    # The prime limit of p/q is the larger of its terms' limits, so the sieve stays within max_term
+    limits = np.maximum(prime_limits(ratio_numerators), prime_limits(ratio_denominators))
+    limit_values, limit_inverse = np.unique(limits, return_inverse=True)
+    limit_counts = np.bincount(limit_inverse, weights=counts, minlength=len(limit_values)).astype(np.int64)
+    common = np.argsort(-counts, kind="stable")[:10]
+
+    def pairs(start: int) -> Iterator[dict[str, Any]]:
+        stop = min(total, start + arguments.get("page_size", PAGE_SIZE))
+        first, second, cents, numerators, denominators = pair_ratios(start, stop)
+        matched = denominators > 0
+        safe_numerators, safe_denominators = np.where(matched, numerators, 1), np.where(matched, denominators, 1)
+        errors = cents - 1200.0 * np.log2(safe_numerators / safe_denominators)
+        odd_limits = np.maximum(odd_part(safe_numerators), odd_part(safe_denominators))
+        pair_prime_limits = np.maximum(prime_limits(safe_numerators), prime_limits(safe_denominators))
+        rows = zip(
+            first.tolist(), second.tolist(), cents.tolist(), numerators.tolist(), denominators.tolist(),
+            errors.tolist(), odd_limits.tolist(), pair_prime_limits.tolist()
+        )
+        for i, j, interval, p, q, error, odd_limit, prime_limit in rows:
+            entry = {"indices": [i, j], "frequencies": [frequencies[i], frequencies[j]], "cents": interval}
+            if q:
+                entry.update({
+                    "ratio": f"{p}/{q}",
+                    "numerator": p,
+                    "denominator": q,
+                    "error_cents": error,
+                    "odd_limit": odd_limit,
+                    "prime_limit": prime_limit
+                })
+            else:
+                entry["ratio"] = None
+            yield entry
+
+    ratios, page = paginate(arguments, total, pairs)
+    return {
+        "tolerance_cents": tolerance,
+        "max_term": max_term,
+        "pair_count": total,
+        "matched_pairs": total - unmatched,
+        "unmatched_pairs": unmatched,
+        "distinct_ratios": len(keys),
+        "prime_limit_counts": {str(limit): count for limit, count in zip(limit_values.tolist(), limit_counts.tolist())},
+        "most_common_ratios": [
+            {"ratio": f"{ratio_numerators[i]}/{ratio_denominators[i]}", "pairs": int(counts[i])}
+            for i in common.tolist()
+        ],
+        "pairs": ratios,
+        **page
+    }
+
+
+TUNING_PROPERTIES = {
+    "system": {
+        "type": "string",
+        "enum": TUNING_SYSTEMS,
+        "description": "Tuning system: equal division of the octave, Pythagorean, five-limit just intonation, "
+                       "or equal division of a phi period (default: edo)",
+        "default": "edo"
+    },
+    "divisions": {
+        "type": "integer",
+        "minimum": 1,
+        "maximum": MAX_SCALE_DIVISIONS,
+        "description": f"Steps per period for the edo and phi systems (default: {DEFAULT_EDO_DIVISIONS} for edo, 1 for phi)"
+    },
+    "lowest_octave": {
+        "type": "integer",
+        "minimum": -MAX_SCALE_OCTAVES,
+        "maximum": MAX_SCALE_OCTAVES,
+        "description": "Lowest octave of the scale relative to the reference pitch"
+    },
+    "highest_octave": {
+        "type": "integer",
+        "minimum": -MAX_SCALE_OCTAVES,
+        "maximum": MAX_SCALE_OCTAVES,
+        "description": "Highest octave of the scale relative to the reference pitch"
+    }
+}
+
+
+def _scale_table(arguments: dict[str, Any], reference: float, low: int, high: int) -> ScaleTable:
+    """The cached scale table for the tuning arguments and an octave range."""
+    if reference <= 0:
+        raise ToolError("The reference frequency must be positive")
+    if low > high:
+        raise ToolError("'lowest_octave' cannot be above 'highest_octave'", lowest_octave=low, highest_octave=high)
+    system = arguments.get("system", "edo")
+    divisions = arguments.get("divisions", DEFAULT_EDO_DIVISIONS if system == "edo" else 1)
+    return SCALE_CACHE.get(system, reference, low, high, divisions)
+
+
+@register_tool(
+    "generate_scale",
+    "Generate a scale (12-TET or any EDO, Pythagorean, just intonation or phi-based) from a reference pitch "
+    "across a range of octaves",
+    {
+        "type": "object",
+        "properties": {
+            "base_frequency": BASE_FREQUENCY_SCHEMA,
+            "frequency_name": FREQUENCY_NAME_SCHEMA,
+            **TUNING_PROPERTIES
+        }
+    },
+    array_fields=["scale"],
+    pageable=True,
+    cacheable=True,
+)
+def _tool_generate_scale(arguments: dict[str, Any]) -> dict[str, Any]:
+    reference, echo = _resolve_base_frequency(arguments)
+    table = _scale_table(arguments, reference, arguments.get("lowest_octave", 0), arguments.get("highest_octave", 1))
+    scale = table.frequencies.tolist()
+    frequencies, page = paginate(arguments, len(scale), lambda start: iter(scale[start:]))
+    period_degrees = [{"degree": i, "cents": 1200.0 * offset} for i, offset in enumerate(table.period_offsets.tolist())]
+    for entry, (numerator, denominator) in zip(period_degrees, table.ratios or ()):
+        entry["ratio"] = f"{numerator}/{denominator}"
+    return {
+        **echo,
+        "system": table.system,
+        "period_degrees": period_degrees,
+        "scale": frequencies,
+        "count": len(frequencies),
+        **page
+    }
+
+
+@register_tool(
+    "snap_to_scale",
+    "Snap many frequencies to the nearest degree of a scale, with the deviation of each in cents",
+    {
+        "type": "object",
+        "properties": {
+            "frequencies": {
+                "type": "array",
+                "items": {"type": "number", "exclusiveMinimum": 0},
+                "minItems": 1,
+                "maxItems": MAX_RESULT_ITEMS,
+                "description": "Frequencies in Hz to snap"
+            },
+            "base_frequency": BASE_FREQUENCY_SCHEMA,
+            "frequency_name": FREQUENCY_NAME_SCHEMA,
+            **TUNING_PROPERTIES
+        },
+        "required": ["frequencies"]
+    },
+    array_fields=["snapped_frequencies", "deviations_cents"],
+    cost=lambda args: len(args["frequencies"]),
+    cacheable=True,
+)
+def _tool_snap_to_scale(arguments: dict[str, Any]) -> dict[str, Any]:
+    reference, echo = _resolve_base_frequency(arguments)
+    if reference <= 0:
+        raise ToolError("The reference frequency must be positive")
+    queries = np.asarray(arguments["frequencies"], dtype=np.float64)
+    # By default the scale spans just the octaves the queries fall in
+    spread = np.log2(queries / reference)
+    lowest = max(math.floor(spread.min()), -MAX_SCALE_OCTAVES)
+    highest = min(math.ceil(spread.max()), MAX_SCALE_OCTAVES)
+    low = arguments.get("lowest_octave", min(lowest, arguments.get("highest_octave", lowest)))
+    high = arguments.get("highest_octave", max(highest, low))
+    table = _scale_table(arguments, reference, low, high)
+    nearest, deviations = table.snap(queries)
+    return {
+        **echo,
+        "system": table.system,
+        "lowest_octave": low,
+        "highest_octave": high,
+        "snapped_frequencies": table.frequencies[nearest],
+        "scale_degrees": table.degrees[nearest].tolist(),
+        "deviations_cents": deviations
+    }
+
+
+PYTHAGOREAN_RATIOS = [(1, 1), (9, 8), (81, 64), (4, 3), (3, 2), (27, 16), (243, 128), (2, 1)]
+
+# generator name -> (batch calculator, parameters taken from the arguments)
+BATCH_GENERATORS: dict[str, Callable[[np.ndarray, dict[str, Any]], tuple[np.ndarray, dict[str, Any]]]] = {
+    "harmonic_series": lambda bases, args: (
+        batch_harmonic_series(bases, args.get("count", 10)),
+        {"count": args.get("count", 10)},
+    ),
+    "pythagorean": lambda bases, args: (
+        batch_pythagorean_ratios(bases, args.get("ratios", PYTHAGOREAN_RATIOS)),
+        {"ratios": [f"{num}/{den}" for num, den in args.get("ratios", PYTHAGOREAN_RATIOS)]},
+    ),
+    "fibonacci": lambda bases, args: (
+        batch_fibonacci_frequencies(bases, args.get("fibonacci_indices", list(range(len(FIBONACCI_SEQUENCE))))),
+        {"fibonacci_indices": args.get("fibonacci_indices", list(range(len(FIBONACCI_SEQUENCE))))},
+    ),
+    "golden_ratio": lambda bases, args: (
+        batch_golden_ratio_frequencies(bases),
+        {"phi": (1 + math.sqrt(5)) / 2},
+    ),
+    "prime_harmonics": lambda bases, args: (
+        batch_prime_harmonics(bases, args.get("primes", DEFAULT_PRIMES)),
+        {"primes": args.get("primes", DEFAULT_PRIMES)},
+    ),
+    "phi_spiral": lambda bases, args: (
+        batch_phi_based_frequencies(bases, args.get("count", 10)),
+        {"count": args.get("count", 10)},
+    ),
+    "quantum_harmonic": lambda bases, args: (
+        batch_quantum_harmonics(bases, args.get("quantum_levels", list(range(1, 11)))),
+        {"quantum_levels": args.get("quantum_levels", list(range(1, 11)))},
+    ),
+    "fractal": lambda bases, args: (
+        batch_fractal_frequencies(bases, args.get("count", 5)),
+        {"depth": args.get("count", 5)},
+    ),
+    "resonance_cascade": lambda bases, args: (
+        batch_resonance_cascade(bases, args.get("count", 7)),
+        {"steps": args.get("count", 7)},
+    ),
+}
+
+
+def _batch_shape(generator: str, arguments: dict[str, Any]) -> tuple[int, float]:
+    """Columns per base row and log growth of the largest multiple, before computing."""
+    count = arguments.get("count")
+    phi = (1 + math.sqrt(5)) / 2
+    if generator == "harmonic_series":
+        return count if count is not None else 10, math.log(max(count or 10, 1))
+    if generator == "phi_spiral":
+        count = count if count is not None else 10
+        return count, max(count - 1, 0) * math.log(phi)
+    if generator == "resonance_cascade":
+        count = count if count is not None else 7
+        return max(count, 1), max(count - 1, 0) * math.log(math.sqrt(2))
+    if generator == "fractal":
+        count = count if count is not None else 5
+        return 2 * count + 1, count * math.log(2)
+    if generator == "golden_ratio":
+        return 1, math.log(phi)
+    column_arguments = {
+        "prime_harmonics": ("primes", DEFAULT_PRIMES),
+        "quantum_harmonic": ("quantum_levels", range(1, 11)),
+        "fibonacci": ("fibonacci_indices", range(len(FIBONACCI_SEQUENCE))),
+        "pythagorean": ("ratios", PYTHAGOREAN_RATIOS),
+    }
+    key, default = column_arguments[generator]
+    columns = arguments.get(key, default)
+    if generator == "fibonacci" and columns:
+        return len(columns), fibonacci_log(max(columns))
+    return len(columns), 0.0
+
+
+# Generator parameters, shared by batch_evaluate and run_pipeline stages
+BATCH_GENERATOR_PROPERTIES = {
+    "count": {
+        "type": "integer",
+        "minimum": 0,
+        "maximum": MAX_RESULT_ITEMS,
+        "description": "Series length for harmonic_series (default: 10), phi_spiral (default: 10) "
+                       "and resonance_cascade (default: 7), or depth for fractal (default: 5)"
+    },
+    "primes": {
+        "type": "array",
+        "items": {"type": "integer"},
+        "description": "Primes for prime_harmonics (default: first 10 primes)"
+    },
+    "quantum_levels": {
+        "type": "array",
+        "items": {"type": "integer", "minimum": 1, "maximum": 10},
+        "description": "Energy levels for quantum_harmonic (default: 1-10)"
+    },
+    "fibonacci_indices": {
+        "type": "array",
+        "items": {"type": "integer", "minimum": 0, "maximum": MAX_FIBONACCI_INDEX},
+        "description": f"Fibonacci sequence indices (0-{MAX_FIBONACCI_INDEX}) for fibonacci (default: 0-11)"
+    },
+    "ratios": {
+        "type": "array",
+        "items": {
+            "type": "array",
+            "items": {"type": "integer", "minimum": 1},
+            "minItems": 2,
+            "maxItems": 2
+        },
+        "description": "[numerator, denominator] pairs for pythagorean (default: Pythagorean diatonic ratios)"
+    }
+}
+
+
+@register_tool(
+    "batch_evaluate",
+    "Evaluate a frequency generator for many base frequencies in one call (vectorized)",
+    {
+        "type": "object",
+        "properties": {
+            "generator": {
+                "type": "string",
+                "enum": list(BATCH_GENERATORS),
+                "description": "Generator to evaluate for every base frequency"
+            },
+            "base_frequencies": {
+                "type": "array",
+                "items": {"type": "number"},
+                "minItems": 1,
+                "maxItems": MAX_RESULT_ITEMS,
+                "description": "Base frequencies in Hz"
+            },
+            **BATCH_GENERATOR_PROPERTIES
+        },
+        "required": ["generator", "base_frequencies"]
+    },
+    array_fields=["results"],
+    cost=lambda args: len(args["base_frequencies"]) * _batch_shape(args["generator"], args)[0],
+    cacheable=True,
+)
+def _tool_batch_evaluate(arguments: dict[str, Any]) -> dict[str, Any]:
+    generator = arguments["generator"]
+    columns, growth_log = _batch_shape(generator, arguments)
+    cells = len(arguments["base_frequencies"]) * columns
+    if cells > MAX_RESULT_ITEMS:
+        raise ToolError(
+            f"Batch result would have {cells} values; the limit is {MAX_RESULT_ITEMS}",
+            max_items=MAX_RESULT_ITEMS,
+        )
+    if generator in ("harmonic_series", "phi_spiral", "resonance_cascade", "fractal", "fibonacci"):
+        largest = max((abs(b) for b in arguments["base_frequencies"]), default=0)
+        check_finite_growth(largest, growth_log, "Batch result")
+    bases = np.asarray(arguments["base_frequencies"], dtype=np.float64)
+    results, parameters = BATCH_GENERATORS[generator](bases, arguments)
+    return {
+        "generator": generator,
+        "parameters": parameters,
+        "base_frequencies": arguments["base_frequencies"],
+        "results": results,
+        "count": len(results)
+    }
+
+
+# Pipelines run as a chain of generators over NumPy chunks of at most
+# PIPELINE_CHUNK values: generator stages expand each chunk through the
+# batch calculators, filter and limit stream chunks straight through (limit
+# stops pulling from upstream once it has enough), and only dedupe, sort and
+# top_k see more than one chunk at a time, top_k keeping just its k best.
+PIPELINE_CHUNK = 65536
+MAX_PIPELINE_STAGES = 32
+# Values any one stage may produce, however many a later filter discards
+MAX_PIPELINE_VALUES = 50 * MAX_RESULT_ITEMS
+PIPELINE_OPERATIONS = [*BATCH_GENERATORS, "filter", "dedupe", "sort", "top_k", "limit"]
+
+PIPELINE_STAGE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "op": {
+            "type": "string",
+            "enum": PIPELINE_OPERATIONS,
+            "description": "A generator (applied to every value, each as a base frequency), or filter, dedupe, "
+                           "sort, top_k or limit"
+        },
+        **BATCH_GENERATOR_PROPERTIES,
+        "min_frequency": {
+            "type": "number",
+            "description": "filter: lowest frequency to keep"
+        },
+        "max_frequency": {
+            "type": "number",
+            "description": "filter: highest frequency to keep"
+        },
+        "tolerance_cents": {
+            "type": "number",
+            "minimum": 0,
+            "maximum": 1200,
+            "description": "dedupe: values within this many cents of a kept value are dropped (default: 0, exact)"
+        },
+        "order": {
+            "type": "string",
+            "enum": ["ascending", "descending"],
+            "description": "sort: direction (default: ascending); top_k: ascending keeps the smallest k "
+                           "(default: descending, the largest)"
+        },
+        "k": {
+            "type": "integer",
+            "minimum": 0,
+            "maximum": MAX_RESULT_ITEMS,
+            "description": "top_k and limit: number of values to keep"
+        }
+    },
+    "required": ["op"]
+}
+
+
+def _pipeline_chunks(values: np.ndarray) -> Iterator[np.ndarray]:
+    for start in range(0, len(values), PIPELINE_CHUNK):
+        yield values[start:start + PIPELINE_CHUNK]
+
+
+def _pipeline_stage(upstream: Iterator[np.ndarray], stage: dict[str, Any], counter: list[int]) -> Iterator[np.ndarray]:
+    """Apply one stage to a stream of chunks, counting the values it emits in ``counter[0]``."""
+    op = stage["op"]
+
+    def emit(chunk: np.ndarray) -> Iterator[np.ndarray]:
+        counter[0] += len(chunk)
+        if counter[0] > MAX_PIPELINE_VALUES:
+            raise ToolError(
+                f"Pipeline stage '{op}' would produce more than {MAX_PIPELINE_VALUES} values; "
+                "filter or limit earlier",
+                max_values=MAX_PIPELINE_VALUES
+            )
+        if len(chunk):
+            yield chunk
+
+    if op in BATCH_GENERATORS:
+        columns, growth_log = _batch_shape(op, stage)
+        rows = max(1, PIPELINE_CHUNK // max(columns, 1))
+        for chunk in upstream:
+            for start in range(0, len(chunk), rows):
+                check_cancelled()
+                bases = chunk[start:start + rows]
+                if op in ("harmonic_series", "phi_spiral", "resonance_cascade", "fractal", "fibonacci"):
+                    check_finite_growth(float(np.abs(bases).max()), growth_log, f"Pipeline stage '{op}'")
+                yield from emit(BATCH_GENERATORS[op](bases, stage)[0].ravel())
+    elif op == "filter":
+        low, high = stage.get("min_frequency", -math.inf), stage.get("max_frequency", math.inf)
+        for chunk in upstream:
+            yield from emit(chunk[(chunk >= low) & (chunk <= high)])
+    elif op == "limit":
+        remaining = stage.get("k", 0)
+        if remaining <= 0:
+            return
+        for chunk in upstream:
+            yield from emit(chunk[:remaining])
+            remaining -= len(chunk)
+            # Stop before pulling (and so generating) another upstream chunk
+            if remaining <= 0:
+                return
+    elif op == "top_k":
+        k = stage.get("k", 0)
+        descending = stage.get("order", "descending") == "descending"
+        best = np.zeros(0)
+        for chunk in upstream:
+            best = np.concatenate([best, -chunk if descending else chunk])
+            if len(best) > 2 * k:
+                best = np.partition(best, k)[:k] if k else best[:0]
+        best = np.sort(best)[:k]
+        yield from emit(-best if descending else best)
+    else:
+        # dedupe and sort need every value; exact duplicates are dropped chunk by chunk first
+        gathered = [np.unique(chunk) if op == "dedupe" else chunk for chunk in upstream]
+        values = np.concatenate(gathered) if gathered else np.zeros(0)
+        if op == "dedupe":
+            values = dedupe_within_cents(values, stage.get("tolerance_cents", 0))
+        else:
+            values = np.sort(values)
+            if stage.get("order", "ascending") == "descending":
+                values = values[::-1]
+        for chunk in _pipeline_chunks(values):
+            yield from emit(chunk)
+
+
+def run_pipeline(values: np.ndarray, stages: Sequence[dict[str, Any]]) -> tuple[np.ndarray, list[int]]:
+    """Run ``stages`` over ``values``; returns the result and each stage's output count."""
+    counters = [[0] for _ in stages]
+    stream: Iterator[np.ndarray] = _pipeline_chunks(values)
+    for stage, counter in zip(stages, counters):
+        stream = _pipeline_stage(stream, stage, counter)
+    chunks = list(stream)
+    result = np.concatenate(chunks) if chunks else np.zeros(0)
+    return result, [counter[0] for counter in counters]
+
+
+def _pipeline_cost(arguments: dict[str, Any]) -> float:
+    """Largest number of values any stage could produce, assuming filters keep everything."""
+    size = largest = len(arguments.get("frequencies", [0]))
+    for stage in arguments["stages"]:
+        if stage["op"] in BATCH_GENERATORS:
+            size *= _batch_shape(stage["op"], stage)[0]
+        elif stage["op"] in ("top_k", "limit"):
+            size = min(size, stage.get("k", 0))
+        largest = max(largest, size)
+    return largest
+
+
+@register_tool(
+    "run_pipeline",
+    "Chain generators, filters, dedupe, sort, top_k and limit over a set of frequencies in one request, "
+    "e.g. phi spiral -> harmonic series of each value -> filter to 20-20000 Hz -> dedupe -> sort",
+    {
+        "type": "object",
+        "properties": {
+            "frequencies": {
+                "type": "array",
+                "items": {"type": "number"},
+                "minItems": 1,
+                "maxItems": MAX_RESULT_ITEMS,
+                "description": "Starting frequencies in Hz (or use base_frequency/frequency_name)"
+            },
+            "base_frequency": BASE_FREQUENCY_SCHEMA,
+            "frequency_name": FREQUENCY_NAME_SCHEMA,
+            "stages": {
+                "type": "array",
+                "items": PIPELINE_STAGE_SCHEMA,
+                "minItems": 1,
+                "maxItems": MAX_PIPELINE_STAGES,
+                "description": "Stages applied in order, e.g. [{\"op\": \"phi_spiral\", \"count\": 8}, "
+                               "{\"op\": \"harmonic_series\", \"count\": 16}, "
+                               "{\"op\": \"filter\", \"min_frequency\": 20, \"max_frequency\": 20000}, "
+                               "{\"op\": \"dedupe\", \"tolerance_cents\": 5}, {\"op\": \"sort\"}]"
+            }
+        },
+        "required": ["stages"]
+    },
+    array_fields=["frequencies"],
+    pageable=True,
+    cost=lambda args: _pipeline_cost(args),
+    cacheable=True,
+)
+def _tool_run_pipeline(arguments: dict[str, Any]) -> dict[str, Any]:
+    if "frequencies" in arguments:
+        initial, echo = arguments["frequencies"], {}
+    else:
+        base, echo = _resolve_base_frequency(arguments)
+        initial = [base]
+    stages = arguments["stages"]
+    for position, stage in enumerate(stages):
+        if stage["op"] in ("top_k", "limit") and "k" not in stage:
+            raise ToolError(f"Stage {position} ('{stage['op']}') needs 'k'", stage=position)
+    result, counts = run_pipeline(np.asarray(initial, dtype=np.float64), stages)
+    if len(result) > MAX_RESULT_ITEMS:
+        raise ToolError(
+            f"Pipeline result has {len(result)} values; the limit is {MAX_RESULT_ITEMS}",
+            max_items=MAX_RESULT_ITEMS
+        )
+    values = result.tolist()
+    frequencies, page = paginate(arguments, len(values), lambda start: iter(values[start:]))
+    return {
+        **echo,
+        "stages": [{"op": stage["op"], "output_count": count} for stage, count in zip(stages, counts)],
+        "frequencies": frequencies,
+        "count": len(frequencies),
+        **page
+    }
+
+
+MAX_INLINE_AUDIO_SECONDS = 30
+
+
+def _resolve_frequencies(arguments: dict[str, Any]) -> tuple[list[float], Optional[dict[str, Any]]]:
+    """Collect ``frequencies`` plus any ``frequency_names`` looked up in the catalog."""
+    frequencies = list(arguments.get("frequencies", []))
+    catalog = tone_catalog()
+    for name in arguments.get("frequency_names", []):
+        if name not in catalog:
+            return [], catalog.not_found(name)
+        frequencies.append(catalog.frequencies[name])
+    if not frequencies:
+        return [], {"error": "Provide at least one value in 'frequencies' or 'frequency_names'"}
+    if len(frequencies) > MAX_SYNTH_PARTIALS:
+        return [], {"error": f"At most {MAX_SYNTH_PARTIALS} frequencies can be rendered at once, got {len(frequencies)}"}
+    return frequencies, None
+
+
+@register_tool(
+    "synthesize_audio",
+    "Render a set of frequencies (e.g. a generator result or well-tone names) as additive sine audio "
+    "to a WAV/raw PCM file or inline base64 chunks",
+    {
+        "type": "object",
+        "properties": {
+            "frequencies": {
+                "type": "array",
+                "items": {"type": "number", "minimum": 0},
+                "maxItems": MAX_SYNTH_PARTIALS,
+                "description": "Frequencies in Hz, e.g. the frequency_matrix from generate_custom_frequency_matrix"
+            },
+            "frequency_names": {
+                "type": "array",
+                "items": {"type": "string"},
+                "maxItems": MAX_SYNTH_PARTIALS,
+                "description": "Well-tone frequency names to include (e.g. solfeggio_528)"
+            },
+            "amplitudes": {
+                "type": "array",
+                "items": {"type": "number", "minimum": 0},
+                "maxItems": MAX_SYNTH_PARTIALS,
+                "description": "Relative amplitude per frequency, names last (default: equal)"
+            },
+            "duration_seconds": {
+                "type": "number",
+                "minimum": 0.01,
+                "maximum": 14400,
+                "description": "Duration of the render in seconds (default: 10); WAV files hold at most 4 GiB "
+                               "of audio, about 3.1 hours of mono at 192000 Hz, so use format 'pcm' beyond that",
+                "default": 10
+            },
+            "sample_rate": {
+                "type": "integer",
+                "minimum": 8000,
+                "maximum": 192000,
+                "description": "Sample rate in Hz (default: 44100)",
+                "default": DEFAULT_SAMPLE_RATE
+            },
+            "format": {
+                "type": "string",
+                "enum": ["wav", "pcm"],
+                "description": "wav, or raw 16-bit little-endian PCM (default: wav)",
+                "default": "wav"
+            },
+            "output_path": {
+                "type": "string",
+                "description": "File to write; if omitted the audio is returned as base64 chunks "
+                               f"(limited to {MAX_INLINE_AUDIO_SECONDS} seconds)"
+            },
+            "volume": {
+                "type": "number",
+                "minimum": 0,
+                "maximum": 1,
+                "description": "Peak level of the mix (default: 0.8)",
+                "default": 0.8
+            },
+            "fade_seconds": {
+                "type": "number",
+                "minimum": 0,
+                "description": "Linear fade-in/fade-out length in seconds (default: 0.05)",
+                "default": 0.05
+            }
+        }
+    },
+    cost=lambda args: args.get("duration_seconds", 10) * args.get("sample_rate", DEFAULT_SAMPLE_RATE) * max(
+        len(args.get("frequencies", [])) + len(args.get("frequency_names", [])), 1
+    ),
+    path_arguments=["output_path"],
+)
+def _tool_synthesize_audio(arguments: dict[str, Any]) -> dict[str, Any]:
+    frequencies, error = _resolve_frequencies(arguments)
+    if error:
+        return error
+    amplitudes = arguments.get("amplitudes", [1.0] * len(frequencies))
+    if len(amplitudes) != len(frequencies):
+        return {"error": f"Expected {len(frequencies)} amplitudes, got {len(amplitudes)}"}
+
+    duration = arguments.get("duration_seconds", 10)
+    output_path = arguments.get("output_path")
+    if not output_path and duration > MAX_INLINE_AUDIO_SECONDS:
+        return {"error": f"Inline audio is limited to {MAX_INLINE_AUDIO_SECONDS} seconds; set 'output_path' for longer renders"}
+
+    sample_rate = arguments.get("sample_rate", DEFAULT_SAMPLE_RATE)
+    container = arguments.get("format", "wav")
+    nyquist = sample_rate / 2
+    audible = [(f, a) for f, a in zip(frequencies, amplitudes) if f < nyquist]
+    dropped = [f for f in frequencies if f >= nyquist]
+    weight = sum(a for _, a in audible)
+    scale = arguments.get("volume", 0.8) / weight if weight > 0 else 0.0
+
+    total_frames = int(round(duration * sample_rate))
+    if container == "wav":
+        check_wav_size(total_frames, sample_rate, 1)
+    blocks = render_additive_blocks(
+        [f for f, _ in audible],
+        [a * scale for _, a in audible],
+        total_frames,
+        sample_rate,
+        fade_frames=int(arguments.get("fade_seconds", 0.05) * sample_rate),
+    )
+    result = write_audio_output(
+        encode_audio_stream(blocks, total_frames, sample_rate, 1, container),
+        output_path,
+    )
+    return {
+        "frequencies": [f for f, _ in audible],
+        "dropped_above_nyquist": dropped,
+        "format": container,
+        "sample_rate": sample_rate,
+        "channels": 1,
+        "frames": total_frames,
+        "duration_seconds": total_frames / sample_rate,
+        "realtime_factor": (total_frames / sample_rate) / max(result["render_seconds"], 1e-9),
+        **result
+    }
+
+
+@register_tool(
+    "generate_binaural_beat",
+    "Render a stereo binaural or isochronic beat: a carrier tone (e.g. solfeggio_528) with a beat "
+    "frequency from a brainwave band or Schumann resonance (e.g. theta, earth_7_83)",
+    {
+        "type": "object",
+        "properties": {
+            "carrier_name": {
+                "type": "string",
+                "description": "Well-tone frequency name to use as the carrier (default: solfeggio_528)"
+            },
+            "carrier_frequency": {
+                "type": "number",
+                "minimum": 20,
+                "description": "Carrier frequency in Hz (overrides carrier_name)"
+            },
+            "beat_name": {
+                "type": "string",
+                "enum": BEAT_FREQUENCY_NAMES,
+                "description": "Brainwave band or Schumann resonance to use as the beat (default: theta)"
+            },
+            "beat_frequency": {
+                "type": "number",
+                "minimum": 0.1,
+                "maximum": 100,
+                "description": "Beat frequency in Hz (overrides beat_name)"
+            },
+            "mode": {
+                "type": "string",
+                "enum": ["binaural", "isochronic"],
+                "description": "binaural (carrier left, carrier + beat right) or isochronic "
+                               "(carrier pulsed at the beat rate) (default: binaural)",
+                "default": "binaural"
+            },
+            "duty_cycle": {
+                "type": "number",
+                "minimum": 0.05,
+                "maximum": 0.95,
+                "description": "Fraction of each isochronic pulse period that is on (default: 0.5)",
+                "default": 0.5
+            },
+            "duration_seconds": {
+                "type": "number",
+                "minimum": 0.01,
+                "maximum": 43200,
+                "description": "Duration of the render in seconds (default: 10); WAV files hold at most 4 GiB "
+                               "of audio, about 6.7 hours of stereo at 44100 Hz, so use format 'pcm' beyond that",
+                "default": 10
+            },
+            "sample_rate": {
+                "type": "integer",
+                "minimum": 8000,
+                "maximum": 192000,
+                "description": "Sample rate in Hz (default: 44100)",
+                "default": DEFAULT_SAMPLE_RATE
+            },
+            "format": {
+                "type": "string",
+                "enum": ["wav", "pcm"],
+                "description": "wav, or raw interleaved 16-bit little-endian PCM (default: wav)",
+                "default": "wav"
+            },
+            "output_path": {
+                "type": "string",
+                "description": "File to write; if omitted the audio is returned as base64 chunks "
+                               f"(limited to {MAX_INLINE_AUDIO_SECONDS} seconds)"
+            },
+            "volume": {
+                "type": "number",
+                "minimum": 0,
+                "maximum": 1,
+                "description": "Peak level per channel (default: 0.8)",
+                "default": 0.8
+            },
+            "fade_seconds": {
+                "type": "number",
+                "minimum": 0,
+                "description": "Fade-in/fade-out length in seconds (default: 2)",
+                "default": 2
+            }
+        }
+    },
+    cost=lambda args: 2 * args.get("duration_seconds", 10) * args.get("sample_rate", DEFAULT_SAMPLE_RATE),
+    path_arguments=["output_path"],
+)
+def _tool_generate_binaural_beat(arguments: dict[str, Any]) -> dict[str, Any]:
+    carrier_name = arguments.get("carrier_name", "solfeggio_528")
+    catalog = tone_catalog()
+    if "carrier_frequency" in arguments:
+        carrier = arguments["carrier_frequency"]
+    elif carrier_name in catalog:
+        carrier = catalog.frequencies[carrier_name]
+    else:
+        return catalog.not_found(carrier_name)
+    beat_name = arguments.get("beat_name", "theta")
+    # Beat bands fall back to the built-in values for catalogs without them
+    beat = arguments.get("beat_frequency", catalog.frequencies.get(beat_name, WELL_TONE_FREQUENCIES[beat_name]))
+
+    duration = arguments.get("duration_seconds", 10)
+    output_path = arguments.get("output_path")
+    if not output_path and duration > MAX_INLINE_AUDIO_SECONDS:
+        return {"error": f"Inline audio is limited to {MAX_INLINE_AUDIO_SECONDS} seconds; set 'output_path' for longer renders"}
+
+    sample_rate = arguments.get("sample_rate", DEFAULT_SAMPLE_RATE)
+    if carrier + beat >= sample_rate / 2:
+        return {"error": f"Carrier plus beat ({carrier + beat} Hz) must be below Nyquist ({sample_rate / 2} Hz)"}
+
+    mode = arguments.get("mode", "binaural")
+    container = arguments.get("format", "wav")
+    total_frames = int(round(duration * sample_rate))
+    if container == "wav":
+        check_wav_size(total_frames, sample_rate, 2)
+    blocks = render_beat_blocks(
+        carrier,
+        beat,
+        mode,
+        total_frames,
+        sample_rate,
+        fade_frames=int(arguments.get("fade_seconds", 2) * sample_rate),
+        volume=arguments.get("volume", 0.8),
+        duty_cycle=arguments.get("duty_cycle", 0.5),
+    )
+    result = write_audio_output(
+        encode_audio_stream(blocks, total_frames, sample_rate, 2, container),
+        output_path,
+    )
+    return {
+        "mode": mode,
+        "carrier_frequency": carrier,
+        "beat_frequency": beat,
+        "channel_frequencies": [carrier, carrier + beat] if mode == "binaural" else [carrier, carrier],
+        "format": container,
+        "sample_rate": sample_rate,
+        "channels": 2,
+        "frames": total_frames,
+        "duration_seconds": total_frames / sample_rate,
+        "realtime_factor": (total_frames / sample_rate) / max(result["render_seconds"], 1e-9),
+        **result
+    }
+
+
+SESSION_SEGMENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "label": {
+            "type": "string",
+            "description": "Name for the segment, echoed in the result"
+        },
+        "frequencies": {
+            "type": "array",
+            "items": {"type": "number", "minimum": 0},
+            "maxItems": MAX_SYNTH_PARTIALS,
+            "description": "Frequencies in Hz"
+        },
+        "frequency_names": {
+            "type": "array",
+            "items": {"type": "string"},
+            "maxItems": MAX_SYNTH_PARTIALS,
+            "description": "Well-tone frequency names to include (e.g. chakra_heart)"
+        },
+        "amplitudes": {
+            "type": "array",
+            "items": {"type": "number", "minimum": 0},
+            "maxItems": MAX_SYNTH_PARTIALS,
+            "description": "Relative amplitude per frequency, names last (default: equal)"
+        },
+        "duration_seconds": {
+            "type": "number",
+            "minimum": 0.01,
+            "maximum": MAX_SESSION_SECONDS,
+            "description": "Length of the segment in seconds, measured between crossfade midpoints"
+        },
+        "crossfade_seconds": {
+            "type": "number",
+            "minimum": 0,
+            "description": "Crossfade into the next segment, centred on the boundary "
+                           "(default: the session's crossfade_seconds)"
+        }
+    },
+    "required": ["duration_seconds"]
+}
+
+
+def _session_cost(arguments: dict[str, Any]) -> float:
+    return arguments.get("sample_rate", DEFAULT_SAMPLE_RATE) * sum(
+        segment.get("duration_seconds", 0) * max(
+            len(segment.get("frequencies", [])) + len(segment.get("frequency_names", [])), 1
+        )
+        for segment in arguments.get("segments", [])
+    )
+
+
+@register_tool(
+    "render_session",
+    "Render a timed session to a WAV/raw PCM file: a timeline of tone sets (e.g. chakra_base through "
+    "chakra_crown, 5 minutes each) crossfaded into one another. Segments are cached by content, so a "
+    "re-render only synthesizes the segments that changed; progress notifications are sent while rendering",
+    {
+        "type": "object",
+        "properties": {
+            "segments": {
+                "type": "array",
+                "items": SESSION_SEGMENT_SCHEMA,
+                "minItems": 1,
+                "maxItems": MAX_SESSION_SEGMENTS,
+                "description": "The timeline, in playing order"
+            },
+            "output_path": {
+                "type": "string",
+                "description": "File to write the session to"
+            },
+            "crossfade_seconds": {
+                "type": "number",
+                "minimum": 0,
+                "description": f"Default crossfade between segments in seconds (default: {DEFAULT_CROSSFADE_SECONDS:g})",
+                "default": DEFAULT_CROSSFADE_SECONDS
+            },
+            "fade_seconds": {
+                "type": "number",
+                "minimum": 0,
+                "description": "Fade-in at the start and fade-out at the end of the session in seconds (default: 2)",
+                "default": 2
+            },
+            "sample_rate": {
+                "type": "integer",
+                "minimum": 8000,
+                "maximum": 192000,
+                "description": "Sample rate in Hz (default: 44100)",
+                "default": DEFAULT_SAMPLE_RATE
+            },
+            "format": {
+                "type": "string",
+                "enum": ["wav", "pcm"],
+                "description": "wav, or raw 16-bit little-endian PCM (default: wav)",
+                "default": "wav"
+            },
+            "volume": {
+                "type": "number",
+                "minimum": 0,
+                "maximum": 1,
+                "description": "Peak level of each segment's mix (default: 0.8)",
+                "default": 0.8
+            },
+            "cache_dir": {
+                "type": "string",
+                "description": "Directory for cached segment files "
+                               "(default: SOUND_HEALING_SESSION_CACHE or a directory under the system temp dir)"
+            }
+        },
+        "required": ["segments", "output_path"]
+    },
+    cost=_session_cost,
+    path_arguments=["output_path", "cache_dir"],
+)
+def _tool_render_session(arguments: dict[str, Any]) -> dict[str, Any]:
+    entries = arguments["segments"]
+    sample_rate = arguments.get("sample_rate", DEFAULT_SAMPLE_RATE)
+    nyquist = sample_rate / 2
+    volume = arguments.get("volume", 0.8)
+
+    tones = []
+    for index, entry in enumerate(entries):
+        frequencies, error = _resolve_frequencies(entry)
+        if error:
+            return {**error, "segment": index}
+        amplitudes = entry.get("amplitudes", [1.0] * len(frequencies))
+        if len(amplitudes) != len(frequencies):
+            return {"error": f"Segment {index}: expected {len(frequencies)} amplitudes, got {len(amplitudes)}"}
+        audible = [(f, a) for f, a in zip(frequencies, amplitudes) if f < nyquist]
+        weight = sum(a for _, a in audible)
+        scale = volume / weight if weight > 0 else 0.0
+        tones.append((
+            tuple(f for f, _ in audible),
+            tuple(a * scale for _, a in audible),
+            [f for f in frequencies if f >= nyquist]
+        ))
+
+    # Boundaries from the running total in seconds, so rounding never drifts
+    boundaries = [0]
+    elapsed = 0.0
+    for entry in entries:
+        elapsed += entry["duration_seconds"]
+        boundaries.append(int(round(elapsed * sample_rate)))
+    if elapsed > MAX_SESSION_SECONDS:
+        return {"error": f"Session is {elapsed:g} seconds; the limit is {MAX_SESSION_SECONDS} seconds"}
+    total_frames = boundaries[-1]
+    container = arguments.get("format", "wav")
+    if container == "wav":
+        # Before any segment is synthesized into the cache
+        check_wav_size(total_frames, sample_rate, 1)
+    default_crossfade = arguments.get("crossfade_seconds", DEFAULT_CROSSFADE_SECONDS)
+    crossfades = [
+        int(round(entry.get("crossfade_seconds", default_crossfade) * sample_rate)) for entry in entries[:-1]
+    ] + [0]
+    fade_frames = int(arguments.get("fade_seconds", 2) * sample_rate)
+
+    segments = []
+    for index, (frequencies, amplitudes, _) in enumerate(tones):
+        into = crossfades[index - 1] if index else 0
+        out = crossfades[index]
+        start = boundaries[index] - into // 2
+        end = boundaries[index + 1] - out // 2 + out
+        if boundaries[index + 1] - out // 2 < start + into:
+            return {
+                "error": f"Segment {index}: crossfades of {into / sample_rate:g} s in and {out / sample_rate:g} s out "
+                         f"do not fit in its {entries[index]['duration_seconds']:g} seconds"
+            }
+        segments.append(SessionSegment(
+            frequencies=frequencies,
+            amplitudes=amplitudes,
+            sample_rate=sample_rate,
+            start=start,
+            frames=end - start,
+            fade_in=("fade", min(fade_frames, end - start)) if index == 0 else ("crossfade", into),
+            fade_out=("fade", min(fade_frames, end - start)) if index == len(entries) - 1 else ("crossfade", out),
+        ))
+
+    cache_dir = session_cache_dir(arguments.get("cache_dir"))
+    paths = [os.path.join(cache_dir, f"{segment.digest()}.pcm") for segment in segments]
+    stale = [
+        index for index, (segment, path) in enumerate(zip(segments, paths))
+        if not (os.path.exists(path) and os.path.getsize(path) == segment.frames * PCM_SAMPLE_WIDTH)
+    ]
+
+    # Progress counts frames synthesized for stale segments plus frames assembled
+    work = sum(segments[index].frames for index in stale) + total_frames
+    done = 0
+
+    def advance(frames: int) -> None:
+        nonlocal done
+        done += frames
+        report_progress(done, work)
+
+    started = time.perf_counter()
+    for index in stale:
+        write_segment_file(segments[index], paths[index], advance)
+    synthesis_seconds = time.perf_counter() - started
+    for index, path in enumerate(paths):
+        if index not in stale:
+            # Keep reused segments recent for anyone pruning the cache by age
+            os.utime(path)
+
+    header = [wav_header(total_frames, sample_rate, 1)] if container == "wav" else []
+    result = write_audio_output(
+        chain(header, mix_segment_files(segments, paths, total_frames, advance)),
+        arguments["output_path"],
+    )
+    render_seconds = time.perf_counter() - started
+    return {
+        "segments": [
+            {
+                "index": index,
+                **({"label": entry["label"]} if "label" in entry else {}),
+                "start_seconds": boundaries[index] / sample_rate,
+                "duration_seconds": (boundaries[index + 1] - boundaries[index]) / sample_rate,
+                "crossfade_seconds": crossfades[index] / sample_rate,
+                "frequencies": list(frequencies),
+                "dropped_above_nyquist": dropped,
+                "cached": index not in stale
+            }
+            for index, (entry, (frequencies, _, dropped)) in enumerate(zip(entries, tones))
+        ],
+        "segments_rendered": len(stale),
+        "segments_reused": len(segments) - len(stale),
+        "cache_dir": os.path.abspath(cache_dir),
+        "format": container,
+        "sample_rate": sample_rate,
+        "channels": 1,
+        "frames": total_frames,
+        "duration_seconds": total_frames / sample_rate,
+        "output_path": result["output_path"],
+        "bytes": result["bytes"],
+        "synthesis_seconds": synthesis_seconds,
+        "render_seconds": render_seconds,
+        "realtime_factor": (total_frames / sample_rate) / max(render_seconds, 1e-9)
+    }
+
+
+def _path_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _match_catalog_harmonics(
+    peaks: Sequence[float],
+    harmonics: int,
+    tolerance_cents: float,
+) -> tuple[ToneIndex, list[Optional[tuple[int, int, float]]]]:
+    """Nearest catalog tone harmonic to each peak as (tone, harmonic, cents), or None beyond the tolerance."""
+    index = well_tone_index()
+    if not peaks or not len(index):
+        return index, [None] * len(peaks)
+    # Row t holds calculate_harmonic_series(tone t, harmonics), all tones in one broadcast
+    table = batch_harmonic_series(index.frequencies, harmonics)
+    tones = np.repeat(np.arange(len(index)), harmonics)
+    numbers = np.tile(np.arange(1, harmonics + 1), len(index))
+    # Where tones share a harmonic (264 x 2 and 528 x 1), keep the lowest harmonic number
+    order = np.lexsort((numbers, table.ravel()))
+    values, first = np.unique(table.ravel()[order], return_index=True)
+    tones, numbers = tones[order][first], numbers[order][first]
+
+    keys = np.log2(values)
+    targets = np.log2(np.asarray(peaks, dtype=np.float64))
+    upper = np.clip(np.searchsorted(keys, targets), 0, len(keys) - 1)
+    lower = np.maximum(upper - 1, 0)
+    nearest = np.where(np.abs(targets - keys[lower]) <= np.abs(keys[upper] - targets), lower, upper)
+    cents = 1200.0 * (targets - keys[nearest])
+    return index, [
+        (tone, number, offset) if abs(offset) <= tolerance_cents else None
+        for tone, number, offset in zip(tones[nearest].tolist(), numbers[nearest].tolist(), cents.tolist())
+    ]
+
+
+@register_tool(
+    "analyze_audio_spectrum",
+    "Analyze a WAV or raw PCM recording (e.g. a singing bowl or tuning fork) with a Welch-averaged FFT, "
+    "find its spectral peaks and match them to well-tone frequencies and their harmonics",
+    {
+        "type": "object",
+        "properties": {
+            "input_path": {
+                "type": "string",
+                "description": "Local WAV or raw PCM file to analyze"
+            },
+            "format": {
+                "type": "string",
+                "enum": ["auto", "wav", "pcm"],
+                "description": "File format; auto treats files starting with a RIFF header as WAV (default: auto)",
+                "default": "auto"
+            },
+            "sample_rate": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Sample rate of raw PCM input in Hz (default: 44100)",
+                "default": DEFAULT_SAMPLE_RATE
+            },
+            "channels": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": 64,
+                "description": "Channel count of raw PCM input (default: 1)",
+                "default": 1
+            },
+            "sample_format": {
+                "type": "string",
+                "enum": list(AUDIO_SAMPLE_FORMATS),
+                "description": "Sample encoding of raw PCM input (default: s16le)",
+                "default": "s16le"
+            },
+            "fft_size": {
+                "type": "integer",
+                "minimum": 256,
+                "maximum": 1 << 20,
+                "description": f"Samples per FFT segment; larger gives finer frequency resolution (default: {DEFAULT_FFT_SIZE})",
+                "default": DEFAULT_FFT_SIZE
+            },
+            "overlap": {
+                "type": "number",
+                "minimum": 0,
+                "maximum": 0.95,
+                "description": "Fraction of each segment shared with the next (default: 0.5)",
+                "default": 0.5
+            },
+            "min_frequency": {
+                "type": "number",
+                "minimum": 0,
+                "description": "Lowest peak frequency in Hz to report (default: 20)",
+                "default": 20
+            },
+            "max_frequency": {
+                "type": "number",
+                "minimum": 0,
+                "description": "Highest peak frequency in Hz to report (default: half the sample rate)"
+            },
+            "max_peaks": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": 1000,
+                "description": "Number of strongest peaks to report (default: 20)",
+                "default": 20
+            },
+            "threshold_db": {
+                "type": "number",
+                "minimum": 0,
+                "description": "Only report peaks within this many dB of the strongest (default: 40)",
+                "default": 40
+            },
+            "harmonics": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": 64,
+                "description": "Harmonics of each well-tone to match peaks against (default: 8)",
+                "default": 8
+            },
+            "tolerance_cents": {
+                "type": "number",
+                "minimum": 0,
+                "maximum": 600,
+                "description": "Largest distance in cents for a peak to match a tone (default: 15)",
+                "default": 15
+            },
+            "workers": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": 64,
+                "description": "Processes to split the file's segments across (default: 1)",
+                "default": 1
+            }
+        },
+        "required": ["input_path"]
+    },
+    cost=lambda args: _path_size(args["input_path"]),
+    path_arguments=["input_path"],
+)
+def _tool_analyze_audio_spectrum(arguments: dict[str, Any]) -> dict[str, Any]:
+    path = arguments["input_path"]
+    container = arguments.get("format", "auto")
+    try:
+        if container == "auto":
+            with open(path, "rb") as handle:
+                container = "wav" if handle.read(4) == b"RIFF" else "pcm"
+        if container == "wav":
+            audio = read_wav_format(path)
+        else:
+            audio = raw_pcm_format(
+                path,
+                arguments.get("sample_rate", DEFAULT_SAMPLE_RATE),
+                arguments.get("channels", 1),
+                arguments.get("sample_format", "s16le")
+            )
+    except (OSError, AudioFileError) as exc:
+        raise ToolError(f"Cannot read audio from {path}: {exc}")
+    if audio.frames == 0:
+        raise ToolError(f"{path} contains no audio frames")
+
+    fft_size = arguments.get("fft_size", DEFAULT_FFT_SIZE)
+    started = time.perf_counter()
+    power, segments = welch_spectrum(audio, fft_size, arguments.get("overlap", 0.5), arguments.get("workers", 1))
+    peaks = spectral_peaks(
+        power,
+        audio.sample_rate,
+        fft_size,
+        arguments.get("min_frequency", 20),
+        arguments.get("max_frequency", audio.sample_rate / 2),
+        arguments.get("threshold_db", 40),
+        arguments.get("max_peaks", 20)
+    )
+    index, matches = _match_catalog_harmonics(
+        [frequency for frequency, _ in peaks], arguments.get("harmonics", 8), arguments.get("tolerance_cents", 15)
+    )
+
+    peak_entries = []
+    detected: dict[int, dict[str, Any]] = {}
+    for (frequency, level), match in zip(peaks, matches):
+        entry = {"frequency_hz": frequency, "level_db": level, "match": None}
+        if match is not None:
+            tone, harmonic, cents = match
+            tone_frequency = float(index.frequencies[tone])
+            entry["match"] = {
+                "names": index.names[tone],
+                "tone_frequency_hz": tone_frequency,
+                "harmonic": harmonic,
+                "expected_frequency_hz": tone_frequency * harmonic,
+                "deviation_cents": cents
+            }
+            # Peaks come strongest first, so the first peak of a tone sets its level
+            summary = detected.setdefault(tone, {
+                "names": index.names[tone],
+                "frequency_hz": tone_frequency,
+                "harmonics": [],
+                "strongest_level_db": level
+            })
+            summary["harmonics"].append(harmonic)
+        peak_entries.append(entry)
+
+    return {
+        "input_path": os.path.abspath(path),
+        "format": container,
+        "sample_rate": audio.sample_rate,
+        "channels": audio.channels,
+        "sample_format": audio.sample_format,
+        "duration_seconds": audio.frames / audio.sample_rate,
+        "fft_size": fft_size,
+        "frequency_resolution_hz": audio.sample_rate / fft_size,
+        "segments": segments,
+        "peaks": peak_entries,
+        "detected_tones": [{**tone, "harmonics": sorted(tone["harmonics"])} for tone in detected.values()],
+        "analysis_seconds": time.perf_counter() - started
+    }
+
+
+@register_tool(
+    "cache_stats",
+    "Report response cache and scale table cache statistics (hits, misses, evictions, hit rate)",
+    {
+        "type": "object",
+        "properties": {
+            "clear": {
+                "type": "boolean",
+                "description": "Clear the cached responses and scale tables after reporting (default: false)",
+                "default": False
+            }
+        }
+    },
+)
+def _tool_cache_stats(arguments: dict[str, Any]) -> dict[str, Any]:
+    stats = RESPONSE_CACHE.stats()
+    stats["static_responses"] = [name for name, spec in TOOL_REGISTRY.items() if spec.static_text is not None]
+    stats["scale_tables"] = SCALE_CACHE.stats()
+    if arguments.get("clear", False):
+        RESPONSE_CACHE.clear()
+        SCALE_CACHE.clear()
+        stats["cleared"] = True
+    return stats
+
+
+@register_tool(
+    "server_stats",
+    "Report per-tool call counts, errors, in-flight requests, latency percentiles and response sizes",
+    {
+        "type": "object",
+        "properties": {
+            "include_idle": {
+                "type": "boolean",
+                "description": "Include tools that have not been called yet (default: false)",
+                "default": False
+            },
+            "reset": {
+                "type": "boolean",
+                "description": "Reset the counters after reporting (default: false)",
+                "default": False
+            }
+        }
+    },
+)
+def _tool_server_stats(arguments: dict[str, Any]) -> dict[str, Any]:
+    stats = metrics_snapshot(include_idle=arguments.get("include_idle", False))
+    stats["cache"] = RESPONSE_CACHE.stats()
+    if arguments.get("reset", False):
+        reset_metrics()
+        stats["reset"] = True
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# MCP handlers
+# ---------------------------------------------------------------------------
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List all available tools (built once from the registry and reused)."""
+    global _tool_list_cache
+    if _tool_list_cache is None:
+        _tool_list_cache = [spec.tool for spec in TOOL_REGISTRY.values()]
+    return _tool_list_cache
+
+
+# Input validation is done by the registry's precompiled validators rather
+# than the SDK's per-call jsonschema validation.
+@app.call_tool(validate_input=False)
+async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
+    """Handle tool calls."""
+    global _unknown_tool_calls
+    spec = TOOL_REGISTRY.get(name)
+    if spec is None:
+        _unknown_tool_calls += 1
+        return _text_response(json.dumps({"error": f"Unknown tool: {name}"}))
+
+    metrics = TOOL_METRICS[name]
+    started = time.perf_counter()
+    metrics.in_flight += 1
+    try:
+        text, succeeded, cache_hit = await _dispatch(name, spec, arguments)
+    except Exception:
+        # Unexpected failures propagate to the MCP layer, but still count as failed calls
+        metrics.record(time.perf_counter() - started, 0, False, False)
+        raise
+    finally:
+        metrics.in_flight -= 1
+    # len() counts characters; responses are ASCII-escaped JSON, so this is the byte size
+    metrics.record(time.perf_counter() - started, len(text), succeeded, cache_hit)
+    return _text_response(text)
+
+
+# Over stdio the caller is the local user, so tools may read and write any
+# path they can. A server shared over HTTP confines every path argument to
+# one directory, or rejects them all when no directory is configured.
+_paths_confined = False
+_path_root: Optional[str] = None
+
+
+def confine_tool_paths(root: Optional[str]) -> None:
+    """Restrict path arguments to ``root`` (resolved), or refuse them if ``root`` is None."""
+    global _paths_confined, _path_root
+    _paths_confined = True
+    _path_root = os.path.realpath(root) if root else None
+
+
+def _confined_arguments(spec: ToolSpec, arguments: dict[str, Any]) -> dict[str, Any]:
+    """``arguments`` with each path resolved inside the configured root; ToolError outside it."""
+    if not _paths_confined or not any(name in arguments for name in spec.path_arguments):
+        return arguments
+    confined = dict(arguments)
+    for name in spec.path_arguments:
+        if name not in arguments:
+            continue
+        if _path_root is None:
+            raise ToolError(
+                f"'{name}' is disabled on this server; set SOUND_HEALING_HTTP_ROOT to allow files under one directory"
+            )
+        # Relative paths are taken from the root; symlinks are resolved before the check
+        path = os.path.realpath(os.path.join(_path_root, arguments[name]))
+        if os.path.commonpath([path, _path_root]) != _path_root:
+            raise ToolError(f"'{name}' must be inside {_path_root}", root=_path_root)
+        confined[name] = path
+    return confined
+
+
+async def _dispatch(name: str, spec: ToolSpec, arguments: Optional[dict[str, Any]]) -> tuple[str, bool, bool]:
+    """Produce the response text of a call: (text, succeeded, served_from_cache)."""
+    if spec.static_text is not None:
+        return spec.static_text, True, True
+
+    if arguments is None:
+        arguments = {}
+    if spec.cacheable:
+        key = _cache_key(name, arguments, spec.defaults)
+        text = RESPONSE_CACHE.get(key)
+        if text is not None:
+            return text, True, True
+
+    error = spec.validate(arguments)
+    if error:
+        return json.dumps({
+            "error": f"Invalid arguments for tool '{name}': {error}"
+        }, indent=2), False, False
+    try:
+        arguments = _confined_arguments(spec, arguments)
+    except ToolError as exc:
+        return json.dumps(exc.payload, indent=2), False, False
+
+    if spec.cost is not None and spec.cost(arguments) >= OFFLOAD_THRESHOLD:
+        text, succeeded = await _execute_offloaded(name, arguments, _progress_notifier())
+    else:
+        text, succeeded = _execute_tool(name, arguments)
+    if succeeded and spec.cacheable:
+        RESPONSE_CACHE.put(key, text)
+    return text, succeeded, False
+
+
+def _progress_notifier() -> Optional[Callable[[float, float], Awaitable[None]]]:
+    """Send progress notifications for the current request, if its client asked for them."""
+    try:
+        context = app.request_context
+    except LookupError:
+        return None
+    token = context.meta.progressToken if context.meta is not None else None
+    if token is None:
+        return None
+    return partial(
+        context.session.send_progress_notification,
+        token,
+        related_request_id=str(context.request_id)
+    )
+
+
+# ---------------------------------------------------------------------------
+# MCP resources
+#
+# The catalog and the precomputed family tables are published as resources
+# with stable sound-healing:// URIs, so clients can keep a local copy
+# instead of calling list_all_well_tones again. The catalog resources are
+# the static tools' prebuilt response text; the tables are built once per
+# catalog (from the mapped family tables when SOUND_HEALING_TABLES is set).
+# Resource templates such as sound-healing://harmonics/{base}/{count} are
+# served by the matching tool through _dispatch, so they share its
+# validation and response cache entries.
+#
+# Every listing and read carries an "etag" (content hash) in _meta. A read
+# whose request _meta has an "if_none_match" equal to the current etag is
+# answered with empty content and "not_modified": true. Subscribers of a
+# URI are sent resources/updated when a catalog reload changes its etag.
+# ---------------------------------------------------------------------------
+
+RESOURCE_SCHEME = "sound-healing://"
+RESOURCE_MIME_TYPE = "application/json"
+RESOURCE_NOT_FOUND = -32002  # JSON-RPC error code the MCP spec assigns to unknown resources
+
+
+@dataclass(frozen=True)
+class ResourceBlob:
+    """Serialized resource content and its etag."""
+    text: str
+    etag: str
+
+    @classmethod
+    def from_text(cls, text: str) -> "ResourceBlob":
+        return cls(text, hashlib.sha256(text.encode("utf-8")).hexdigest()[:16])
+
+
+def _family_table_text(family: str) -> str:
+    """One family's values for every catalog tone, as compact JSON."""
+    catalog = tone_catalog()
+    tables = family_tables()
+    width = tables.families[family][1] if tables is not None and family in tables.families else DEFAULT_TABLE_WIDTH
+    rows = {}
+    for name in catalog.names:
+        base = float(catalog.frequencies[name])
+        rows[name] = list(islice(family_source(name, base, family, width)(0), width))
+    return json.dumps({"family": family, "width": width, "tones": rows}, separators=(",", ":"))
+
+
+# path -> (title, description, builder of the response text)
+STATIC_RESOURCES: dict[str, tuple[str, str, Callable[[], str]]] = {
+    "catalog": (
+        "Well-tone catalog",
+        "Every tone in the catalog with its frequency, as returned by list_all_well_tones",
+        lambda: TOOL_REGISTRY["list_all_well_tones"].static_text,
+    ),
+    "catalog/chakras": (
+        "Chakra frequencies",
+        "The chakra tones, as returned by get_chakra_frequencies",
+        lambda: TOOL_REGISTRY["get_chakra_frequencies"].static_text,
+    ),
+    **{
+        f"tables/{family}": (
+            f"{family} table",
+            f"The first values of the {family} family of every catalog tone, keyed by tone name",
+            partial(_family_table_text, family),
+        )
+        for family in TABLE_FAMILIES
+    },
+}
+
+# template family -> (tool, count argument)
+RESOURCE_TEMPLATES = {
+    "harmonics": ("calculate_harmonic_series", "harmonics_count"),
+    "phi_spiral": ("generate_phi_spiral_frequencies", "count"),
+    "resonance_cascade": ("calculate_resonance_cascade", "steps"),
+}
+
+_resource_blobs: dict[str, ResourceBlob] = {}
+_subscriptions: dict[str, "weakref.WeakSet[Any]"] = {}
+_subscribed_etags: dict[str, str] = {}
+
+
+def _resource_error(code: int, message: str) -> McpError:
+    return McpError(ErrorData(code=code, message=message))
+
+
+def _template_arguments(path: str) -> tuple[str, dict[str, Any]]:
+    """Tool name and arguments for a templated path such as ``harmonics/528/10``."""
+    parts = path.split("/")
+    if len(parts) != 3 or parts[0] not in RESOURCE_TEMPLATES:
+        raise _resource_error(RESOURCE_NOT_FOUND, f"Unknown resource: {RESOURCE_SCHEME}{path}")
+    family, base_text, count_text = parts
+    tool, count_key = RESOURCE_TEMPLATES[family]
+    base_text = unquote(base_text)
+    try:
+        base: Any = float(base_text)
+    except ValueError:
+        arguments: dict[str, Any] = {"frequency_name": base_text}
+    else:
+        if not math.isfinite(base):
+            raise _resource_error(INVALID_PARAMS, f"Base frequency must be finite, got '{base_text}'")
+        arguments = {"base_frequency": base}
+    try:
+        count = int(count_text)
+    except ValueError:
+        raise _resource_error(INVALID_PARAMS, f"Count must be an integer, got '{count_text}'") from None
+    # Resources cannot be paged, so a template serves at most one page
+    if not 1 <= count <= PAGE_SIZE:
+        raise _resource_error(INVALID_PARAMS, f"Count must be between 1 and {PAGE_SIZE}, got {count}")
+    arguments[count_key] = count
+    return tool, arguments
+
+
+async def resource_blob(uri: str) -> ResourceBlob:
+    """The current content of a resource URI; raises McpError for unknown or invalid URIs."""
+    if not uri.startswith(RESOURCE_SCHEME):
+        raise _resource_error(RESOURCE_NOT_FOUND, f"Unknown resource: {uri}")
+    path = uri[len(RESOURCE_SCHEME):].strip("/")
+    if path in STATIC_RESOURCES:
+        blob = _resource_blobs.get(path)
+        if blob is None:
+            blob = _resource_blobs[path] = ResourceBlob.from_text(STATIC_RESOURCES[path][2]())
+        return blob
+
+    name, arguments = _template_arguments(path)
+    text, succeeded, _ = await _dispatch(name, TOOL_REGISTRY[name], arguments)
+    if not succeeded:
+        raise _resource_error(INVALID_PARAMS, json.loads(text).get("error", text))
+    return ResourceBlob.from_text(text)
+
+
+def invalidate_resources() -> None:
+    """Drop the built static resources (after a catalog reload)."""
+    _resource_blobs.clear()
+
+
+async def notify_resource_updates() -> None:
+    """Send resources/updated to the subscribers of every URI whose etag changed."""
+    for uri, sessions in list(_subscriptions.items()):
+        if not sessions:
+            del _subscriptions[uri]
+            _subscribed_etags.pop(uri, None)
+            continue
+        try:
+            etag = (await resource_blob(uri)).etag
+        except McpError:
+            etag = ""  # a tone removed by the reload: the resource now reads as an error
+        if etag == _subscribed_etags.get(uri):
+            continue
+        _subscribed_etags[uri] = etag
+        for session in list(sessions):
+            try:
+                await session.send_resource_updated(AnyUrl(uri))
+            except Exception:
+                sessions.discard(session)
+
+
+@app.list_resources()
+async def list_resources() -> list[Resource]:
+    """List the static resources with their current size and etag."""
+    resources = []
+    for path, (title, description, _) in STATIC_RESOURCES.items():
+        blob = await resource_blob(RESOURCE_SCHEME + path)
+        resources.append(Resource(
+            uri=RESOURCE_SCHEME + path,
+            name=path,
+            title=title,
+            description=description,
+            mimeType=RESOURCE_MIME_TYPE,
+            size=len(blob.text),
+            _meta={"etag": blob.etag},
+        ))
+    return resources
+
+
+@app.list_resource_templates()
+async def list_resource_templates() -> list[ResourceTemplate]:
+    return [
+        ResourceTemplate(
+            uriTemplate=f"{RESOURCE_SCHEME}{family}/{{base}}/{{count}}",
+            name=family,
+            description=f"The response of {tool} for a base frequency in Hz or a catalog tone name, "
+                        f"with {count_key} set to count (at most {PAGE_SIZE})",
+            mimeType=RESOURCE_MIME_TYPE,
+        )
+        for family, (tool, count_key) in RESOURCE_TEMPLATES.items()
+    ]
+
+
+@app.read_resource()
+async def read_resource(uri: AnyUrl) -> list[ReadResourceContents]:
+    """Serve a resource, or just its etag when the client already has this version."""
+    blob = await resource_blob(str(uri))
+    meta = app.request_context.meta
+    if meta is not None and (meta.model_extra or {}).get("if_none_match") == blob.etag:
+        return [ReadResourceContents("", RESOURCE_MIME_TYPE, {"etag": blob.etag, "not_modified": True})]
+    return [ReadResourceContents(blob.text, RESOURCE_MIME_TYPE, {"etag": blob.etag})]
+
+
+@app.subscribe_resource()
+async def subscribe_resource(uri: AnyUrl) -> None:
+    key = str(uri)
+    blob = await resource_blob(key)
+    _subscribed_etags.setdefault(key, blob.etag)
+    _subscriptions.setdefault(key, weakref.WeakSet()).add(app.request_context.session)
+
+
+@app.unsubscribe_resource()
+async def unsubscribe_resource(uri: AnyUrl) -> None:
+    sessions = _subscriptions.get(str(uri))
+    if sessions is not None:
+        sessions.discard(app.request_context.session)
+
+
+def create_initialization_options() -> InitializationOptions:
+    """Initialization options shared by every transport."""
+    return InitializationOptions(
+        server_name="sound-healing-mcp",
+        server_version="1.0.0",
+        capabilities=app.get_capabilities(NotificationOptions(), {}).model_copy(
+            # get_capabilities() never advertises subscriptions, which the resource handlers support
+            update={"resources": ResourcesCapability(subscribe=True, listChanged=False)}
+        )
+    )
+
+
+def start_background_tasks() -> list[asyncio.Task]:
+    """Start the stats writer and catalog watcher configured by the environment."""
+    tasks = []
+    if STATS_FILE:
+        print(f"Writing stats to {STATS_FILE} every {STATS_INTERVAL_SECONDS:g}s", file=sys.stderr)
+        tasks.append(asyncio.create_task(dump_metrics_periodically(STATS_FILE, STATS_INTERVAL_SECONDS)))
+    if CATALOG_PATH:
+        print(f"Catalog: {CATALOG_PATH} ({len(tone_catalog())} tones, reloaded on change)", file=sys.stderr)
+        tasks.append(asyncio.create_task(watch_catalog(CATALOG_CHECK_INTERVAL_SECONDS)))
+    return tasks
+
+
+def stop_background_tasks(tasks: list[asyncio.Task], wait: bool = False) -> None:
+    """Cancel the background tasks, write a final stats line and stop the worker pool."""
+    for task in tasks:
+        task.cancel()
+    if STATS_FILE:
+        write_metrics_line(STATS_FILE)
+    shutdown_executor(wait)
+
+
+async def main():
+    """Run the MCP server."""
+    # Write to stderr so it doesn't interfere with stdio communication
+    print("Sound Healing MCP Server starting...", file=sys.stderr)
+    print("Server name: sound-healing-mcp", file=sys.stderr)
+    print("Version: 1.0.0", file=sys.stderr)
+    print("Communication: stdio (standard input/output)", file=sys.stderr)
+    print("Ready for MCP client connections...", file=sys.stderr)
+    print("(Note: use --http to serve streamable HTTP instead of stdio)", file=sys.stderr)
+
+    tasks = start_background_tasks()
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(read_stream, write_stream, create_initialization_options())
+    finally:
+        stop_background_tasks(tasks)
+
+
+# ---------------------------------------------------------------------------
+# HTTP transport
+#
+# `python server.py --http` serves MCP over streamable HTTP (responses and
+# progress notifications as SSE) at /mcp, with GET /health for readiness
+# checks. With --workers N, uvicorn runs N processes on one listening
+# socket. The parent builds the family tables into a temporary file first,
+# unless SOUND_HEALING_TABLES is already set, and every worker maps that
+# file, so the precomputed rows are one shared set of read-only pages.
+# Since a request may land on any worker, the session manager runs
+# stateless: each POST is self-contained, responses and progress are
+# streamed on that POST, and there is no session or GET stream to keep.
+# Resource subscriptions therefore need the stdio transport. Response
+# caches and statistics are per worker. Tools that read or write files
+# only accept paths under SOUND_HEALING_HTTP_ROOT (--root), and refuse
+# them entirely when it is unset.
+#
+# Each worker admits at most SOUND_HEALING_HTTP_MAX_CONCURRENCY POSTs
+# (MCP requests) at once. Up to SOUND_HEALING_HTTP_BACKLOG more wait for a
+# slot, which holds their connections open and so pushes back on the
+# client. Anything beyond that is refused with 503 and Retry-After. On
+# SIGINT/SIGTERM uvicorn stops accepting connections and waits up to
+# --graceful-timeout seconds for in-flight requests. sse-starlette's
+# default of cutting every SSE response at the signal is turned off, so
+# in-flight calls get to finish. The lifespan then stops the background
+# tasks and the tool worker pool.
+# ---------------------------------------------------------------------------
+
+HTTP_PATH = "/mcp"
+HTTP_MAX_CONCURRENCY = int(os.environ.get("SOUND_HEALING_HTTP_MAX_CONCURRENCY", 32))
+HTTP_BACKLOG = int(os.environ.get("SOUND_HEALING_HTTP_BACKLOG", 128))
+HTTP_ROOT = os.environ.get("SOUND_HEALING_HTTP_ROOT")
+
+
+class ConcurrencyLimit:
+    """ASGI middleware admitting at most ``limit`` POSTs at once, queueing ``backlog`` more."""
+
+    def __init__(self, app: Callable[..., Awaitable[None]], limit: int, backlog: int) -> None:
+        self.app = app
+        self.limit = limit
+        self.backlog = backlog
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._slots = asyncio.Semaphore(limit)
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        if self._slots.locked() and self.waiting >= self.backlog:
+            self.rejected += 1
+            body = json.dumps({"error": "Server busy; retry later"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [(b"content-type", b"application/json"), (b"retry-after", b"1")],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_concurrency": self.limit,
+            "backlog": self.backlog,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected
+        }
+
+
+def create_http_app(
+    max_concurrency: Optional[int] = None,
+    backlog: Optional[int] = None,
+    root: Optional[str] = None,
+) -> Any:
+    """Build the Starlette app serving MCP at HTTP_PATH (the uvicorn factory for --http workers)."""
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from sse_starlette.sse import AppStatus
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    confine_tool_paths(HTTP_ROOT if root is None else root)
+    manager = StreamableHTTPSessionManager(app=app, stateless=True)
+    # uvicorn's graceful timeout decides when in-flight responses are cut, not the signal itself
+    AppStatus.disable_automatic_graceful_drain()
+
+    async def handle_mcp(scope: dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]) -> None:
+        await manager.handle_request(scope, receive, send)
+
+    limited = ConcurrencyLimit(
+        handle_mcp,
+        HTTP_MAX_CONCURRENCY if max_concurrency is None else max_concurrency,
+        HTTP_BACKLOG if backlog is None else backlog,
+    )
+
+    async def health(request: Any) -> Any:
+        return JSONResponse({"status": "ok", "pid": os.getpid(), **limited.stats()})
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_: Any) -> Any:
+        tasks = start_background_tasks()
+        try:
+            async with manager.run():
+                yield
+        finally:
+            # In-flight requests have drained (or timed out) by now, so joining the pool is quick
+            AppStatus.should_exit = True
+            stop_background_tasks(tasks, wait=True)
+
+    return Starlette(
+        routes=[
+            Route(HTTP_PATH, endpoint=limited, methods=["POST"]),
+            Route("/health", endpoint=health, methods=["GET"]),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def http_command(argv: list[str]) -> int:
+    """``server.py --http [--host H] [--port P] [--workers N] ...``: serve MCP over streamable HTTP."""
+    import argparse
+    import shutil
+    import tempfile
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(prog="server.py", description="Serve the MCP server over streamable HTTP.")
+    parser.add_argument("--http", action="store_true", required=True, help="Serve HTTP instead of stdio")
+    parser.add_argument("--host", default=os.environ.get("SOUND_HEALING_HTTP_HOST", "127.0.0.1"),
+                        help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("SOUND_HEALING_HTTP_PORT", 8000)),
+                        help="Port to bind (default: 8000)")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("SOUND_HEALING_HTTP_WORKERS", 1)),
+                        help="Server processes sharing the port (default: 1)")
+    parser.add_argument("--max-concurrency", type=int, default=HTTP_MAX_CONCURRENCY,
+                        help=f"MCP requests handled at once per worker (default: {HTTP_MAX_CONCURRENCY})")
+    parser.add_argument("--backlog", type=int, default=HTTP_BACKLOG,
+                        help=f"Requests queued per worker before answering 503 (default: {HTTP_BACKLOG})")
+    parser.add_argument("--graceful-timeout", type=float, default=30,
+                        help="Seconds to let in-flight requests finish on shutdown (default: 30)")
+    parser.add_argument("--root", default=HTTP_ROOT,
+                        help="Directory tools may read and write files in (default: none, file arguments refused)")
+    options = parser.parse_args(argv)
+    if options.workers < 1 or options.max_concurrency < 1 or options.backlog < 0:
+        parser.error("--workers and --max-concurrency must be at least 1 and --backlog at least 0")
+
+    print(f"Sound Healing MCP Server on http://{options.host}:{options.port}{HTTP_PATH} "
+          f"({options.workers} worker{'s' if options.workers != 1 else ''})", file=sys.stderr)
+    shared_dir = None
+    try:
+        if options.workers == 1:
+            uvicorn.run(
+                create_http_app(options.max_concurrency, options.backlog, options.root),
+                host=options.host,
+                port=options.port,
+                timeout_graceful_shutdown=options.graceful_timeout,
+                log_level="warning",
+            )
+            return 0
+
+        if not TABLES_PATH:
+            shared_dir = tempfile.mkdtemp(prefix="sound_healing_tables_")
+            os.environ["SOUND_HEALING_TABLES"] = os.path.join(shared_dir, "family_tables.bin")
+            build_family_tables(os.environ["SOUND_HEALING_TABLES"], tone_catalog())
+        # Workers are fresh interpreters that import this module; they read their settings from the environment
+        os.environ["SOUND_HEALING_HTTP_MAX_CONCURRENCY"] = str(options.max_concurrency)
+        os.environ["SOUND_HEALING_HTTP_BACKLOG"] = str(options.backlog)
+        if options.root:
+            os.environ["SOUND_HEALING_HTTP_ROOT"] = options.root
+        uvicorn.run(
+            "server:create_http_app",
+            factory=True,
+            app_dir=os.path.dirname(os.path.abspath(__file__)),
+            host=options.host,
+            port=options.port,
+            workers=options.workers,
+            timeout_graceful_shutdown=options.graceful_timeout,
+            log_level="warning",
+        )
+    finally:
+        if shared_dir is not None:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+    return 0
+
+
+def build_tables_command(argv: list[str]) -> int:
+    """``server.py --build-tables PATH [--table-width N]``: write the family tables and exit."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="server.py", description="Precompute family tables for the catalog.")
+    parser.add_argument("--build-tables", metavar="PATH", required=True, help="Table file to write")
+    parser.add_argument("--table-width", type=int, default=DEFAULT_TABLE_WIDTH,
+                        help=f"Values per family and tone (default: {DEFAULT_TABLE_WIDTH})")
+    options = parser.parse_args(argv)
+    if not 1 <= options.table_width <= MAX_FIBONACCI_INDEX + 1:
+        parser.error(f"--table-width must be between 1 and {MAX_FIBONACCI_INDEX + 1}")
+    catalog = tone_catalog()
+    started = time.perf_counter()
+    summary = build_family_tables(options.build_tables, catalog, options.table_width)
+    print(
+        f"Wrote {summary['tones']} tones x {summary['stride']} values ({summary['bytes']} bytes) "
+        f"to {summary['path']} in {time.perf_counter() - started:.2f}s",
+        file=sys.stderr
+    )
+    return 0
+
+
 if __name__ == "__main__":
+    if any(arg.startswith("--build-tables") for arg in sys.argv[1:]):
+        sys.exit(build_tables_command(sys.argv[1:]))
+    if "--http" in sys.argv[1:]:
+        sys.exit(http_command(sys.argv[1:]))
     asyncio.run(main())
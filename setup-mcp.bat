@@ -6,7 +6,7 @@ echo.
 REM Check Python
 python --version >nul 2>&1
 if errorlevel 1 (
-    echo Python is not installed. Please install Python 3.8 or higher.
+    echo Python is not installed. Please install Python 3.10 or higher.
     pause
     exit /b 1
 )
@@ -0,0 +1,85 @@
+"""Tolerance-aware dedupe and the closed-form fractal generator."""
+
+import math
+
+import numpy as np
+import pytest
+
+import server
+
+
+def _chained_fractal(base, depth):
+    # The original level-by-level construction, kept as the reference
+    phi = (1 + math.sqrt(5)) / 2
+    frequencies = [base]
+    for _ in range(depth):
+        frequencies.append(frequencies[-1] * 2 / phi)
+        frequencies.append(frequencies[-1] * phi)
+    return sorted(set(frequencies))
+
+
+def test_near_duplicates_merge_within_tolerance():
+    values = np.array([528.0, 527.9999999, 639.0, 528.0])
+    assert server.dedupe_within_cents(values, 0.001).tolist() == [527.9999999, 639.0]
+
+
+def test_zero_tolerance_keeps_only_exact_duplicates_apart():
+    values = np.array([528.0, 527.9999999, 639.0, 528.0])
+    assert server.dedupe_within_cents(values, 0).tolist() == [527.9999999, 528.0, 639.0]
+
+
+def test_negative_values_merge_by_magnitude():
+    values = np.array([-528.0, -527.9999999, 0.0, 0.0])
+    assert server.dedupe_within_cents(values, 0.001).tolist() == [-527.9999999, 0.0]
+
+
+def test_matrix_with_zero_tolerance_matches_exact_set_dedupe():
+    base = 432
+    expected = sorted(set(
+        server.fibonacci_multiples(base, 8)
+        + server.generate_phi_based_frequencies(base, 8)
+        + server.calculate_prime_harmonics(base, server.DEFAULT_PRIMES[:8])
+    ))
+    result = server._tool_generate_custom_frequency_matrix({"base_frequency": base, "tolerance_cents": 0})
+    assert result["frequency_matrix"] == expected
+
+
+@pytest.mark.parametrize("base", [528, 7.83, -432, 0])
+def test_fractal_matches_chained_construction(base):
+    expected = _chained_fractal(base, 8)
+    assert server.generate_fractal_frequencies(base, 8, tolerance_cents=0) == pytest.approx(expected, rel=1e-12)
+
+
+def test_fractal_levels_are_exact_powers_of_two():
+    frequencies = server.generate_fractal_frequencies(528, 20)
+    assert frequencies[::2] == [528.0 * 2 ** k for k in range(21)]
+    assert frequencies == sorted(frequencies)
+
+
+def test_fractal_range_pruning():
+    bounded = server.generate_fractal_frequencies(528, 1000, min_frequency=20, max_frequency=20000)
+    full = server.generate_fractal_frequencies(528, 6)
+    assert bounded == [f for f in full if 20 <= f <= 20000]
+    # Only the levels near the range are generated, never the full depth
+    first, last = server.fractal_level_range(528, 1000, 20, 20000)
+    assert first == 0 and last <= 8
+    assert server.generate_fractal_frequencies(528, 5, min_frequency=1e6) == []
+
+
+def test_fractal_range_pruning_for_negative_base():
+    bounded = server.generate_fractal_frequencies(-528, 10, min_frequency=-5000, max_frequency=-100)
+    full = server.generate_fractal_frequencies(-528, 10)
+    assert bounded == [f for f in full if -5000 <= f <= -100]
+
+
+def test_fractal_overflow_is_rejected():
+    with pytest.raises(server.ToolError, match="overflow"):
+        server._tool_generate_fractal_frequencies({"base_frequency": 1e300, "depth": 100})
+
+
+def test_fractal_bounds_avoid_overflow_at_deep_depths():
+    result = server._tool_generate_fractal_frequencies(
+        {"base_frequency": 1e300, "depth": 1000, "max_frequency": 1e302}
+    )
+    assert max(result["fractal_frequencies"]) <= 1e302
+    assert result["count"] == len(result["fractal_frequencies"])
@@ -0,0 +1,95 @@
+"""Loopback tests for the streamable HTTP transport (``server.py --http``)."""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+SERVER_PATH = Path(__file__).resolve().parent.parent / "server.py"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def http_server(tmp_path_factory):
+    """Start the server on a loopback port with a file root; yield (url, root)."""
+    root = tmp_path_factory.mktemp("http_root")
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, str(SERVER_PATH), "--http", "--port", str(port), "--root", str(root)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            assert process.poll() is None, "server exited during startup"
+            try:
+                if httpx.get(f"{url}/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            assert time.monotonic() < deadline, "server did not become healthy"
+            time.sleep(0.1)
+        yield url, root
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def _call(url: str, name: str, arguments: dict) -> dict:
+    async with streamablehttp_client(f"{url}/mcp") as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            result = await session.call_tool(name, arguments)
+    return json.loads(result.content[0].text)
+
+
+def test_health_reports_limits(http_server):
+    url, _ = http_server
+    health = httpx.get(f"{url}/health").json()
+    assert health["status"] == "ok"
+    assert health["in_flight"] == 0
+    assert health["max_concurrency"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_client_session_over_http(http_server):
+    url, _ = http_server
+    async with streamablehttp_client(f"{url}/mcp") as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            tools = await session.list_tools()
+            result = await session.call_tool("calculate_golden_ratio_frequency", {"base_frequency": 528})
+    assert "synthesize_audio" in {tool.name for tool in tools.tools}
+    assert not result.isError
+    assert json.loads(result.content[0].text)["golden_ratio_frequency"] == pytest.approx(528 * 1.6180339887)
+
+
+@pytest.mark.asyncio
+async def test_file_paths_are_confined_to_root(http_server):
+    url, root = http_server
+    written = await _call(url, "synthesize_audio", {"frequencies": [528], "duration_seconds": 0.1, "output_path": "tone.wav"})
+    assert written["output_path"] == os.path.join(os.path.realpath(root), "tone.wav")
+    assert (root / "tone.wav").stat().st_size == written["bytes"]
+
+    for outside in ("../escape.wav", str(root.parent / "escape.wav")):
+        refused = await _call(url, "synthesize_audio", {"frequencies": [528], "duration_seconds": 0.1, "output_path": outside})
+        assert "must be inside" in refused["error"]
+    assert not (root.parent / "escape.wav").exists()
+
+    refused = await _call(url, "analyze_audio_spectrum", {"input_path": "/etc/hostname"})
+    assert "must be inside" in refused["error"]
@@ -0,0 +1,76 @@
+"""Stern-Brocot ratio recovery and odd/prime-limit classification."""
+
+import math
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+import server
+
+
+def _brute_force_simplest(low, high, max_term):
+    # Smallest denominator first, then smallest numerator: the simplest fraction in [low, high]
+    for q in range(1, max_term + 1):
+        p = math.ceil(low * q - 1e-12)
+        if p <= high * q + 1e-12 and p <= max_term:
+            fraction = Fraction(p, q)
+            return fraction.numerator, fraction.denominator
+    return 0, 0
+
+
+def _ratios(frequencies, **arguments):
+    result = server._tool_find_rational_ratios({"frequencies": frequencies, **arguments})
+    return {tuple(pair["indices"]): pair for pair in result["pairs"]}, result
+
+
+def test_exact_intervals():
+    numerators, denominators = server.simplest_ratios(np.array([1.5, 1.25, 1.75, 2.0]), np.array([1.5, 1.25, 1.75, 2.0]))
+    assert list(zip(numerators.tolist(), denominators.tolist())) == [(3, 2), (5, 4), (7, 4), (2, 1)]
+
+
+def test_simplest_fraction_in_window_matches_brute_force():
+    rng = np.random.default_rng(1)
+    low = rng.uniform(0.5, 4.0, 200)
+    high = low * np.exp2(rng.uniform(0, 20, 200) / 1200)
+    numerators, denominators = server.simplest_ratios(low, high, 512)
+    expected = [_brute_force_simplest(lo, hi, 512) for lo, hi in zip(low.tolist(), high.tolist())]
+    assert list(zip(numerators.tolist(), denominators.tolist())) == expected
+
+
+def test_terms_beyond_max_term_give_no_ratio():
+    numerators, denominators = server.simplest_ratios(np.array([math.sqrt(2)]), np.array([math.sqrt(2)]), 100)
+    assert (numerators[0], denominators[0]) == (0, 0)
+
+
+def test_known_intervals_within_tolerance():
+    # 300.5 and 350.5 are a few cents sharp of 3/2 and 7/4 above 200
+    pairs, result = _ratios([200, 300.5, 250, 350.5, 225])
+    assert pairs[(0, 1)]["ratio"] == "3/2"
+    assert pairs[(0, 2)]["ratio"] == "5/4"
+    assert pairs[(0, 3)]["ratio"] == "7/4"
+    assert pairs[(0, 3)]["error_cents"] == pytest.approx(1200 * math.log2(350.5 / 350))
+    assert result["unmatched_pairs"] == 0
+
+
+def test_odd_and_prime_limits():
+    pairs, result = _ratios([200, 300, 250, 350, 225])
+    limits = {pair["ratio"]: (pair["odd_limit"], pair["prime_limit"]) for pair in pairs.values()}
+    assert limits["3/2"] == (3, 3)
+    assert limits["5/4"] == (5, 5)
+    assert limits["7/4"] == (7, 7)
+    # 9/8 is 9-odd-limit but only 3-prime-limit
+    assert limits["9/8"] == (9, 3)
+    assert sum(result["prime_limit_counts"].values()) == result["matched_pairs"]
+
+
+def test_prime_limits_and_odd_parts():
+    assert server.prime_limits(np.array([1, 12, 17, 1024, 3 * 7 * 11])).tolist() == [1, 3, 17, 2, 11]
+    assert server.odd_part(np.array([1, 12, 17, 1024])).tolist() == [1, 3, 17, 1]
+
+
+def test_largest_max_term_keeps_the_sieve_small():
+    pairs, _ = _ratios([200, 300, 200 * math.sqrt(2)], max_term=server.MAX_RATIO_TERM, tolerance_cents=1e-6)
+    assert pairs[(0, 1)]["ratio"] == "3/2"
+    assert pairs[(0, 2)]["denominator"] <= server.MAX_RATIO_TERM
+    assert len(server.smallest_prime_factors(1)) <= server.SIEVE_CACHE_LIMIT
@@ -0,0 +1,79 @@
+"""Sethares roughness scoring and consonant-subset ranking."""
+
+import math
+
+import numpy as np
+import pytest
+
+import server
+
+
+def _sethares(f1, f2, a1=1.0, a2=1.0):
+    low, high = min(f1, f2), max(f1, f2)
+    s = 0.24 / (0.0207 * low + 18.96)
+    d = high - low
+    return 5.0 * min(a1, a2) * (math.exp(-3.51 * s * d) - math.exp(-5.75 * s * d))
+
+
+def _roughness(frequencies, **arguments):
+    return server._tool_calculate_roughness({"frequencies": frequencies, **arguments})
+
+
+def test_unison_is_smooth():
+    result = _roughness([440, 440], partials=1)
+    assert result["total_roughness"] == pytest.approx(0.0, abs=1e-12)
+
+
+def test_minor_second_matches_sethares_curve():
+    minor_second = 440 * 2 ** (1 / 12)
+    result = _roughness([440, minor_second], partials=1)
+    assert result["total_roughness"] == pytest.approx(_sethares(440, minor_second), rel=1e-12)
+    assert result["pair_roughness"][0]["indices"] == [0, 1]
+
+
+def test_minor_second_is_rougher_than_fifth():
+    minor_second = _roughness([440, 440 * 2 ** (1 / 12)])["total_roughness"]
+    fifth = _roughness([440, 660])["total_roughness"]
+    assert minor_second > fifth
+
+
+def test_partials_use_decayed_amplitudes():
+    # Every pair of the four partials counts; second partials sound at half amplitude
+    result = _roughness([200, 401], partials=2, amplitude_decay=0.5)
+    expected = (
+        _sethares(200, 400, 1.0, 0.5)  # intrinsic: 200 and its partial 400
+        + _sethares(401, 802, 1.0, 0.5)  # intrinsic: 401 and its partial 802
+        + _sethares(200, 401) + _sethares(400, 401, 0.5, 1.0)
+        + _sethares(200, 802, 1.0, 0.5) + _sethares(400, 802, 0.5, 0.5)
+    )
+    assert result["total_roughness"] == pytest.approx(expected, rel=1e-6)
+
+
+def test_distant_partials_are_pruned():
+    result = _roughness([100, 10000], partials=1)
+    assert result["partial_pairs_pruned"] == 1
+    assert result["interacting_pairs"] == 0
+
+
+def test_pruned_total_matches_brute_force():
+    rng = np.random.default_rng(0)
+    frequencies = rng.uniform(100, 1000, 12).tolist()
+    freqs, amps, _ = server.tone_partials(frequencies, [1.0] * 12, 6, 0.88)
+    i, j = np.triu_indices(len(freqs), 1)
+    brute = server.sethares_roughness(freqs[i], freqs[j], amps[i], amps[j]).sum()
+    assert _roughness(frequencies)["total_roughness"] == pytest.approx(brute, rel=1e-6)
+
+
+def test_beam_search_agrees_with_exhaustive_ranking(monkeypatch):
+    frequencies = [261.63, 277.18, 293.66, 329.63, 349.23, 392.0, 415.3, 440.0]
+    exhaustive = _roughness(frequencies, subset_size=3, top_subsets=5)
+    monkeypatch.setattr(server, "EXHAUSTIVE_SUBSET_LIMIT", 0)
+    beam = _roughness(frequencies, subset_size=3, top_subsets=5)
+    assert exhaustive["subset_search"] == "exhaustive"
+    assert beam["subset_search"] == "beam"
+    assert [s["indices"] for s in beam["most_consonant_subsets"]] == [
+        s["indices"] for s in exhaustive["most_consonant_subsets"]
+    ]
+    assert [s["roughness"] for s in beam["most_consonant_subsets"]] == pytest.approx(
+        [s["roughness"] for s in exhaustive["most_consonant_subsets"]]
+    )